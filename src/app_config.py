@@ -0,0 +1,68 @@
+import os
+import yaml
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(PROJECT_DIR, 'config', 'config.yaml')
+
+DEFAULT_CONFIG = {
+    'cameras': [
+        {'name': 'Camera 1', 'ip': '192.168.0.101', 'port': 52381},
+        {'name': 'Camera 2', 'ip': '192.168.1.101', 'port': 52381},
+        {'name': 'Camera 3', 'ip': '192.168.1.102', 'port': 52381}
+    ],
+    'joystick': {
+        'x_pin': 0,  # Analog pin for X-axis
+        'y_pin': 1,  # Analog pin for Y-axis
+        'zoom_pin': 2,  # Analog pin for zoom control
+        'deadzone': 0.1  # Deadzone for joystick
+    },
+    'gamepad': {
+        'mapping': {
+            'pan_axis': 0,
+            'tilt_axis': 1,
+            'zoom_axis': 3,
+            'invert_pan': False,
+            'invert_tilt': False,
+            'invert_zoom': False,
+            'deadzone': 0.1
+        }
+    }
+}
+
+
+def load_config(config_path=CONFIG_PATH):
+    """Load config.yaml, creating it with defaults on first run."""
+    if os.path.exists(config_path):
+        with open(config_path, 'r') as file:
+            cfg = yaml.safe_load(file) or {}
+        # One-time migration: update default camera 1 IP if it's still the old default
+        try:
+            if (
+                isinstance(cfg.get('cameras'), list)
+                and len(cfg['cameras']) > 0
+                and cfg['cameras'][0].get('ip') == '192.168.1.100'
+            ):
+                cfg['cameras'][0]['ip'] = '192.168.0.101'
+                save_config(cfg, config_path)
+        except Exception:
+            pass
+        return cfg
+    else:
+        import copy
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
+        # Create config directory if it doesn't exist
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        # Save default config
+        save_config(default_config, config_path)
+        return default_config
+
+
+def read_config(config_path=CONFIG_PATH):
+    """Parse config.yaml as it is on disk (no defaults, no migration, never writes)."""
+    with open(config_path, 'r') as file:
+        return yaml.safe_load(file) or {}
+
+
+def save_config(config, config_path=CONFIG_PATH):
+    with open(config_path, 'w') as file:
+        yaml.dump(config, file)
@@ -0,0 +1,153 @@
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .estimator import DEGREES_PER_UNIT, SpeedCalibration
+from .packets import PAN_SPEED_MAX, TILT_SPEED_MAX, ZOOM_SPEED_MAX, PtzPacketTable
+
+PAN = 'pan'
+TILT = 'tilt'
+ZOOM = 'zoom'
+
+
+class SpeedCalibrator:
+    """Measure a camera's speed step -> angular velocity tables.
+
+    For every step on an axis the camera is driven one way and then back the
+    other way (so it ends up roughly where it started), the position is sampled
+    with inquiries while it moves, and the velocity is the least-squares slope
+    of the samples taken after `settle_s` of acceleration. A run stops early
+    once it passes `edge_fraction` of the axis range. Pan/tilt rates are in
+    degrees/second, zoom in ratio units/second, signed for a positive step.
+
+    `send(payload)`, `read_pan_tilt()` and `read_zoom()` come from the
+    CameraManager, like the zoom servo's callbacks.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], bool],
+        read_pan_tilt: Callable[[], Optional[Tuple[int, int]]],
+        read_zoom: Callable[[], Optional[int]],
+        packets: PtzPacketTable,
+        limits: Tuple[Tuple[int, int], Tuple[int, int]],
+        move_s: float = 1.0,
+        settle_s: float = 0.3,
+        edge_fraction: float = 0.8,
+        sample_hz: float = 20.0,
+    ):
+        self._send = send
+        self._read_pan_tilt = read_pan_tilt
+        self._read_zoom = read_zoom
+        self._packets = packets
+        self._limits = {PAN: limits[0], TILT: limits[1], ZOOM: (1000, 12000)}
+        self.move_s = float(move_s)
+        self.settle_s = float(settle_s)
+        self.edge_fraction = float(edge_fraction)
+        self.sample_s = 1.0 / max(1.0, float(sample_hz))
+        self.logger = logging.getLogger(__name__)
+
+    def _drive(self, axis: str, speed: int) -> None:
+        if axis == PAN:
+            packet = self._packets.pantilt(speed, 0)
+        elif axis == TILT:
+            packet = self._packets.pantilt(0, speed)
+        else:
+            packet = self._packets.zoom(speed)
+        self._send(packet)
+
+    def _stop(self, axis: str) -> None:
+        self._send(self._packets.zoom_stop if axis == ZOOM else self._packets.stop)
+
+    def _read(self, axis: str) -> Optional[int]:
+        if axis == ZOOM:
+            return self._read_zoom()
+        position = self._read_pan_tilt()
+        if position is None:
+            return None
+        return position[0] if axis == PAN else position[1]
+
+    def _near_edge(self, axis: str, start: int, value: int) -> bool:
+        """True once the axis has moved outward past `edge_fraction` of its range."""
+        low, high = self._limits[axis]
+        middle, half = (low + high) / 2.0, (high - low) / 2.0
+        outward = (value - start) * (value - middle) > 0
+        return outward and abs(value - middle) >= half * self.edge_fraction
+
+    def _run(self, axis: str, speed: int) -> Optional[float]:
+        """Drive at speed and return the measured rate in position units/second."""
+        samples: List[Tuple[float, int]] = []
+        start = None
+        started = time.monotonic()
+        self._drive(axis, speed)
+        try:
+            while True:
+                now = time.monotonic()
+                if now - started >= self.settle_s + self.move_s:
+                    break
+                value = self._read(axis)
+                if value is not None:
+                    if start is None:
+                        start = value
+                    if now - started >= self.settle_s:
+                        samples.append((now, value))
+                    if self._near_edge(axis, start, value):
+                        break
+                time.sleep(max(0.0, self.sample_s - (time.monotonic() - now)))
+        finally:
+            self._stop(axis)
+        return _slope(samples)
+
+    def _wait_still(self, axis: str, timeout_s: float = 3.0) -> None:
+        """Wait until two consecutive reads agree (the axis has stopped coasting)."""
+        deadline = time.monotonic() + timeout_s
+        last = self._read(axis)
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            value = self._read(axis)
+            if value is not None and value == last:
+                return
+            last = value
+
+    def measure_axis(self, axis: str, steps: Sequence[int]) -> List[Tuple[int, float]]:
+        """[(step, signed rate for +step)] for the steps that could be measured."""
+        scale = 1.0 if axis == ZOOM else DEGREES_PER_UNIT
+        table = []
+        for step in steps:
+            rates = []
+            # Out and back, so the camera stays inside its range
+            for direction in (1, -1):
+                self._wait_still(axis)
+                rate = self._run(axis, direction * step)
+                if rate is not None:
+                    rates.append(direction * rate * scale)
+            if not rates:
+                self.logger.warning(f"Calibration: no position samples for {axis} step {step}")
+                continue
+            table.append((step, sum(rates) / len(rates)))
+            self.logger.info(f"Calibration: {axis} step {step} -> {table[-1][1]:.2f}/s")
+        return table
+
+    def run(self, steps: Optional[Dict[str, Sequence[int]]] = None) -> SpeedCalibration:
+        """Measure every axis (or the given steps per axis) and return the calibration.
+        Axes with no usable measurements keep their nominal table."""
+        steps = steps or {
+            PAN: range(1, PAN_SPEED_MAX + 1),
+            TILT: range(1, TILT_SPEED_MAX + 1),
+            ZOOM: range(1, ZOOM_SPEED_MAX + 1),
+        }
+        measured = {axis: self.measure_axis(axis, axis_steps) for axis, axis_steps in steps.items()}
+        return SpeedCalibration(pan=measured.get(PAN), tilt=measured.get(TILT), zoom=measured.get(ZOOM))
+
+
+def _slope(samples: List[Tuple[float, int]]) -> Optional[float]:
+    """Least-squares slope of (time, value) samples, or None with fewer than two."""
+    if len(samples) < 2:
+        return None
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_v = sum(v for _, v in samples) / n
+    denominator = sum((t - mean_t) ** 2 for t, _ in samples)
+    if denominator <= 0:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in samples) / denominator
@@ -1,27 +1,380 @@
 from visca_over_ip import Camera
 import logging
 import socket
+import threading
+import time
+from monitoring.logs import HexBytes
+from monitoring.metrics import REGISTRY
+from realtime import RealtimeProfile
+from .calibration import SpeedCalibrator
+from .commands import load_model
+from .deadman import DISCONNECT, EXIT, DeadmanWatchdog, MotionLease
+from .estimator import PositionEstimator, SpeedCalibration
+from .io_worker import IoWorker
+from .image_settings import plan_changes, settings_from_replies, supported_settings
+from .health import CameraHealth, HealthMonitor, ONLINE, DEGRADED
+from .journal import (CommandJournal, RESULT_OK, RESULT_FAILED, RESULT_SUPPRESSED, TRANSPORT_NONE,
+                      TRANSPORT_LIBRARY, TRANSPORT_TCP, TRANSPORT_UDP, TRANSPORT_SOCKET, TRANSPORT_VISCA_IP,
+                      TRANSPORT_WORKER)
+from .packets import packet_table
+from .simulator import BACKEND as SIMULATOR_BACKEND, CameraSimulator
+from .tracking import TRACKING_INQUIRIES, TrackingState, TrackingSync, state_from_replies
+from .transport import TransportPool, inquire_all
+from .zoom_servo import ZoomServo
+
+
+_COMMANDS_SENT = REGISTRY.counter("rpiptz_camera_commands_sent_total", "VISCA commands sent, per camera.", ("camera",))
+_COMMANDS_FAILED = REGISTRY.counter("rpiptz_camera_commands_failed_total", "VISCA commands that could not be sent, per camera.", ("camera",))
+_COMMANDS_SUPPRESSED = REGISTRY.counter("rpiptz_camera_commands_suppressed_total", "Commands not sent because the camera was unavailable, per camera.", ("camera",))
+_SEND_LATENCY = REGISTRY.histogram("rpiptz_camera_send_latency_seconds", "Time spent in the send path per command.", ("camera",))
+_ACK_LATENCY = REGISTRY.histogram("rpiptz_camera_ack_latency_seconds", "Time from command send to camera ACK.", ("camera",))
+_CAMERA_UP = REGISTRY.gauge("rpiptz_camera_up", "Camera health: 1 online, 0.5 degraded, 0 offline.", ("camera",))
+_WORKER_UP = REGISTRY.gauge("rpiptz_io_worker_up", "1 while the camera I/O worker process is running.")
+_WORKER_LATENCY = REGISTRY.gauge("rpiptz_io_worker_latency_max_seconds", "Longest time from command write to send in the I/O worker.")
+
+
+class _CameraStats:
+    """Metric children bound once per camera so the hot path skips label lookups."""
+
+    __slots__ = ("sent", "failed", "suppressed", "send_latency", "ack_latency")
+
+    def __init__(self, name):
+        self.sent = _COMMANDS_SENT.labels(name)
+        self.failed = _COMMANDS_FAILED.labels(name)
+        self.suppressed = _COMMANDS_SUPPRESSED.labels(name)
+        self.send_latency = _SEND_LATENCY.labels(name)
+        self.ack_latency = _ACK_LATENCY.labels(name)
+
 
 class CameraManager:
-    def __init__(self, camera_configs):
+    def __init__(self, camera_configs, settings=None):
         self.cameras = []
         self.active_camera_index = 0
         self.logger = logging.getLogger(__name__)
+        self._settings = settings or {}
         self._last_known_positions = {}  # index -> (pan, tilt, zoom)
         self._last_zoom_ratio = {}  # index -> int ratio (1000..12000)
+        self._zooming = {}  # index -> True while a manual variable-speed zoom is running
+        self._software_presets = {}  # (index, slot) -> (pan, tilt, zoom)
+        self._fix_requested = {}  # index -> monotonic time of the last early-heartbeat request
+        self._tracking = {}  # index -> TrackingState from the last sweep or set_tracking()
+        self._manual_moving = {}  # index -> True after manual pan/tilt on a camera that is tracking
+        # Calibrated cameras translate speed steps so mixed models move at the same deg/s
+        self._match_speeds = (self._settings.get('calibration') or {}).get('match_speeds', True)
+        self._health_monitor = None
+        self._tracking_sync = None
+        self._io_worker = None
+        self._simulator = None  # CameraSimulator, started with the first `backend: simulator` camera
+        self._transport_pool = TransportPool()
+        # Stops a camera whose streamed motion input goes quiet (`deadman.window`, 0 disables)
+        deadman_cfg = self._settings.get('deadman') or {}
+        self._deadman = DeadmanWatchdog(lambda: self.cameras, self._deadman_stop,
+                                        window_s=deadman_cfg.get('window', 0.25))
+        journal_cfg = self._settings.get('journal') or {}
+        self.journal = CommandJournal(journal_cfg.get('capacity', 1024))
+        REGISTRY.add_collector(self._collect_metrics)
         
         # Initialize cameras from config
         for config in camera_configs:
-            try:
-                camera = Camera(config['ip'], config['port'])
-                camera.name = config['name']
-                camera.ip = config['ip']
-                camera.port = config['port']
-                self.cameras.append(camera)
-                self.logger.info(f"Initialized camera: {config['name']} at {config['ip']}:{config['port']}")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize camera {config['name']}: {str(e)}")
+            self.add_camera(config)
+        if (self._settings.get('io_worker') or {}).get('enabled', False):
+            self.start_io_worker()
+        self._deadman.start()
+
+    def add_camera(self, config):
+        """Append a camera from its config entry (name, ip, port, model, calibration, backend)."""
+        try:
+            camera = Camera(config['ip'], config['port'])
+            camera.name = config['name']
+            camera.ip = config['ip']
+            camera.port = config['port']
+            camera.index = len(self.cameras)
+            camera.commands = load_model(config.get('model'))
+            camera.packets = packet_table(camera.commands)
+            camera.calibration = SpeedCalibration.from_config(config.get('calibration'))
+            camera.backend = config.get('backend', 'visca')
+            if camera.backend == SIMULATOR_BACKEND:
+                self._attach_simulator(camera, config.get('simulator'))
+            self._attach_transport(camera)
+            self.cameras.append(camera)
+            self.logger.info(f"Initialized camera: {config['name']} at {config['ip']}:{config['port']}")
+            self._restart_io_worker()
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to initialize camera {config['name']}: {str(e)}")
+            return False
+
+    def remove_camera(self, index):
+        """Remove a camera, closing its transport. Later cameras move down one index."""
+        if not (0 <= index < len(self.cameras)):
+            return False
+        camera = self.cameras.pop(index)
+        self._release_transport(camera)
+        self._release_metrics(camera.name)
+        for i, cam in enumerate(self.cameras):
+            cam.index = i
+        self._remap_indices({i: i - (i > index) for i in range(len(self.cameras) + 1) if i != index})
+        if self.active_camera_index > index:
+            self.active_camera_index -= 1
+        elif self.active_camera_index >= len(self.cameras):
+            self.active_camera_index = max(0, len(self.cameras) - 1)
+        self._restart_io_worker()
+        self.logger.info(f"Removed camera: {camera.name}")
+        return True
+
+    def reorder_cameras(self, order):
+        """Put the cameras in `order` (the current indices, in their new order). Each
+        camera keeps its transport and state; the active camera stays active."""
+        if sorted(order) != list(range(len(self.cameras))):
+            return False
+        if list(order) == sorted(order):
+            return True
+        active = self.get_active_camera()
+        self.cameras[:] = [self.cameras[i] for i in order]
+        for i, cam in enumerate(self.cameras):
+            cam.index = i
+        self._remap_indices({old: new for new, old in enumerate(order)})
+        if active is not None:
+            self.active_camera_index = active.index
+        self._restart_io_worker()
+        self.logger.info(f"Reordered cameras: {', '.join(cam.name for cam in self.cameras)}")
+        return True
+
+    def _remap_indices(self, mapping):
+        """Re-key the per-camera state after cameras were removed or reordered
+        (`mapping`: old index -> new index; state of other indices is dropped)."""
+        for state in (self._last_known_positions, self._last_zoom_ratio, self._zooming,
+                      self._fix_requested, self._tracking, self._manual_moving):
+            entries = {mapping[k]: v for k, v in state.items() if k in mapping}
+            state.clear()
+            state.update(entries)
+        presets = {(mapping[i], slot): v for (i, slot), v in self._software_presets.items() if i in mapping}
+        self._software_presets.clear()
+        self._software_presets.update(presets)
     
+    def _release_metrics(self, name):
+        """Stop exporting a camera name's series (removed or renamed camera), unless
+        another camera still uses that name."""
+        if all(camera.name != name for camera in self.cameras):
+            REGISTRY.remove('camera', name)
+
+    def _attach_transport(self, camera):
+        """Attach the persistent VISCA transport and health tracker to a camera object."""
+        health_cfg = self._settings.get('health') or {}
+        camera.health = CameraHealth(
+            failure_threshold=health_cfg.get('failure_threshold', 3),
+            heartbeat_interval_s=health_cfg.get('heartbeat_interval', 2.0),
+            base_backoff_s=health_cfg.get('backoff_initial', 0.5),
+            max_backoff_s=health_cfg.get('backoff_max', 30.0),
+        )
+        camera.stats = _CameraStats(camera.name)
+        camera.motion = MotionLease()
+        try:
+            camera.transport = self._transport_pool.open(camera.ip, camera.port, timeout=health_cfg.get('timeout', 0.3))
+            camera.transport.ack_latency = camera.stats.ack_latency
+        except Exception as e:
+            camera.transport = None
+            self.logger.error(f"Failed to open transport for {camera.name}: {e}")
+        self._attach_model_state(camera)
+
+    def _attach_simulator(self, camera, overrides=None):
+        """`backend: simulator`: serve the camera's own address with a simulated camera."""
+        if self._simulator is None:
+            self._simulator = CameraSimulator.from_config(self._settings)
+        camera.simulated = self._simulator.add(camera.ip, camera.port, camera.commands.model, overrides, camera.name)
+
+    def stop_simulator(self):
+        simulator, self._simulator = self._simulator, None
+        if simulator is not None:
+            simulator.close()
+
+    def _attach_model_state(self, camera):
+        """Zoom servo and position estimator, both built from the camera's command table."""
+        servo_cfg = self._settings.get('zoom_servo') or {}
+        camera.zoom_servo = ZoomServo(
+            send=lambda payload: self._send_packet(camera, payload),
+            inquire_ratio=lambda: self._inquire_zoom_ratio(camera),
+            packets=camera.packets,
+            build_direct=lambda ratio: camera.commands.build('zoom_direct', ratio),
+            rate_hz=servo_cfg.get('rate_hz', 10.0),
+            full_speed_error=servo_cfg.get('full_speed_error', 4000),
+            landing_window=servo_cfg.get('landing_window', 300),
+            timeout_s=servo_cfg.get('timeout', 10.0),
+            on_ratio=lambda ratio: self._on_zoom_ratio(camera, ratio),
+        )
+        estimator_cfg = self._settings.get('estimator') or {}
+        fields = {f.name: f for f in camera.commands['pan_tilt_absolute'].fields}
+        camera.estimator = PositionEstimator(
+            camera.calibration,
+            pan_limits=(fields['p'].low, fields['p'].high),
+            tilt_limits=(fields['t'].low, fields['t'].high),
+            drift_fraction=estimator_cfg.get('drift_fraction', 0.1),
+            max_uncertainty_deg=estimator_cfg.get('max_uncertainty_deg', 5.0),
+        )
+
+    def _on_zoom_ratio(self, camera, ratio):
+        """A measured zoom ratio arrived (heartbeat or zoom servo)."""
+        self._last_zoom_ratio[camera.index] = ratio
+        camera.estimator.correct(zoom=ratio)
+
+    def _release_transport(self, camera, replacement=None):
+        """Close a camera's sockets. Senders still holding the camera object (e.g. the
+        gamepad thread mid-command) are redirected to `replacement`, if given."""
+        servo = getattr(camera, 'zoom_servo', None)
+        if servo is not None:
+            servo.stop()
+        transport = getattr(camera, 'transport', None)
+        if replacement is not None:
+            camera.packets = replacement.packets
+        camera.transport = replacement.transport if replacement is not None else None
+        # Closing waits for a send in progress on the old socket
+        self._transport_pool.release(transport)
+        simulated = getattr(camera, 'simulated', None)
+        if simulated is not None and self._simulator is not None:
+            self._simulator.remove(simulated)
+        close_connection = getattr(camera, 'close_connection', None)
+        if callable(close_connection):
+            try:
+                close_connection()
+            except Exception:
+                pass
+
+    def start_io_worker(self):
+        """Move camera command sends into a separate process (`io_worker.enabled`).
+        Inquiries (heartbeats, position and settings reads) stay in this process."""
+        if self._io_worker is not None:
+            return
+        worker_cfg = self._settings.get('io_worker') or {}
+        health_cfg = self._settings.get('health') or {}
+        configs = [{'ip': c.ip, 'port': c.port, 'model': c.commands.model} for c in self.cameras]
+        worker = IoWorker(configs, ring_size=worker_cfg.get('ring_size', 64), timeout=health_cfg.get('timeout', 0.3),
+                          realtime=RealtimeProfile.from_config(self._settings, 'send').to_config())
+        try:
+            worker.start()
+        except Exception as e:
+            self.logger.error(f"Camera I/O worker failed to start, sending in-process: {e}")
+            return
+        self._io_worker = worker
+
+    def stop_io_worker(self):
+        worker, self._io_worker = self._io_worker, None
+        if worker is not None:
+            worker.stop()
+
+    def _restart_io_worker(self):
+        """The worker's camera list is fixed at start: restart it after the list changed."""
+        if self._io_worker is not None:
+            self.stop_io_worker()
+            self.start_io_worker()
+
+    def _collect_metrics(self):
+        worker = self._io_worker
+        _WORKER_UP.set(1 if worker is not None and worker.running else 0)
+        if worker is not None:
+            _WORKER_LATENCY.set(worker.stats().get('max_latency_s', 0.0))
+        for camera in list(self.cameras):
+            health = getattr(camera, 'health', None)
+            if health is not None:
+                up = 1 if health.state == ONLINE else 0.5 if health.state == DEGRADED else 0
+                _CAMERA_UP.labels(camera.name).set(up)
+
+    def _record_send(self, camera, ok, started, command=b'', transport=TRANSPORT_LIBRARY):
+        elapsed = time.perf_counter() - started
+        stats = getattr(camera, 'stats', None)
+        if stats is not None:
+            (stats.sent if ok else stats.failed).inc()
+            stats.send_latency.observe(elapsed)
+        self.journal.record(getattr(camera, 'index', 0), command, transport, RESULT_OK if ok else RESULT_FAILED, elapsed)
+
+    def start_health_monitor(self):
+        """Start background heartbeats; offline cameras are re-probed with exponential backoff.
+        Also starts the periodic AI tracking state sweep (`tracking.refresh_interval`)."""
+        if self._health_monitor is None:
+            tick = (self._settings.get('health') or {}).get('tick', 0.25)
+            self._health_monitor = HealthMonitor(self._health_targets, self._probe_camera, tick_s=tick)
+        self._health_monitor.start()
+        if self._tracking_sync is None:
+            interval = (self._settings.get('tracking') or {}).get('refresh_interval', 10.0)
+            self._tracking_sync = TrackingSync(self.refresh_tracking, interval_s=interval)
+        self._tracking_sync.start()
+
+    def stop_health_monitor(self):
+        if self._health_monitor is not None:
+            self._health_monitor.stop()
+        if self._tracking_sync is not None:
+            self._tracking_sync.stop()
+
+    def _health_targets(self):
+        return {i: cam.health for i, cam in enumerate(self.cameras) if getattr(cam, 'health', None)}
+
+    def _probe_camera(self, index):
+        """Heartbeat: a zoom position inquiry. Also refreshes the cached zoom ratio, and
+        the pan/tilt position when the dead-reckoning estimate has lost confidence."""
+        if not (0 <= index < len(self.cameras)):
+            return False
+        camera = self.cameras[index]
+        ratio = self._inquire_zoom_ratio(camera)
+        if ratio is None:
+            return False
+        self._on_zoom_ratio(camera, ratio)
+        # The AI tracker moves the camera on its own: refresh the position every heartbeat
+        if camera.estimator.needs_fix(self._min_confidence()) or self.is_tracking(index):
+            self.query_pan_tilt_position(index)
+        return True
+
+    def _inquire_zoom_ratio(self, camera):
+        """Current zoom ratio (1000..12000) from a zoom position inquiry, or None."""
+        transport = getattr(camera, 'transport', None)
+        if transport is None:
+            return None
+        inquiry = camera.commands.inquiry('zoom_position')
+        ratio = inquiry.value(transport.inquire(inquiry.packet))
+        if ratio is None:
+            return None
+        return max(1000, min(12000, ratio))
+
+    def get_camera_health(self, index):
+        """Return 'online', 'degraded' or 'offline' for the camera at index (None if unknown)."""
+        if 0 <= index < len(self.cameras):
+            health = getattr(self.cameras[index], 'health', None)
+            return health.state if health else None
+        return None
+
+    def _is_available(self, camera):
+        """Circuit breaker check: False while the camera is considered offline."""
+        health = getattr(camera, 'health', None)
+        return health is None or health.allow_request()
+
+    def get_zoom_ratio(self, index=None):
+        """Zoom ratio (1000..12000): dead-reckoned once the zoom has been read, else the
+        cached value or 1000."""
+        index = self.active_camera_index if index is None else index
+        if 0 <= index < len(self.cameras) and self.cameras[index].estimator.has_zoom:
+            return int(self.cameras[index].estimator.estimate().zoom)
+        return self._last_zoom_ratio.get(index, 1000)
+
+    def _min_confidence(self):
+        return (self._settings.get('estimator') or {}).get('min_confidence', 0.5)
+
+    def get_position_estimate(self, index=None, request_fix=True):
+        """Estimated pan/tilt/zoom for a camera, served from memory (see PositionEstimator.to_dict).
+
+        Never blocks: a low-confidence estimate asks the health monitor for an early
+        heartbeat (unless `request_fix` is False), which refreshes the position, and
+        is returned as-is."""
+        index = self.active_camera_index if index is None else index
+        if not (0 <= index < len(self.cameras)):
+            return None
+        camera = self.cameras[index]
+        estimate = camera.estimator.to_dict()
+        if request_fix and estimate['confidence'] < self._min_confidence():
+            # The UI polls at 10 Hz; ask for at most one early heartbeat per second
+            now = time.monotonic()
+            if now - self._fix_requested.get(index, 0.0) >= 1.0:
+                self._fix_requested[index] = now
+                camera.health.request_probe()
+        return estimate
+
     def get_active_camera(self):
         """Get the currently active camera"""
         if not self.cameras:
@@ -49,24 +402,27 @@ class CameraManager:
         camera = self.get_active_camera()
         if camera:
             try:
-                # If both speeds are zero, issue a stop explicitly to avoid drift
-                if pan_speed == 0 and tilt_speed == 0:
-                    try:
-                        camera.pantilt(0, 0)
-                    except Exception:
-                        # Raw VISCA stop for safety
-                        self._send_command(camera, bytes([0x81, 0x01, 0x06, 0x01, 0x00, 0x00, 0x03, 0x03, 0xFF]))
-                else:
-                    camera.pantilt(pan_speed, tilt_speed)
-                # Update last known pan/tilt when moving
-                try:
-                    self._last_known_positions[self.active_camera_index] = (
-                        self._last_known_positions.get(self.active_camera_index, (0, 0, 0))[0],
-                        self._last_known_positions.get(self.active_camera_index, (0, 0, 0))[1],
-                        self._last_known_positions.get(self.active_camera_index, (0, 0, 0))[2],
-                    )
-                except Exception:
-                    pass
+                # Zero speeds map to an explicit stop to avoid drift
+                pan_speed, tilt_speed = int(pan_speed), int(tilt_speed)
+                tracking = self._tracking.get(self.active_camera_index)
+                if tracking is not None and tracking.active:
+                    # Don't fight the AI tracker: drop manual input on the axes it drives and
+                    # only send a stop once after manual motion on the other axis
+                    if tracking.pan_auto:
+                        pan_speed = 0
+                    if tracking.tilt_auto:
+                        tilt_speed = 0
+                    if pan_speed or tilt_speed:
+                        self._manual_moving[self.active_camera_index] = True
+                    elif not self._manual_moving.pop(self.active_camera_index, False):
+                        return True
+                if self._match_speeds and camera.calibration.calibrated:
+                    pan_speed = camera.calibration.match_pan(pan_speed)
+                    tilt_speed = camera.calibration.match_tilt(tilt_speed)
+                if not self._send_pantilt(camera, pan_speed, tilt_speed):
+                    return False
+                camera.estimator.command_pantilt(pan_speed, tilt_speed)
+                camera.motion.refresh(pantilt=bool(pan_speed or tilt_speed))
                 return True
             except Exception as e:
                 self.logger.error(f"Error moving camera: {str(e)}")
@@ -82,46 +438,93 @@ class CameraManager:
         camera = self.get_active_camera()
         if camera:
             try:
-                raw = int(zoom_speed)
-                p = max(0, min(7, abs(raw)))
-                if raw > 0:
-                    # Ensure minimum speed of 1 when non-zero
-                    p = max(1, p)
-                    # Zoom in (tele) variable speed: 81 01 04 07 2p FF
-                    self._send_command(camera, bytes([0x81, 0x01, 0x04, 0x07, 0x20 | p, 0xFF]))
-                elif raw < 0:
-                    p = max(1, p)
-                    # Zoom out (wide) variable speed: 81 01 04 07 3p FF
-                    self._send_command(camera, bytes([0x81, 0x01, 0x04, 0x07, 0x30 | p, 0xFF]))
-                else:
-                    # Zoom stop: 81 01 04 07 00 FF
-                    self._send_command(camera, bytes([0x81, 0x01, 0x04, 0x07, 0x00, 0xFF]))
+                # Manual zoom overrides a servo move in progress
+                if camera.zoom_servo.active:
+                    camera.zoom_servo.cancel()
+                speed = int(zoom_speed)
+                if self._send_zoom(camera, speed):
+                    camera.estimator.command_zoom(speed)
+                    camera.motion.refresh(zoom=bool(speed))
+                index = self.active_camera_index
+                if speed:
+                    self._zooming[index] = True
+                elif self._zooming.pop(index, False):
+                    # Zoom just stopped: refresh the cached ratio on the next heartbeat tick
+                    camera.health.request_probe()
                 return True
             except Exception as e:
                 self.logger.error(f"Error zooming camera: {str(e)}")
         return False
 
+    def pan_tilt_limits(self, index=None):
+        """((pan_min, pan_max), (tilt_min, tilt_max)) in 0.075 degree units, from the command table."""
+        camera = self.cameras[self.active_camera_index if index is None else index]
+        fields = {f.name: f for f in camera.commands['pan_tilt_absolute'].fields}
+        return (fields['p'].low, fields['p'].high), (fields['t'].low, fields['t'].high)
+
+    def query_pan_tilt_position(self, index=None):
+        """Read (pan, tilt) in 0.075 degree units with a position inquiry; None if no reply."""
+        if index is None:
+            index = self.active_camera_index
+        reply = self.inquire('pan_tilt_position', index)
+        if reply is None:
+            return None
+        position = (reply['p'], reply['t'])
+        zoom = self._last_known_positions.get(index, (0, 0, 0))[2]
+        self._last_known_positions[index] = (position[0], position[1], zoom)
+        self.cameras[index].estimator.correct(pan=position[0], tilt=position[1])
+        return position
+
+    def move_camera_absolute(self, pan, tilt, pan_speed=0x18, tilt_speed=0x17, index=None, manual=False):
+        """Absolute pan/tilt move (81 01 06 02) of the active camera, or the camera at
+        index; the camera servos to the position itself. A `manual` move (joystick
+        position mode) is dropped, returning False, while the AI tracker drives pan
+        or tilt: the command sets both axes, so it would fight the tracker."""
+        if index is None:
+            index = self.active_camera_index
+        if not (0 <= index < len(self.cameras)):
+            return False
+        if manual:
+            tracking = self._tracking.get(index)
+            if tracking is not None and tracking.active:
+                return False
+        camera = self.cameras[index]
+        try:
+            (pan_min, pan_max), (tilt_min, tilt_max) = self.pan_tilt_limits(index)
+            pan = max(pan_min, min(pan_max, int(pan)))
+            tilt = max(tilt_min, min(tilt_max, int(tilt)))
+            packet = camera.commands.build('pan_tilt_absolute', pan_speed, tilt_speed, pan, tilt)
+            if not self._send_packet(camera, packet):
+                return False
+            zoom = self._last_known_positions.get(index, (0, 0, 0))[2]
+            self._last_known_positions[index] = (pan, tilt, zoom)
+            camera.estimator.command_absolute(pan, tilt, pan_speed, tilt_speed)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error moving camera to position: {e}")
+            return False
+
     # OBSBOT Tail 2: Support absolute zoom ratio (VISCA: 81 01 04 47 0z 0z 0z 0z FF)
-    # where zzzz are decimal digits (BCD-coded nibbles). Ratio = (1..12)*1000 per vendor sheet.
-    def set_zoom_ratio(self, ratio_value: int) -> bool:
-        camera = self.get_active_camera()
-        if not camera:
+    # where zzzz is the ratio (1..12)*1000 as four hex nibbles, per vendor sheet.
+    def set_zoom_ratio(self, ratio_value: int, smooth=None, index=None) -> bool:
+        """Zoom to an absolute ratio. With the zoom servo (default, `zoom_servo.enabled`)
+        the camera zooms there at variable speed and lands with DIRECT; otherwise one
+        DIRECT jump is sent."""
+        if index is None:
+            index = self.active_camera_index
+        if not (0 <= index < len(self.cameras)):
             return False
+        camera = self.cameras[index]
         try:
-            ratio_value = int(ratio_value)
-            # Clamp vendor-stated range; fall back to 4-digit max 9999 if needed
-            if ratio_value < 1000:
-                ratio_value = 1000
-            if ratio_value > 12000:
-                ratio_value = 12000
-            # Convert to four BCD-coded bytes using the last 4 decimal digits
-            d = f"{ratio_value:05d}"[-4:]
-            b3 = 0x00 | int(d[0])
-            b2 = 0x00 | int(d[1])
-            b1 = 0x00 | int(d[2])
-            b0 = 0x00 | int(d[3])
-            cmd = bytes([0x81, 0x01, 0x04, 0x47, b3, b2, b1, b0, 0xFF])
-            self._send_command(camera, cmd)
+            # Clamp to the vendor-stated range
+            ratio_value = max(1000, min(12000, int(ratio_value)))
+            if smooth is None:
+                smooth = (self._settings.get('zoom_servo') or {}).get('enabled', True)
+            if smooth and camera.transport is not None:
+                camera.zoom_servo.move_to(ratio_value)
+                return True
+            if self._send_command(camera, camera.commands.build('zoom_direct', ratio_value)):
+                camera.estimator.command_zoom_direct(ratio_value)
             return True
         except Exception as e:
             self.logger.error(f"Error setting zoom ratio: {e}")
@@ -164,33 +567,93 @@ class CameraManager:
             return True
         return False
             
-    def _send_command(self, camera, command):
+    def _send_command(self, camera, command, force=False):
         """Send a raw VISCA payload to the camera using the library transport if available.
 
         Many VISCA-over-IP implementations wrap serial payloads with a transport header.
         The library likely knows how to do this, so prefer its send methods first.
+        Commands to a camera whose circuit breaker is open fail fast, unless `force`
+        (stops are always attempted).
         """
+        if not force and not self._is_available(camera):
+            self._record_suppressed(camera, command)
+            return False
+        started = time.perf_counter()
+        transport = self._send_via_fallbacks(camera, command)
+        self._record_send(camera, transport != TRANSPORT_NONE, started, command, transport)
+        return transport != TRANSPORT_NONE
+
+    def _send_packet(self, camera, packet):
+        """Joystick hot path: one send of a prebuilt payload over the persistent
+        transport. Falls back to the legacy chain if the transport could not be opened."""
+        if not self._is_available(camera):
+            self._record_suppressed(camera, packet)
+            return False
+        if self._io_worker is not None:
+            started = time.perf_counter()
+            ok = self._io_worker.send(camera.index, packet)
+            self._record_send(camera, ok, started, packet, TRANSPORT_WORKER)
+            return ok
+        transport = camera.transport
+        if transport is None:
+            return self._send_command(camera, packet)
+        started = time.perf_counter()
+        try:
+            transport.send(packet)
+        except OSError as e:
+            self._record_send(camera, False, started, packet, TRANSPORT_VISCA_IP)
+            # Rate-limited per camera (monitoring.logs); the packet is only rendered if logged
+            self.logger.error("Send of %s to %s failed: %s", HexBytes(packet), camera.name, e,
+                              extra={'rate_key': (camera.index, 'send')})
+            return False
+        self._record_send(camera, True, started, packet, TRANSPORT_VISCA_IP)
+        return True
+
+    def _send_pantilt(self, camera, pan_speed, tilt_speed):
+        """Pan/tilt drive; with the I/O worker only the latest velocity is handed over."""
+        if self._io_worker is None or not self._is_available(camera):
+            return self._send_packet(camera, camera.packets.pantilt(pan_speed, tilt_speed))
+        started = time.perf_counter()
+        ok = self._io_worker.set_pantilt(camera.index, pan_speed, tilt_speed)
+        self._record_send(camera, ok, started, camera.packets.pantilt(pan_speed, tilt_speed), TRANSPORT_WORKER)
+        return ok
+
+    def _send_zoom(self, camera, speed):
+        if self._io_worker is None or not self._is_available(camera):
+            return self._send_packet(camera, camera.packets.zoom(speed))
+        started = time.perf_counter()
+        ok = self._io_worker.set_zoom(camera.index, speed)
+        self._record_send(camera, ok, started, camera.packets.zoom(speed), TRANSPORT_WORKER)
+        return ok
+
+    def _record_suppressed(self, camera, command=b''):
+        stats = getattr(camera, 'stats', None)
+        if stats is not None:
+            stats.suppressed.inc()
+        self.journal.record(getattr(camera, 'index', 0), command, TRANSPORT_NONE, RESULT_SUPPRESSED)
+
+    def _send_via_fallbacks(self, camera, command):
+        """Walk the transport fallback chain. Returns the journal transport code used,
+        or TRANSPORT_NONE if nothing worked."""
+        health = getattr(camera, 'health', None)
         # Prefer library/public methods first
         try:
             if hasattr(camera, 'send_command') and callable(getattr(camera, 'send_command')):
-                self.logger.debug(f"send_command via library: {command.hex(' ')}")
                 camera.send_command(command)
-                return True
+                return TRANSPORT_LIBRARY
         except Exception:
             pass
         try:
             if hasattr(camera, 'send') and callable(getattr(camera, 'send')):
-                self.logger.debug(f"send via library: {command.hex(' ')}")
                 camera.send(command)
-                return True
+                return TRANSPORT_LIBRARY
         except Exception:
             pass
         try:
             # Some libs expose a 'write' or similar
             if hasattr(camera, 'write') and callable(getattr(camera, 'write')):
-                self.logger.debug(f"write via library: {command.hex(' ')}")
                 camera.write(command)
-                return True
+                return TRANSPORT_LIBRARY
         except Exception:
             pass
 
@@ -199,80 +662,220 @@ class CameraManager:
             ip = getattr(camera, 'ip', None)
             port = getattr(camera, 'port', None)
             if ip and port:
-                self.logger.debug(f"TCP send to {ip}:{port} payload: {command.hex(' ')}")
                 with socket.create_connection((ip, int(port)), timeout=0.8) as s:
                     s.sendall(command)
-                return True
+                if health is not None:
+                    health.record_success()
+                return TRANSPORT_TCP
         except Exception as e:
-            self.logger.error(f"TCP send failed: {e}")
+            self.logger.error(f"TCP send to {camera.name} failed: {e}")
+            if health is not None:
+                health.record_failure()
+                if not health.allow_request():
+                    return TRANSPORT_NONE
 
         # Fallback to raw UDP (may not work for all cameras if a transport header is required)
         try:
             ip = getattr(camera, 'ip', None)
             port = getattr(camera, 'port', None)
             if ip and port:
-                self.logger.debug(f"UDP send to {ip}:{port} payload: {command.hex(' ')}")
                 with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
                     s.settimeout(0.5)
                     s.sendto(command, (ip, int(port)))
-                return True
+                return TRANSPORT_UDP
         except Exception as e:
-            self.logger.error(f"UDP send failed: {e}")
+            self.logger.error(f"UDP send to {camera.name} failed: {e}")
 
         # As a last resort, try private sockets
         try:
             if hasattr(camera, '_socket'):
-                self.logger.debug(f"private _socket send: {command.hex(' ')}")
                 camera._socket.send(command)
-                return True
+                return TRANSPORT_SOCKET
             if hasattr(camera, 'socket'):
-                self.logger.debug(f"private socket send: {command.hex(' ')}")
                 camera.socket.send(command)
-                return True
+                return TRANSPORT_SOCKET
         except Exception as e:
-            self.logger.error(f"Error sending command to camera (private socket): {str(e)}")
-        self.logger.error("No method found to send commands to camera")
-        return False
+            self.logger.error(f"Error sending command to {camera.name} (private socket): {str(e)}")
+        self.logger.error(f"No method found to send commands to {camera.name}")
+        return TRANSPORT_NONE
     
     def stop_camera(self):
         """Stop all movement of the active camera"""
         camera = self.get_active_camera()
         if camera:
             try:
-                # Prefer pantilt(0,0) which most libs treat as stop
-                try:
-                    camera.pantilt(0, 0)
-                except AttributeError:
-                    # Raw VISCA: PanTilt stop (vv=00 ww=00, dir codes 03 03)
-                    self._send_command(camera, bytes([0x81, 0x01, 0x06, 0x01, 0x00, 0x00, 0x03, 0x03, 0xFF]))
-
-                try:
-                    camera.zoom_stop()
-                except AttributeError:
-                    # Raw VISCA: Zoom stop
-                    self._send_command(camera, bytes([0x81, 0x01, 0x04, 0x07, 0x00, 0xFF]))
-                return True
+                camera.zoom_servo.cancel()
+                camera.motion.clear()
+                # Always attempted, even with the breaker open: a flaky camera may still be moving
+                return self._send_stops(camera, "Stop")
             except Exception as e:
                 self.logger.error(f"Error stopping camera: {str(e)}")
         return False
-    
-    def update_camera_config(self, index, name, ip, port):
-        """Update camera configuration"""
-        if 0 <= index < len(self.cameras):
+
+    def keep_motion_alive(self):
+        """Renew the active camera's deadman lease without sending anything, for input
+        that starts motion once and holds it (GUI press-and-hold buttons)."""
+        camera = self.get_active_camera()
+        if camera is not None and camera.motion.driving:
+            camera.motion.refresh()
+
+    def stop_all_motion(self, reason=DISCONNECT):
+        """Deadman stop of every camera manual input is driving (e.g. the controller
+        was unplugged). On EXIT every camera is stopped."""
+        for camera in list(self.cameras):
+            if camera.motion.clear() or reason == EXIT:
+                self._deadman.fire(camera, reason)
+
+    def stop_deadman(self):
+        """App exit: stop the watchdog and send a final stop to every camera."""
+        self._deadman.stop()
+        self.stop_all_motion(EXIT)
+
+    def is_busy(self):
+        """True while manual input drives a camera or the zoom servo is moving one
+        (keeps the app out of idle mode)."""
+        return any(camera.motion.driving or camera.zoom_servo.active for camera in list(self.cameras))
+
+    def set_idle(self, idle):
+        """Idle power mode (idle.IdleMonitor listener): heartbeats of cameras that are
+        not tracking, and the tracking sweep, slow to `idle.heartbeat_interval`.
+        Leaving it restores them and probes the active camera right away."""
+        health_cfg = self._settings.get('health') or {}
+        slow = (self._settings.get('idle') or {}).get('heartbeat_interval', 30.0)
+        normal = health_cfg.get('heartbeat_interval', 2.0)
+        for index, camera in enumerate(list(self.cameras)):
+            # A tracking camera moves on its own; its position stays fresh
+            camera.health.heartbeat_interval_s = slow if idle and not self.is_tracking(index) else normal
+        if self._tracking_sync is not None:
+            interval = (self._settings.get('tracking') or {}).get('refresh_interval', 10.0)
+            self._tracking_sync.interval_s = max(interval, slow) if idle else interval
+        camera = self.get_active_camera()
+        if not idle and camera is not None:
+            camera.health.request_probe()
+
+    def _deadman_stop(self, camera, reason):
+        self._send_stops(camera, f"Deadman stop ({reason})")
+
+    def _send_stops(self, camera, what):
+        """Stop pan/tilt and zoom with one send each over the pooled transport, ahead
+        of everything else: no circuit breaker or I/O worker queue. Failures are
+        recorded, never suppressed. Returns True if both sends went out."""
+        ok = True
+        if self._io_worker is not None:
+            # Leave the worker holding zero speeds so it cannot re-send the old ones
+            self._io_worker.set_pantilt(camera.index, 0, 0)
+            self._io_worker.set_zoom(camera.index, 0)
+        transport = camera.transport
+        for packet in (camera.packets.stop, camera.packets.zoom_stop):
+            started = time.perf_counter()
+            if transport is None:
+                # No socket to use: the slow path is still better than no stop
+                ok = self._send_command(camera, packet, force=True) and ok
+                continue
             try:
-                # Create a new camera with updated settings
-                camera = Camera(ip, port)
-                camera.name = name
-                camera.ip = ip
-                camera.port = port
-                
-                # Replace the old camera
-                self.cameras[index] = camera
-                return True
-            except Exception as e:
-                self.logger.error(f"Error updating camera config: {str(e)}")
-        return False
+                transport.send(packet)
+            except OSError as e:
+                self._record_send(camera, False, started, packet, TRANSPORT_VISCA_IP)
+                self.logger.error(f"{what} to {camera.name} failed: {e}")
+                ok = False
+                continue
+            self._record_send(camera, True, started, packet, TRANSPORT_VISCA_IP)
+        camera.estimator.command_pantilt(0, 0)
+        camera.estimator.command_zoom(0)
+        return ok
     
+    def update_camera_config(self, index, config):
+        """Update a camera from its config entry (name, ip, port, model, calibration,
+        backend, simulator), like add_camera.
+
+        Only a changed address reconnects, and the new camera is built from the entry
+        alone: nothing of the old physical camera (calibration, presets) carries over.
+        Otherwise the camera object, its transport and all cached state (position,
+        zoom, health, tracking) stay as they are and just the changed settings are
+        swapped in.
+        """
+        if not (0 <= index < len(self.cameras)):
+            return False
+        old_camera = self.cameras[index]
+        try:
+            ip, port = config['ip'], int(config.get('port', 52381))
+            model = load_model(config.get('model')).model
+            model_changed = model != old_camera.commands.model
+            if (ip, port) == (old_camera.ip, int(old_camera.port)):
+                self._update_camera_in_place(old_camera, config, model if model_changed else None)
+            else:
+                self._swap_camera(old_camera, config)
+            if model_changed or old_camera is not self.cameras[index]:
+                self._restart_io_worker()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error updating camera config: {str(e)}")
+        return False
+
+    def _update_camera_in_place(self, camera, config, model=None):
+        name = config['name']
+        if name != camera.name:
+            old_name, camera.stats = camera.name, _CameraStats(name)
+            if camera.transport is not None:
+                camera.transport.ack_latency = camera.stats.ack_latency
+            camera.name = name
+            self._release_metrics(old_name)
+        camera.calibration = SpeedCalibration.from_config(config.get('calibration'))
+        camera.estimator.calibration = camera.calibration
+        if model is not None:
+            commands = load_model(model)
+            # Packets first: the hot path only reads camera.packets
+            camera.packets = packet_table(commands)
+            camera.commands = commands
+            camera.zoom_servo.stop()
+            self._attach_model_state(camera)
+        backend, overrides = config.get('backend', 'visca'), config.get('simulator')
+        simulated = getattr(camera, 'simulated', None)
+        resimulate = simulated is not None and (model is not None or overrides != simulated.overrides)
+        if backend != camera.backend or resimulate:
+            # Same address, now simulated, no longer simulated, or answering as the new model
+            if simulated is not None:
+                self._simulator.remove(simulated)
+                camera.simulated = None
+            camera.backend = backend
+            if backend == SIMULATOR_BACKEND:
+                self._attach_simulator(camera, overrides)
+        self.logger.info(f"Updated camera {name} at {camera.ip}:{camera.port} (connection kept)")
+
+    def _swap_camera(self, old_camera, config):
+        """Replace a camera whose address changed with one new object, so a sender sees
+        either the old or the new camera, never a half-updated one. The new address is
+        another physical camera: everything is built from its config entry."""
+        index = old_camera.index
+        name, ip, port = config['name'], config['ip'], int(config.get('port', 52381))
+        camera = Camera(ip, port)
+        camera.name = name
+        camera.ip = ip
+        camera.port = port
+        camera.index = index
+        camera.commands = load_model(config.get('model'))
+        camera.packets = packet_table(camera.commands)
+        camera.calibration = SpeedCalibration.from_config(config.get('calibration'))
+        camera.backend = config.get('backend', 'visca')
+        if camera.backend == SIMULATOR_BACKEND:
+            self._attach_simulator(camera, config.get('simulator'))
+        self._attach_transport(camera)
+
+        # Don't leave the old camera running on its last command
+        if old_camera.motion.clear():
+            self._deadman_stop(old_camera, "reconnect")
+        self.cameras[index] = camera
+        self._release_transport(old_camera, replacement=camera)
+        self._release_metrics(old_camera.name)
+
+        # Cached state and software presets described the old address
+        for state in (self._last_known_positions, self._last_zoom_ratio, self._zooming,
+                      self._fix_requested, self._tracking, self._manual_moving):
+            state.pop(index, None)
+        for key in [key for key in self._software_presets if key[0] == index]:
+            del self._software_presets[key]
+        self.logger.info(f"Reconnected camera {name} to {ip}:{port}")
+
     def store_preset(self, preset_num):
         """Store current camera position to a preset"""
         if self.active_camera_index < 0 or self.active_camera_index >= len(self.cameras):
@@ -286,7 +889,7 @@ class CameraManager:
             # Try with 1-based first (common), then 0-based
             for code in (preset_num, preset_num - 1):
                 try:
-                    command = bytes([0x81, 0x01, 0x04, 0x3F, 0x01, max(0, code) & 0xFF, 0xFF])
+                    command = camera.commands.build('preset_set', max(0, code))
                     if self._send_command(camera, command):
                         return True
                 except Exception:
@@ -296,12 +899,14 @@ class CameraManager:
             print(f"Error storing preset: {e}")
             return False
     
-    def recall_preset(self, preset_num):
-        """Recall a stored preset position"""
-        if self.active_camera_index < 0 or self.active_camera_index >= len(self.cameras):
+    def recall_preset(self, preset_num, index=None):
+        """Recall a stored preset position on the active camera (or the camera at index)"""
+        if index is None:
+            index = self.active_camera_index
+        if index < 0 or index >= len(self.cameras):
             return False
         
-        camera = self.cameras[self.active_camera_index]
+        camera = self.cameras[index]
         try:
             # Send VISCA command to recall preset
             # Preset recall command format: 8x 01 04 3F 02 pp FF
@@ -309,7 +914,7 @@ class CameraManager:
             # Try with 1-based first (common), then 0-based
             for code in (preset_num, preset_num - 1):
                 try:
-                    command = bytes([0x81, 0x01, 0x04, 0x3F, 0x02, max(0, code) & 0xFF, 0xFF])
+                    command = camera.commands.build('preset_recall', max(0, code))
                     if self._send_command(camera, command):
                         return True
                 except Exception:
@@ -317,4 +922,239 @@ class CameraManager:
             return False
         except Exception as e:
             print(f"Error recalling preset: {e}")
-            return False
\ No newline at end of file
+            return False
+    def store_software_preset(self, slot, index=None):
+        """Remember the camera's estimated pan/tilt/zoom under slot, in memory.
+
+        Only an inquiry when the estimate has lost confidence; returns the stored
+        (pan, tilt, zoom) or None if the position is unknown."""
+        index = self.active_camera_index if index is None else index
+        if not (0 <= index < len(self.cameras)):
+            return None
+        estimator = self.cameras[index].estimator
+        if estimator.needs_fix(self._min_confidence()) and self.query_pan_tilt_position(index) is None:
+            return None
+        estimate = estimator.estimate()
+        preset = (int(round(estimate.pan)), int(round(estimate.tilt)), int(round(estimate.zoom)))
+        self._software_presets[(index, slot)] = preset
+        return preset
+
+    def recall_software_preset(self, slot, index=None):
+        """Drive a camera to a software preset (absolute move plus zoom ratio)."""
+        if index is None:
+            index = self.active_camera_index
+        preset = self._software_presets.get((index, slot))
+        if preset is None:
+            return False
+        pan, tilt, zoom = preset
+        if not self.move_camera_absolute(pan, tilt, index=index):
+            return False
+        return self.set_zoom_ratio(zoom, index=index)
+
+    def calibrate_speeds(self, index, move_s=1.0, settle_s=0.3, steps=None):
+        """Measure the speed step -> velocity tables of the camera at index.
+
+        Centres the camera and zooms out, then drives each pan, tilt and zoom step
+        out and back while reading the position (see SpeedCalibrator). Blocks for
+        several minutes. The result is applied to the camera's position estimate
+        and returned; store `calibration.to_config()` under the camera in config."""
+        camera = self.cameras[index]
+        if camera.transport is None:
+            raise RuntimeError(f"{camera.name}: no VISCA-over-IP transport")
+        camera.zoom_servo.cancel()
+        limits = self.pan_tilt_limits(index)
+        self._send_packet(camera, camera.commands.build('pan_tilt_absolute', 0x18, 0x17, 0, 0))
+        self._send_packet(camera, camera.commands.build('zoom_direct', 1000))
+        calibrator = SpeedCalibrator(
+            send=lambda payload: self._send_packet(camera, payload),
+            read_pan_tilt=lambda: self.query_pan_tilt_position(index),
+            read_zoom=lambda: self._inquire_zoom_ratio(camera),
+            packets=camera.packets,
+            limits=limits,
+            move_s=move_s,
+            settle_s=settle_s,
+        )
+        calibration = calibrator.run(steps)
+        camera.calibration = calibration
+        camera.estimator.calibration = calibration
+        return calibration
+
+    def supports_tracking(self, index):
+        camera = self.cameras[index]
+        return all(name in camera.commands.inquiries for name in TRACKING_INQUIRIES)
+
+    def refresh_tracking(self):
+        """Read the AI tracking state of every reachable camera in one pipelined sweep
+        (all inquiries sent before any reply is awaited) and cache it."""
+        targets = [
+            (index, camera) for index, camera in enumerate(self.cameras)
+            if getattr(camera, 'transport', None) is not None and self._is_available(camera)
+            and self.supports_tracking(index)
+        ]
+        requests = [(camera.transport, camera.commands.inquiry(name).packet)
+                    for _, camera in targets for name in TRACKING_INQUIRIES]
+        timeout = (self._settings.get('health') or {}).get('timeout', 0.3)
+        replies = inquire_all(requests, timeout)
+        count = len(TRACKING_INQUIRIES)
+        for n, (index, camera) in enumerate(targets):
+            state = state_from_replies(camera.commands, replies[n * count:(n + 1) * count])
+            if state is not None:
+                self._tracking[index] = state
+        return dict(self._tracking)
+
+    def get_tracking(self, index=None):
+        """Cached TrackingState of a camera (None until it has been read or set)."""
+        return self._tracking.get(self.active_camera_index if index is None else index)
+
+    def get_tracking_states(self):
+        """{index: TrackingState} for every camera whose tracking state is known."""
+        return dict(self._tracking)
+
+    def is_tracking(self, index=None):
+        state = self.get_tracking(index)
+        return state is not None and state.active
+
+    def set_tracking(self, index=None, **changes):
+        """Change AI tracking settings (TrackingState fields, e.g. pan_auto=True,
+        auto_zoom=2). Only the commands whose settings changed are sent."""
+        if index is None:
+            index = self.active_camera_index
+        if not (0 <= index < len(self.cameras)) or not self.supports_tracking(index):
+            return False
+        camera = self.cameras[index]
+        current = self._tracking.get(index) or TrackingState()
+        new = current._replace(**changes)
+        try:
+            ok = True
+            if new.mode != current.mode:
+                ok = self._send_packet(camera, camera.commands.build('ai_track_mode', new.mode)) and ok
+            if new.speed_params() != current.speed_params() or 'pan_auto' in changes or 'tilt_auto' in changes:
+                ok = self._send_packet(camera, camera.commands.build('ai_track_speed', *new.speed_params())) and ok
+            if new.auto_zoom != current.auto_zoom:
+                ok = self._send_packet(camera, camera.commands.build('ai_auto_zoom', new.auto_zoom)) and ok
+            if new.only_me != current.only_me:
+                ok = self._send_packet(camera, camera.commands.build('ai_only_me', int(new.only_me))) and ok
+        except ValueError as e:
+            self.logger.error(f"Invalid tracking setting for {camera.name}: {e}")
+            return False
+        if ok:
+            self._tracking[index] = new
+            self._manual_moving.pop(index, None)
+        return ok
+
+    def set_tracking_enabled(self, enabled, index=None):
+        """Hand pan and tilt to the AI tracker (True) or back to manual control (False)."""
+        return self.set_tracking(index, pan_auto=bool(enabled), tilt_auto=bool(enabled))
+
+    def capture_image_settings(self, indices=None):
+        """Read focus/exposure/white balance/brightness settings from every reachable
+        camera (or the given indexes) in one pipelined sweep.
+        Returns {index: {setting: value}}."""
+        if indices is None:
+            indices = range(len(self.cameras))
+        targets = []
+        for index in indices:
+            camera = self.cameras[index]
+            if getattr(camera, 'transport', None) is None or not self._is_available(camera):
+                continue
+            settings = supported_settings(camera.commands)
+            if settings:
+                targets.append((index, camera, settings))
+        requests = [(camera.transport, camera.commands.inquiry(setting.name).packet)
+                    for _, camera, settings in targets for setting in settings]
+        timeout = (self._settings.get('health') or {}).get('timeout', 0.3)
+        replies = inquire_all(requests, timeout)
+        captured = {}
+        offset = 0
+        for index, camera, settings in targets:
+            values = settings_from_replies(camera.commands, settings, replies[offset:offset + len(settings)])
+            offset += len(settings)
+            if values:
+                captured[index] = values
+        return captured
+
+    def apply_image_settings(self, profile):
+        """Push an image-settings profile ({index: {setting: value}}) to its cameras.
+        The current values are read in one sweep and each camera only receives the
+        settings that differ; cameras are updated concurrently.
+        Returns {index: True/False}."""
+        indices = [index for index in profile if 0 <= index < len(self.cameras)]
+        current = self.capture_image_settings(indices)
+        results = {index: False for index in indices}
+
+        def apply(index):
+            camera = self.cameras[index]
+            changes = plan_changes(supported_settings(camera.commands), current[index], profile[index])
+            ok = True
+            for setting, value in changes:
+                try:
+                    if setting.direct:
+                        ok = self._send_packet(camera, camera.commands.build(setting.direct, value)) and ok
+                    else:
+                        ok = self._step_setting(camera, setting, value) and ok
+                except ValueError as e:
+                    self.logger.error(f"Invalid {setting.name} for {camera.name}: {e}")
+                    ok = False
+            if changes:
+                self.logger.info(f"Image settings for {camera.name}: {len(changes)} change(s)")
+            results[index] = ok
+
+        threads = [threading.Thread(target=apply, args=(index,), name=f"ImageSettings-{index}", daemon=True)
+                   for index in indices if index in current]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _step_setting(self, camera, setting, target, max_steps=64):
+        """Walk an up/down-only setting to target, reading it back after each step.
+        Stops on the target, when it would pass it, or when the camera stops responding to steps."""
+        up, down = setting.step
+        inquiry = camera.commands.inquiry(setting.name)
+        value = inquiry.value(camera.transport.inquire(inquiry.packet))
+        stuck = 0
+        for _ in range(max_steps):
+            if value is None:
+                return False
+            if value == target:
+                return True
+            direction = 1 if target > value else -1
+            if not self._send_packet(camera, camera.commands.build(up if direction > 0 else down)):
+                return False
+            new = inquiry.value(camera.transport.inquire(inquiry.packet))
+            if new is not None and (new - target) * direction > 0:
+                # Steps are coarser than the stored value: keep the closer of the two
+                if abs(new - target) > abs(value - target):
+                    self._send_packet(camera, camera.commands.build(down if direction > 0 else up))
+                return True
+            stuck = stuck + 1 if new == value else 0
+            if stuck >= 3:
+                self.logger.warning(f"{camera.name}: {setting.name} stuck at {value}, wanted {target}")
+                return False
+            value = new
+        return value == target
+
+    def send_named_command(self, name, *params, index=None):
+        """Send a command from the camera model's table (e.g. 'focus_mode', 2) to the
+        active camera, or to the camera at index. Invalid parameters raise ValueError."""
+        if index is None:
+            index = self.active_camera_index
+        if not (0 <= index < len(self.cameras)):
+            return False
+        camera = self.cameras[index]
+        return self._send_command(camera, camera.commands.build(name, *params))
+
+    def inquire(self, name, index=None):
+        """Run a table inquiry (e.g. 'exposure_mode') over the persistent transport.
+        Returns the decoded reply fields as a dict, or None."""
+        if index is None:
+            index = self.active_camera_index
+        if not (0 <= index < len(self.cameras)):
+            return None
+        camera = self.cameras[index]
+        transport = getattr(camera, 'transport', None)
+        if transport is None or not self._is_available(camera):
+            return None
+        inquiry = camera.commands.inquiry(name)
+        return inquiry.parse(transport.inquire(inquiry.packet))
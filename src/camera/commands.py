@@ -0,0 +1,185 @@
+"""VISCA command registry compiled from per-model command tables.
+
+A model table (see `camera/models/`, generated by tools/gen_command_table.py)
+lists packet templates such as ``81 01 04 07 2p FF``: hex bytes are fixed,
+``0p``/``2p`` put one nibble of parameter p into the low nibble, ``vv`` fills a
+whole byte, and repeated placeholders (``0z 0z 0z 0z``) carry a multi-nibble
+value most significant nibble first. Templates are compiled once into immutable
+bytes plus precomputed (byte index, shift, mask) slots, so building a packet is
+a copy and a few OR operations. Out-of-range parameters raise ValueError.
+"""
+import importlib
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MODEL = "obsbot_tail_2"
+
+_FIXED = re.compile(r"^[0-9A-Fa-f]{2}$")
+_NIBBLE = re.compile(r"^([0-9A-Fa-f])([a-z])$")
+_BYTE = re.compile(r"^([a-z])\1$")
+
+
+class Field:
+    """One parameter (or reply field) and the template slots it occupies."""
+
+    __slots__ = ("name", "slots", "bits", "low", "high", "choices")
+
+    def __init__(self, name: str, positions, spec):
+        self.name = name
+        # positions: [(byte index, bit width)] in template order, most significant first
+        self.bits = sum(width for _index, width in positions)
+        slots = []
+        shift = self.bits
+        for index, width in positions:
+            shift -= width
+            slots.append((index, shift, (1 << width) - 1))
+        self.slots = tuple(slots)
+        if isinstance(spec, (set, frozenset)):
+            self.choices = frozenset(spec)
+            self.low, self.high = min(spec), max(spec)
+        else:
+            self.choices = None
+            self.low, self.high = spec
+        if self.high >= 1 << self.bits or self.low < -(1 << (self.bits - 1)):
+            raise ValueError(f"Field {name}: range {self.low}..{self.high} does not fit {self.bits} bits")
+
+    def check(self, value: int) -> int:
+        if self.choices is not None:
+            if value not in self.choices:
+                raise ValueError(f"{self.name}={value!r} not one of {sorted(self.choices)}")
+        elif not (self.low <= value <= self.high):
+            raise ValueError(f"{self.name}={value!r} out of range {self.low:#x}..{self.high:#x}")
+        # Negative values are sent two's complement (absolute pan/tilt positions)
+        return value + (1 << self.bits) if value < 0 else value
+
+    def decode(self, data) -> int:
+        value = 0
+        for index, shift, mask in self.slots:
+            value |= (data[index] & mask) << shift
+        if self.low < 0 and value >= 1 << (self.bits - 1):
+            value -= 1 << self.bits
+        return value
+
+
+def _compile(template: str, specs) -> Tuple[bytes, Tuple[Field, ...]]:
+    base = bytearray()
+    positions: Dict[str, list] = {}
+    for index, token in enumerate(template.split()):
+        if token in ("y0", "8x"):
+            # Reply/camera address byte; only meaningful in replies
+            base.append(0x90 if token == "y0" else 0x81)
+        elif _FIXED.match(token):
+            base.append(int(token, 16))
+        elif _NIBBLE.match(token):
+            high, name = _NIBBLE.match(token).groups()
+            base.append(int(high, 16) << 4)
+            positions.setdefault(name, []).append((index, 4))
+        elif _BYTE.match(token):
+            base.append(0)
+            positions.setdefault(token[0], []).append((index, 8))
+        else:
+            raise ValueError(f"Unrecognised template token {token!r} in {template!r}")
+    missing = set(positions) - set(specs)
+    if missing:
+        raise ValueError(f"No spec for {sorted(missing)} in {template!r}")
+    # Parameter order is order of first appearance in the packet
+    fields = tuple(Field(name, positions[name], specs[name]) for name in positions)
+    return bytes(base), fields
+
+
+class Command:
+    """A compiled command: `build(*params)` returns the VISCA payload."""
+
+    __slots__ = ("name", "template", "fields", "labels")
+
+    def __init__(self, name: str, packet: str, params, labels=None):
+        self.name = name
+        self.template, self.fields = _compile(packet, params)
+        self.labels = labels or {}
+
+    def build(self, *values: int) -> bytes:
+        fields = self.fields
+        if len(values) != len(fields):
+            raise ValueError(f"{self.name} takes {len(fields)} parameter(s), got {len(values)}")
+        if not fields:
+            return self.template
+        buf = bytearray(self.template)
+        for field, value in zip(fields, values):
+            value = field.check(value)
+            for index, shift, mask in field.slots:
+                buf[index] |= (value >> shift) & mask
+        return bytes(buf)
+
+
+class Inquiry:
+    """A compiled inquiry: fixed packet plus a reply decoder."""
+
+    __slots__ = ("name", "packet", "reply_template", "reply_length", "fields", "labels")
+
+    def __init__(self, name: str, packet: str, reply: str, fields, labels=None):
+        self.name = name
+        self.packet, _ = _compile(packet, {})
+        self.reply_template, self.fields = _compile(reply, fields)
+        self.reply_length = len(self.reply_template)
+        self.labels = labels or {}
+
+    def parse(self, reply: Optional[bytes]) -> Optional[Dict[str, int]]:
+        """Decode a ``y0 50 ... FF`` reply into {field: value}; None if it does not match."""
+        if reply is None or len(reply) < self.reply_length or reply[1] != 0x50:
+            return None
+        return {field.name: field.decode(reply) for field in self.fields}
+
+    def value(self, reply: Optional[bytes]) -> Optional[int]:
+        """Single-field replies: the decoded value, or None."""
+        if reply is None or len(reply) < self.reply_length or reply[1] != 0x50:
+            return None
+        return self.fields[0].decode(reply)
+
+    def encode(self, values: Dict[str, int]) -> bytes:
+        """Build the ``y0 50 ... FF`` reply carrying `values` (camera side, e.g. the simulator)."""
+        buf = bytearray(self.reply_template)
+        for field in self.fields:
+            value = field.check(values[field.name])
+            for index, shift, mask in field.slots:
+                buf[index] |= (value >> shift) & mask
+        return bytes(buf)
+
+
+class CommandSet:
+    """All compiled commands and inquiries of one camera model."""
+
+    def __init__(self, model: str, commands, inquiries):
+        self.model = model
+        self.commands = {name: Command(name, e["packet"], e["params"], e.get("labels"))
+                         for name, e in commands.items()}
+        self.inquiries = {name: Inquiry(name, e["packet"], e["reply"], e["fields"], e.get("labels"))
+                          for name, e in inquiries.items()}
+
+    def __getitem__(self, name: str) -> Command:
+        return self.commands[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.commands
+
+    def build(self, name: str, *values: int) -> bytes:
+        return self.commands[name].build(*values)
+
+    def inquiry(self, name: str) -> Inquiry:
+        return self.inquiries[name]
+
+
+_models: Dict[str, CommandSet] = {}
+_models_lock = threading.Lock()
+
+
+def load_model(model: Optional[str] = None) -> CommandSet:
+    """Compiled command set for a model table in `camera.models` (cached per model)."""
+    model = model or DEFAULT_MODEL
+    with _models_lock:
+        command_set = _models.get(model)
+        if command_set is None:
+            table = importlib.import_module(f"{__package__}.models.{model}")
+            command_set = CommandSet(table.MODEL, table.COMMANDS, table.INQUIRIES)
+            _models[model] = command_set
+    return command_set
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from monitoring.metrics import REGISTRY
+
+_DEADMAN_STOPS = REGISTRY.counter(
+    "rpiptz_deadman_stops_total", "Stops sent because motion input stalled, the controller went away or the app exited.",
+    ("camera", "reason"))
+
+TIMEOUT = "timeout"
+DISCONNECT = "disconnect"
+EXIT = "exit"
+
+
+class MotionLease:
+    """Deadman state of one camera: which axes manual input is driving and when
+    that input was last refreshed.
+
+    Streamed input (gamepad, headless loop) re-sends its speeds every poll, and
+    each send renews the lease. A lease that is driving and has not been renewed
+    within the window has lost its input; `claim_expired()` hands it to the
+    watchdog exactly once.
+    """
+
+    __slots__ = ("_lock", "pantilt", "zoom", "refreshed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pantilt = False
+        self.zoom = False
+        self.refreshed = 0.0
+
+    @property
+    def driving(self) -> bool:
+        return self.pantilt or self.zoom
+
+    def refresh(self, pantilt: Optional[bool] = None, zoom: Optional[bool] = None) -> None:
+        """Renew the lease; `pantilt` / `zoom` say whether that axis is now moving
+        (None leaves it as it was)."""
+        with self._lock:
+            if pantilt is not None:
+                self.pantilt = pantilt
+            if zoom is not None:
+                self.zoom = zoom
+            self.refreshed = time.monotonic()
+
+    def clear(self) -> bool:
+        """Release the lease. Returns whether it was driving."""
+        with self._lock:
+            driving = self.pantilt or self.zoom
+            self.pantilt = self.zoom = False
+            return driving
+
+    def claim_expired(self, now: float, window_s: float) -> bool:
+        with self._lock:
+            if not (self.pantilt or self.zoom) or now - self.refreshed <= window_s:
+                return False
+            self.pantilt = self.zoom = False
+            return True
+
+
+class DeadmanWatchdog:
+    """Stops cameras whose motion input went quiet.
+
+    `get_cameras` returns the current camera objects (each with a `motion`
+    MotionLease), re-read every tick so camera changes are picked up, and
+    `stop(camera, reason)` sends the stop. Runs on its own thread so it keeps
+    working when the input thread or the Qt thread hangs.
+    """
+
+    def __init__(self, get_cameras: Callable[[], Iterable], stop: Callable[[object, str], None],
+                 window_s: float = 0.25, tick_s: Optional[float] = None):
+        self.window_s = float(window_s)
+        # Check a few times per window so an expiry is noticed well within it
+        self.tick_s = float(tick_s) if tick_s else max(0.005, self.window_s / 5)
+        self._get_cameras = get_cameras
+        self._stop_camera = stop
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        if self._thread is not None or self.window_s <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="DeadmanWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.tick_s):
+            now = time.monotonic()
+            for camera in list(self._get_cameras()):
+                lease = getattr(camera, 'motion', None)
+                if lease is None or not lease.claim_expired(now, self.window_s):
+                    continue
+                self.logger.warning(f"No motion input for {camera.name} in {self.window_s * 1000:.0f} ms, stopping it")
+                self.fire(camera, TIMEOUT)
+
+    def fire(self, camera, reason: str) -> None:
+        _DEADMAN_STOPS.labels(camera.name, reason).inc()
+        try:
+            self._stop_camera(camera, reason)
+        except Exception as e:
+            self.logger.error(f"Deadman stop of {camera.name} failed: {e}")
@@ -0,0 +1,297 @@
+import bisect
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Absolute pan/tilt positions are in units of 0.075 degrees (vendor sheet)
+DEGREES_PER_UNIT = 0.075
+
+# Nominal speed tables used until a camera is calibrated: VISCA speed step ->
+# signed degrees/second (or zoom ratio units/second). Positive pan speed is drive
+# code 02 (right), which increases the pan position; positive tilt speed is 02
+# (down), which decreases the tilt position.
+_NOMINAL_PAN = [(step, 4.0 * step) for step in range(1, 0x19)]
+_NOMINAL_TILT = [(step, -3.0 * step) for step in range(1, 0x18)]
+_NOMINAL_ZOOM = [(step, 450.0 * (step + 1)) for step in range(1, 8)]
+
+
+class SpeedTable:
+    """Speed step -> rate lookup with linear interpolation between measured steps."""
+
+    def __init__(self, points: Sequence[Tuple[int, float]]):
+        points = sorted((int(s), float(r)) for s, r in points if int(s) > 0)
+        self._steps = [s for s, _ in points]
+        self._rates = [r for _, r in points]
+        # Lookup by integer step is the hot path; precompute it for the whole range
+        top = self._steps[-1] if self._steps else 0
+        self._by_step = [self._interpolate(step) for step in range(top + 1)]
+
+    def _interpolate(self, step: int) -> float:
+        steps, rates = self._steps, self._rates
+        if not steps:
+            return 0.0
+        if step <= steps[0]:
+            return rates[0] * step / steps[0]
+        if step >= steps[-1]:
+            return rates[-1]
+        i = bisect.bisect_left(steps, step)
+        if steps[i] == step:
+            return rates[i]
+        s0, s1, r0, r1 = steps[i - 1], steps[i], rates[i - 1], rates[i]
+        return r0 + (r1 - r0) * (step - s0) / (s1 - s0)
+
+    def rate(self, signed_step: int) -> float:
+        """Rate for a signed speed step (the sign selects the direction)."""
+        magnitude = min(abs(signed_step), len(self._by_step) - 1)
+        rate = self._by_step[magnitude]
+        return rate if signed_step >= 0 else -rate
+
+    def max_rate(self) -> float:
+        return max((abs(r) for r in self._rates), default=0.0)
+
+    def step_for(self, rate: float) -> int:
+        """Unsigned step whose speed is closest to abs(rate) (0 for a zero rate)."""
+        rate = abs(rate)
+        if not rate:
+            return 0
+        return min(range(1, len(self._by_step)), key=lambda step: abs(abs(self._by_step[step]) - rate), default=0)
+
+    def duration(self, distance: float, signed_step: int) -> float:
+        """Seconds to cover distance (degrees or ratio units) at a step; inf if it does not move."""
+        rate = abs(self.rate(signed_step))
+        return abs(distance) / rate if rate else float('inf')
+
+    def points(self) -> List[Tuple[int, float]]:
+        return list(zip(self._steps, self._rates))
+
+
+class SpeedCalibration:
+    """Per-camera speed calibration: pan/tilt in degrees/second, zoom in ratio units/second.
+
+    `match_pan()`/`match_tilt()` translate a speed step into the step that gives
+    this camera the nominal speed of that step, so mixed models move alike.
+    """
+
+    def __init__(self, pan=None, tilt=None, zoom=None):
+        self.pan = SpeedTable(pan or _NOMINAL_PAN)
+        self.tilt = SpeedTable(tilt or _NOMINAL_TILT)
+        self.zoom = SpeedTable(zoom or _NOMINAL_ZOOM)
+        self._measured = {'pan': bool(pan), 'tilt': bool(tilt), 'zoom': bool(zoom)}
+        self.calibrated = any(self._measured.values())
+        self._pan_match = self._matching(self.pan, _NOMINAL_PAN) if pan else None
+        self._tilt_match = self._matching(self.tilt, _NOMINAL_TILT) if tilt else None
+
+    @staticmethod
+    def _matching(table: SpeedTable, nominal_points) -> Tuple[int, ...]:
+        nominal = SpeedTable(nominal_points)
+        top = nominal_points[-1][0]
+        return tuple(table.step_for(nominal.rate(step)) for step in range(top + 1))
+
+    @staticmethod
+    def _match(matching, step: int) -> int:
+        if matching is None:
+            return step
+        magnitude = matching[min(abs(step), len(matching) - 1)]
+        return magnitude if step >= 0 else -magnitude
+
+    def match_pan(self, step: int) -> int:
+        return self._match(self._pan_match, step)
+
+    def match_tilt(self, step: int) -> int:
+        return self._match(self._tilt_match, step)
+
+    @classmethod
+    def from_config(cls, cfg: Optional[dict]):
+        cfg = cfg or {}
+        return cls(
+            pan=[tuple(p) for p in cfg.get('pan') or []] or None,
+            tilt=[tuple(p) for p in cfg.get('tilt') or []] or None,
+            zoom=[tuple(p) for p in cfg.get('zoom') or []] or None,
+        )
+
+    def to_config(self) -> dict:
+        """Measured tables only; axes still on nominal rates are left out."""
+        tables = {'pan': (self.pan, 3), 'tilt': (self.tilt, 3), 'zoom': (self.zoom, 1)}
+        return {
+            axis: [[s, round(r, digits)] for s, r in table.points()]
+            for axis, (table, digits) in tables.items() if self._measured[axis]
+        }
+
+
+class Estimate(NamedTuple):
+    pan: float  # 0.075 degree units
+    tilt: float
+    zoom: float  # ratio 1000..12000
+    confidence: float  # 0 (unknown) .. 1 (just measured)
+    moving: bool
+    age_s: float  # time since the last real reply
+
+
+class PositionEstimator:
+    """Dead-reckoning estimate of one camera's pan/tilt/zoom between inquiries.
+
+    Commanded speeds are integrated with the camera's speed calibration; an
+    inquiry reply (`correct()`) snaps the estimate back to the measured value.
+    Every degree travelled at a commanded speed since the last fix adds
+    `drift_fraction` degrees of uncertainty (absolute moves add none), and
+    confidence falls off as that approaches `max_uncertainty_deg`.
+    Reads never touch the network.
+    """
+
+    def __init__(
+        self,
+        calibration: Optional[SpeedCalibration] = None,
+        pan_limits: Tuple[int, int] = (-0x855, 0x854),
+        tilt_limits: Tuple[int, int] = (-0x347, 0x346),
+        drift_fraction: float = 0.1,
+        max_uncertainty_deg: float = 5.0,
+    ):
+        self.calibration = calibration or SpeedCalibration()
+        self.pan_limits = pan_limits
+        self.tilt_limits = tilt_limits
+        self.drift_fraction = float(drift_fraction)
+        self.max_uncertainty_deg = float(max_uncertainty_deg)
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._t = now
+        self._pan = 0.0
+        self._tilt = 0.0
+        self._zoom = 1000.0
+        # Rates in units/second
+        self._pan_rate = 0.0
+        self._tilt_rate = 0.0
+        self._zoom_rate = 0.0
+        # Absolute-move targets (None while rate-driven)
+        self._pan_target: Optional[float] = None
+        self._tilt_target: Optional[float] = None
+        self._zoom_target: Optional[float] = None
+        self._absolute = False  # an absolute pan/tilt move is in flight
+        self._uncertainty_deg = float('inf')
+        self._zoom_known = False
+        self._last_fix: Optional[float] = None
+
+    # Integration
+    def _advance(self, now: float) -> None:
+        dt = now - self._t
+        self._t = now
+        if dt <= 0:
+            return
+        # Absolute moves end exactly on target, so only rate-driven travel adds drift
+        moved_units = 0.0
+        if self._pan_rate:
+            self._pan, moved = self._step(self._pan, self._pan_rate * dt, self._pan_target, self.pan_limits)
+            if self._pan_target is None:
+                moved_units += moved
+            if self._pan_target is not None and self._pan == self._pan_target:
+                self._pan_rate, self._pan_target = 0.0, None
+        if self._tilt_rate:
+            self._tilt, moved = self._step(self._tilt, self._tilt_rate * dt, self._tilt_target, self.tilt_limits)
+            if self._tilt_target is None:
+                moved_units += moved
+            if self._tilt_target is not None and self._tilt == self._tilt_target:
+                self._tilt_rate, self._tilt_target = 0.0, None
+        if self._zoom_rate:
+            self._zoom, _ = self._step(self._zoom, self._zoom_rate * dt, self._zoom_target, (1000, 12000))
+            if self._zoom_target is not None and self._zoom == self._zoom_target:
+                self._zoom_rate, self._zoom_target = 0.0, None
+        self._uncertainty_deg += moved_units * DEGREES_PER_UNIT * self.drift_fraction
+        if self._absolute and self._pan_target is None and self._tilt_target is None:
+            # Arrived: the camera is where it was told to be, whatever the estimate was before
+            self._absolute = False
+            self._uncertainty_deg = 0.0
+
+    @staticmethod
+    def _step(value, delta, target, limits):
+        new = value + delta
+        if target is not None and (delta > 0) == (target > value) and abs(target - value) <= abs(delta):
+            new = target
+        new = max(limits[0], min(limits[1], new))
+        return new, abs(new - value)
+
+    # Commands (called after a successful send)
+    def command_pantilt(self, pan_speed: int, tilt_speed: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            self._pan_rate = self.calibration.pan.rate(pan_speed) / DEGREES_PER_UNIT
+            self._tilt_rate = self.calibration.tilt.rate(tilt_speed) / DEGREES_PER_UNIT
+            self._pan_target = self._tilt_target = None
+            self._absolute = False
+
+    def command_absolute(self, pan: int, tilt: int, pan_speed: int = 0x18, tilt_speed: int = 0x17) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            pan_rate = abs(self.calibration.pan.rate(pan_speed)) / DEGREES_PER_UNIT
+            tilt_rate = abs(self.calibration.tilt.rate(tilt_speed)) / DEGREES_PER_UNIT
+            self._pan_target, self._tilt_target = float(pan), float(tilt)
+            self._pan_rate = pan_rate if pan > self._pan else -pan_rate if pan < self._pan else 0.0
+            self._tilt_rate = tilt_rate if tilt > self._tilt else -tilt_rate if tilt < self._tilt else 0.0
+            if not self._pan_rate:
+                self._pan_target = None
+            if not self._tilt_rate:
+                self._tilt_target = None
+            self._absolute = True
+
+    def command_zoom(self, speed: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            self._zoom_rate = self.calibration.zoom.rate(speed)
+            self._zoom_target = None
+
+    def command_zoom_direct(self, ratio: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            # DIRECT lands quickly; treat it as an immediate (unverified) jump
+            self._zoom, self._zoom_rate, self._zoom_target = float(ratio), 0.0, None
+
+    # Measurements
+    def correct(self, pan: Optional[int] = None, tilt: Optional[int] = None, zoom: Optional[int] = None) -> None:
+        """Apply an inquiry reply; pan/tilt replies reset the drift uncertainty."""
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            if pan is not None and tilt is not None:
+                self._pan, self._tilt = float(pan), float(tilt)
+                if self._pan_target is not None and self._pan == self._pan_target:
+                    self._pan_rate, self._pan_target = 0.0, None
+                if self._tilt_target is not None and self._tilt == self._tilt_target:
+                    self._tilt_rate, self._tilt_target = 0.0, None
+                self._uncertainty_deg = 0.0
+                self._last_fix = now
+            if zoom is not None:
+                self._zoom = float(zoom)
+                self._zoom_known = True
+                if self._zoom_target is not None and self._zoom == self._zoom_target:
+                    self._zoom_rate, self._zoom_target = 0.0, None
+
+    def estimate(self) -> Estimate:
+        now = time.monotonic()
+        with self._lock:
+            self._advance(now)
+            if self._uncertainty_deg == float('inf'):
+                confidence = 0.0
+            else:
+                confidence = max(0.0, 1.0 - self._uncertainty_deg / self.max_uncertainty_deg)
+            moving = bool(self._pan_rate or self._tilt_rate or self._zoom_rate)
+            age = now - self._last_fix if self._last_fix is not None else float('inf')
+            return Estimate(self._pan, self._tilt, self._zoom, confidence, moving, age)
+
+    @property
+    def has_zoom(self) -> bool:
+        """True once a measured zoom ratio has been applied."""
+        return self._zoom_known
+
+    def needs_fix(self, min_confidence: float = 0.5) -> bool:
+        return self.estimate().confidence < min_confidence
+
+    def to_dict(self) -> Dict[str, object]:
+        e = self.estimate()
+        return {
+            'pan': round(e.pan), 'tilt': round(e.tilt), 'zoom': round(e.zoom),
+            'pan_deg': round(e.pan * DEGREES_PER_UNIT, 2), 'tilt_deg': round(e.tilt * DEGREES_PER_UNIT, 2),
+            'zoom_x': round(e.zoom / 1000.0, 2), 'confidence': round(e.confidence, 3),
+            'moving': e.moving, 'age_s': None if e.age_s == float('inf') else round(e.age_s, 3),
+        }
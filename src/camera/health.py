@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+ONLINE = "online"
+DEGRADED = "degraded"
+OFFLINE = "offline"
+
+
+class CameraHealth:
+    """Health state and circuit breaker for a single camera.
+
+    - ONLINE: last heartbeat/command succeeded
+    - DEGRADED: some consecutive failures, commands still go out
+    - OFFLINE: failure threshold reached, the breaker is open and commands fast-fail
+      until a probe succeeds. Probes back off exponentially while offline.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        heartbeat_interval_s: float = 2.0,
+        base_backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+    ):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.heartbeat_interval_s = float(heartbeat_interval_s)
+        self.base_backoff_s = float(base_backoff_s)
+        self.max_backoff_s = float(max_backoff_s)
+
+        self._lock = threading.Lock()
+        self.state = ONLINE
+        self.consecutive_failures = 0
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self._breaker_open = False
+        self._backoff_s = self.base_backoff_s
+        # Probe immediately on start so the UI reflects reality quickly
+        self.next_probe = 0.0
+
+    def allow_request(self) -> bool:
+        """Fast check used on the command path; no locking needed for a bool read."""
+        return not self._breaker_open
+
+    def record_success(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.consecutive_failures = 0
+            self.last_success = now
+            self._breaker_open = False
+            self._backoff_s = self.base_backoff_s
+            self.state = ONLINE
+            self.next_probe = now + self.heartbeat_interval_s
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_failure = now
+            if self.consecutive_failures >= self.failure_threshold:
+                self._breaker_open = True
+                self.state = OFFLINE
+                self.next_probe = now + self._backoff_s
+                self._backoff_s = min(self.max_backoff_s, self._backoff_s * 2)
+            else:
+                self.state = DEGRADED
+                # Re-check soon rather than waiting a full heartbeat interval
+                self.next_probe = now + self.base_backoff_s
+
+    def request_probe(self) -> None:
+        """Ask for a heartbeat on the next monitor tick (no effect while backing off)."""
+        if not self._breaker_open:
+            self.next_probe = 0.0
+
+    def probe_due(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) >= self.next_probe
+
+
+class HealthMonitor:
+    """Background heartbeat/probe loop for all cameras.
+
+    `get_targets` returns the current {index: CameraHealth} mapping (re-read every
+    tick so camera changes are picked up), and `probe(index)` performs a single
+    blocking heartbeat, returning True if the camera answered.
+    """
+
+    def __init__(
+        self,
+        get_targets: Callable[[], Dict[int, CameraHealth]],
+        probe: Callable[[int], bool],
+        tick_s: float = 0.25,
+    ):
+        self._get_targets = get_targets
+        self._probe = probe
+        self._tick_s = tick_s
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="CameraHealthMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while self._running:
+            now = time.monotonic()
+            for index, health in list(self._get_targets().items()):
+                if not self._running:
+                    break
+                if not health.probe_due(now):
+                    continue
+                previous = health.state
+                try:
+                    ok = self._probe(index)
+                except Exception:
+                    ok = False
+                if ok:
+                    health.record_success()
+                else:
+                    health.record_failure()
+                if health.state != previous:
+                    self.logger.info(f"Camera {index + 1} health: {previous} -> {health.state}")
+            time.sleep(self._tick_s)
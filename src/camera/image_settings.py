@@ -0,0 +1,131 @@
+import logging
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+
+class Setting(NamedTuple):
+    """One image setting: the inquiry that reads it and how to write it back.
+
+    `direct` names a command taking the value; settings the vendor sheet only
+    exposes as up/down (gain, shutter, R/B gain) have a `step` pair instead and
+    are walked to the target with read-backs. `requires` is (mode setting,
+    value) when the setting only means something in that mode, e.g. gain in
+    manual exposure.
+    """
+    name: str
+    direct: Optional[str] = None
+    step: Optional[Tuple[str, str]] = None
+    requires: Optional[Tuple[str, int]] = None
+
+
+# Modes come before the values that depend on them, so they are restored first
+IMAGE_SETTINGS = (
+    Setting('focus_mode', direct='focus_mode'),
+    Setting('focus_position', direct='focus_direct', requires=('focus_mode', 3)),
+    Setting('exposure_mode', direct='exposure_mode'),
+    Setting('shutter', step=('shutter_up', 'shutter_down'), requires=('exposure_mode', 3)),
+    Setting('gain', step=('gain_up', 'gain_down'), requires=('exposure_mode', 3)),
+    Setting('backlight', direct='backlight'),
+    Setting('bright_position', direct='bright_direct'),
+    Setting('white_balance_mode', direct='white_balance_mode'),
+    Setting('red_gain', step=('red_gain_up', 'red_gain_down'), requires=('white_balance_mode', 5)),
+    Setting('blue_gain', step=('blue_gain_up', 'blue_gain_down'), requires=('white_balance_mode', 5)),
+)
+
+
+def supported_settings(commands) -> Tuple[Setting, ...]:
+    """The settings a camera model can both read and write."""
+    supported = []
+    for setting in IMAGE_SETTINGS:
+        writers = (setting.direct,) if setting.direct else setting.step or ()
+        if setting.name in commands.inquiries and writers and all(w in commands for w in writers):
+            supported.append(setting)
+    return tuple(supported)
+
+
+def settings_from_replies(commands, settings: Sequence[Setting], replies) -> Dict[str, int]:
+    """Decode one camera's replies; settings without a usable reply are left out."""
+    values = {}
+    for setting, reply in zip(settings, replies):
+        value = commands.inquiry(setting.name).value(reply)
+        if value is not None:
+            values[setting.name] = value
+    return values
+
+
+def plan_changes(settings: Sequence[Setting], current: Dict[str, int],
+                 target: Dict[str, int]) -> List[Tuple[Setting, int]]:
+    """(setting, value) pairs that differ from the camera's current values, in
+    restore order. Values whose mode the profile does not select are skipped."""
+    changes = []
+    for setting in settings:
+        if setting.name not in target:
+            continue
+        if setting.requires is not None:
+            mode, value = setting.requires
+            if target.get(mode, current.get(mode)) != value:
+                continue
+        if current.get(setting.name) != target[setting.name]:
+            changes.append((setting, int(target[setting.name])))
+    return changes
+
+
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class ProfileStore:
+    """Named image-settings profiles, one YAML file per profile::
+
+        cameras:
+          0: {focus_mode: 2, exposure_mode: 0, bright_position: 128, ...}
+          1: {...}
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, name: str) -> str:
+        if not _NAME.match(name):
+            raise ValueError(f"invalid profile name {name!r}")
+        return os.path.join(self.directory, f"{name}.yaml")
+
+    def names(self) -> List[str]:
+        try:
+            files = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(f[:-5] for f in files if f.endswith('.yaml') and _NAME.match(f[:-5]))
+
+    def load(self, name: str) -> Optional[Dict[int, Dict[str, int]]]:
+        """{camera index: {setting: value}}, or None if there is no such profile."""
+        try:
+            with open(self._path(name), 'r') as file:
+                document = yaml.safe_load(file) or {}
+        except FileNotFoundError:
+            return None
+        cameras = document.get('cameras') or {}
+        return {int(index): {str(k): int(v) for k, v in (values or {}).items()}
+                for index, values in cameras.items()}
+
+    def save(self, name: str, profile: Dict[int, Dict[str, int]]) -> str:
+        path = self._path(name)
+        os.makedirs(self.directory, exist_ok=True)
+        document = {'cameras': {int(index): dict(values) for index, values in sorted(profile.items())}}
+        # Write then rename so a crash never leaves half a profile behind
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as file:
+            yaml.safe_dump(document, file, default_flow_style=False, sort_keys=False)
+        os.replace(temporary, path)
+        self.logger.info(f"Saved image profile {name} to {path}")
+        return path
+
+    def delete(self, name: str) -> bool:
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            return False
+        return True
@@ -0,0 +1,266 @@
+"""Camera I/O in a separate process.
+
+The controlling process (GUI or headless) and the worker share one block of
+memory laid out as::
+
+    header    shutdown flag, ring head (producer), ring tail (worker), worker stats
+    slots     per camera: latest pan/tilt velocity and latest zoom velocity
+    ring      fixed-size records carrying discrete VISCA payloads
+
+Velocity slots are single-writer seqlocks: the writer makes the sequence odd,
+writes the values and makes it even again, and the worker retries a read that
+saw an odd or changed sequence (a slot still mid-write after a bounded number
+of tries is left for the next pass). A burst of joystick updates therefore
+costs the worker one send of the latest value. Discrete commands (presets, absolute
+moves, stops) go through a single-producer/single-consumer ring whose head is
+only written by the producer and tail only by the worker, so neither side takes
+a lock the other can hold. Every slot write and ring record carries its
+CLOCK_MONOTONIC time, which orders sends across the two channels and gives the
+write-to-send latency. A byte on a pipe wakes the worker; it exits when the
+pipe closes, so it never outlives the process that started it.
+"""
+import logging
+import multiprocessing
+import os
+import select
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence
+
+# Header: shutdown u32, ring head u32, ring tail u32, pad u32, then worker stats
+_HEADER = struct.Struct('<IIII')
+_STATS = struct.Struct('<QQQQ')  # sent, failed, latency sum ns, latency max ns
+_STATS_OFFSET = _HEADER.size
+_SLOTS_OFFSET = _STATS_OFFSET + _STATS.size
+# Slot: sequence u32, a i16, b i16, stamp ns u64 (pan/tilt slot: a=pan, b=tilt; zoom slot: a=speed)
+_SLOT = struct.Struct('<IhhQ')
+_PANTILT, _ZOOM = 0, 1
+# Ring record: stamp ns u64, camera u8, payload length u8, payload
+_RECORD = struct.Struct('<QBB')
+_RECORD_SIZE = 40
+_MAX_PAYLOAD = _RECORD_SIZE - _RECORD.size
+_U32 = struct.Struct('<I')
+# Seqlock read attempts before a slot is left for the next pass, and how soon that pass comes
+_READ_ATTEMPTS = 100
+_SLOT_RETRY_S = 0.001
+
+
+def _layout(cameras: int, ring_size: int):
+    ring_offset = _SLOTS_OFFSET + cameras * 2 * _SLOT.size
+    return ring_offset, ring_offset + ring_size * _RECORD_SIZE
+
+
+class IoWorker:
+    """Controlling-process side of the camera I/O worker.
+
+    `camera_configs` are dicts with ip, port and model. `set_pantilt()`,
+    `set_zoom()` and `send()` are safe to call from any thread of this process
+    (a local lock serialises writers); none of them touches a socket.
+    """
+
+    def __init__(self, camera_configs: Sequence[Dict], ring_size: int = 64, timeout: float = 0.3,
+                 realtime: Optional[Dict] = None):
+        self.camera_configs = [dict(c) for c in camera_configs]
+        self.ring_size = int(ring_size)
+        self.timeout = timeout
+        # `realtime:` config for the worker's send loop (see realtime.RealtimeProfile)
+        self.realtime = dict(realtime or {})
+        self._lock = threading.Lock()
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._process = None
+        self._doorbell = None
+        self._head = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        if self._process is not None:
+            return
+        _ring, size = _layout(len(self.camera_configs), self.ring_size)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._shm.buf[:size] = bytes(size)
+        self._head = 0
+        # spawn, not fork: the parent has Qt/pygame threads whose locks a fork would copy
+        context = multiprocessing.get_context('spawn')
+        reader, writer = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_worker_main, name="CameraIoWorker", daemon=True,
+            args=(self._shm.name, self.camera_configs, self.ring_size, self.timeout, reader, self.realtime),
+        )
+        self._process.start()
+        reader.close()
+        self._doorbell = writer
+        os.set_blocking(writer.fileno(), False)
+        self.logger.info(f"Camera I/O worker started (pid {self._process.pid})")
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        _U32.pack_into(self._shm.buf, 0, 1)
+        self._ring_bell()
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._doorbell.close()
+        self._process = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def _ring_bell(self) -> None:
+        try:
+            os.write(self._doorbell.fileno(), b'\0')
+        except BlockingIOError:
+            # Pipe full: the worker has wake-ups queued already
+            pass
+
+    def _write_slot(self, index: int, kind: int, a: int, b: int) -> bool:
+        if self._process is None or not (0 <= index < len(self.camera_configs)):
+            return False
+        offset = _SLOTS_OFFSET + (index * 2 + kind) * _SLOT.size
+        buf = self._shm.buf
+        with self._lock:
+            seq = _U32.unpack_from(buf, offset)[0]
+            _U32.pack_into(buf, offset, (seq + 1) & 0xFFFFFFFF)
+            _SLOT.pack_into(buf, offset, (seq + 1) & 0xFFFFFFFF, a, b, time.monotonic_ns())
+            _U32.pack_into(buf, offset, (seq + 2) & 0xFFFFFFFF)
+        self._ring_bell()
+        return True
+
+    def set_pantilt(self, index: int, pan_speed: int, tilt_speed: int) -> bool:
+        """Latest pan/tilt velocity for a camera (signed VISCA speed steps; 0, 0 stops)."""
+        return self._write_slot(index, _PANTILT, pan_speed, tilt_speed)
+
+    def set_zoom(self, index: int, speed: int) -> bool:
+        """Latest variable zoom speed for a camera (-7..7; 0 stops)."""
+        return self._write_slot(index, _ZOOM, speed, 0)
+
+    def send(self, index: int, payload: bytes) -> bool:
+        """Queue a discrete VISCA payload. False when the ring is full or the worker is down."""
+        if self._process is None or not (0 <= index < len(self.camera_configs)) or len(payload) > _MAX_PAYLOAD:
+            return False
+        ring_offset, _end = _layout(len(self.camera_configs), self.ring_size)
+        buf = self._shm.buf
+        with self._lock:
+            tail = _U32.unpack_from(buf, 8)[0]
+            if (self._head - tail) & 0xFFFFFFFF >= self.ring_size:
+                return False
+            offset = ring_offset + (self._head % self.ring_size) * _RECORD_SIZE
+            _RECORD.pack_into(buf, offset, time.monotonic_ns(), index, len(payload))
+            buf[offset + _RECORD.size:offset + _RECORD.size + len(payload)] = payload
+            self._head = (self._head + 1) & 0xFFFFFFFF
+            # Publish the record only after it is fully written
+            _U32.pack_into(buf, 4, self._head)
+        self._ring_bell()
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """Counters kept by the worker: sends, failures and write-to-send latency."""
+        if self._shm is None:
+            return {}
+        sent, failed, latency_sum, latency_max = _STATS.unpack_from(self._shm.buf, _STATS_OFFSET)
+        return {
+            'sent': sent,
+            'failed': failed,
+            'mean_latency_s': latency_sum / sent / 1e9 if sent else 0.0,
+            'max_latency_s': latency_max / 1e9,
+        }
+
+
+def _read_slot(buf, offset):
+    """Consistent (seq, a, b, stamp) of a seqlock slot, or None when a write stayed in
+    progress for all attempts (e.g. the writer died mid-write)."""
+    for _attempt in range(_READ_ATTEMPTS):
+        seq, a, b, stamp = _SLOT.unpack_from(buf, offset)
+        if seq & 1 == 0 and _U32.unpack_from(buf, offset)[0] == seq:
+            return seq, a, b, stamp
+    return None
+
+
+def _worker_main(shm_name, camera_configs, ring_size, timeout, doorbell, realtime=None) -> None:
+    """Worker process: owns the camera command sockets."""
+    from realtime import ManualGc, RealtimeProfile
+    from .commands import load_model
+    from .packets import packet_table
+    from .transport import TransportPool
+
+    profile = RealtimeProfile.from_config(realtime or {}, 'send')
+    profile.apply_to_current_thread("io-worker")
+    manual_gc = profile.enabled and profile.manual_gc
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buf = shm.buf
+    pool = TransportPool()
+    transports, packets = [], []
+    for config in camera_configs:
+        packets.append(packet_table(load_model(config.get('model'))))
+        try:
+            transports.append(pool.open(config['ip'], config['port'], timeout=timeout))
+        except OSError:
+            transports.append(None)
+    count = len(camera_configs)
+    ring_offset, _end = _layout(count, ring_size)
+    seen = [0] * (count * 2)
+    tail = 0
+    sent = failed = latency_sum = latency_max = 0
+    fd = doorbell.fileno()
+    wait = 1.0
+    if manual_gc:
+        ManualGc.enter()
+    try:
+        while True:
+            if select.select([fd], [], [], wait)[0] and not os.read(fd, 4096):
+                break  # controlling process went away
+            pending: List[tuple] = []
+            wait = 1.0
+            for slot in range(count * 2):
+                value = _read_slot(buf, _SLOTS_OFFSET + slot * _SLOT.size)
+                if value is None:
+                    # Skip it this pass; back through select() soon, which also sees a closed pipe
+                    wait = _SLOT_RETRY_S
+                    continue
+                seq, a, b, stamp = value
+                if seq != seen[slot]:
+                    seen[slot] = seq
+                    index, kind = divmod(slot, 2)
+                    table = packets[index]
+                    payload = table.pantilt(a, b) if kind == _PANTILT else table.zoom(a)
+                    pending.append((stamp, index, payload))
+            head = _U32.unpack_from(buf, 4)[0]
+            while tail != head:
+                offset = ring_offset + (tail % ring_size) * _RECORD_SIZE
+                stamp, index, length = _RECORD.unpack_from(buf, offset)
+                start = offset + _RECORD.size
+                pending.append((stamp, index, bytes(buf[start:start + length])))
+                tail = (tail + 1) & 0xFFFFFFFF
+                _U32.pack_into(buf, 8, tail)
+            # Velocity slots and queued commands go out in the order they were written
+            pending.sort(key=lambda entry: entry[0])
+            for stamp, index, payload in pending:
+                transport = transports[index]
+                try:
+                    transport.send(payload)
+                    sent += 1
+                except (OSError, AttributeError):
+                    failed += 1
+                    continue
+                latency = time.monotonic_ns() - stamp
+                latency_sum += latency
+                latency_max = max(latency_max, latency)
+            if pending:
+                _STATS.pack_into(buf, _STATS_OFFSET, sent, failed, latency_sum, latency_max)
+            # Checked after draining, so a final stop queued before shutdown still goes out
+            if _U32.unpack_from(buf, 0)[0]:
+                break
+            # Sends are out: collect now rather than in the middle of the next batch
+            if manual_gc:
+                ManualGc.collect_if_due()
+    finally:
+        pool.close()
+        del buf
+        shm.close()
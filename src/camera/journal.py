@@ -0,0 +1,159 @@
+import itertools
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+# Transport codes stored per entry
+TRANSPORT_NONE = 0
+TRANSPORT_LIBRARY = 1
+TRANSPORT_TCP = 2
+TRANSPORT_UDP = 3
+TRANSPORT_SOCKET = 4
+TRANSPORT_VISCA_IP = 5
+TRANSPORT_WORKER = 6
+TRANSPORT_NAMES = {
+    TRANSPORT_NONE: "-",
+    TRANSPORT_LIBRARY: "library",
+    TRANSPORT_TCP: "tcp",
+    TRANSPORT_UDP: "udp",
+    TRANSPORT_SOCKET: "socket",
+    TRANSPORT_VISCA_IP: "visca-ip",
+    TRANSPORT_WORKER: "worker",
+}
+
+# Result codes
+RESULT_OK = 1
+RESULT_FAILED = 2
+RESULT_SUPPRESSED = 3
+RESULT_NAMES = {0: "-", RESULT_OK: "ok", RESULT_FAILED: "failed", RESULT_SUPPRESSED: "suppressed"}
+
+# Longest VISCA payload we keep verbatim (absolute pan/tilt is 15 bytes)
+ENTRY_BYTES = 16
+
+
+class CommandJournal:
+    """Fixed-size ring buffer of recent camera commands.
+
+    All storage is preallocated in flat arrays (no per-entry objects), so recording
+    is a handful of slice/item assignments and memory stays constant. Entries are
+    only formatted when the journal is dumped.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        # Round up to a power of two so the slot index is a mask, not a modulo
+        size = 1
+        while size < max(1, int(capacity)):
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._counter = itertools.count()
+        self._written = 0
+        self._ts = array("d", bytes(8 * size))
+        self._latency = array("f", bytes(4 * size))
+        self._opcode = array("H", bytes(2 * size))
+        self._camera = bytearray(size)
+        self._length = bytearray(size)
+        self._transport = bytearray(size)
+        self._result = bytearray(size)
+        self._data = bytearray(ENTRY_BYTES * size)
+
+    def record(self, camera_index: int, command: bytes, transport: int, result: int, latency_s: float = 0.0) -> None:
+        # next() on itertools.count is atomic under the GIL, so writers never share a slot
+        n = next(self._counter)
+        i = n & self._mask
+        self._ts[i] = time.time()
+        self._latency[i] = latency_s
+        self._camera[i] = camera_index & 0xFF
+        self._transport[i] = transport
+        self._result[i] = result
+        length = len(command)
+        if length > ENTRY_BYTES:
+            length = ENTRY_BYTES
+            command = command[:ENTRY_BYTES]
+        self._length[i] = length
+        # VISCA opcode: category + command bytes (e.g. 04 07 for zoom, 06 01 for pan/tilt)
+        self._opcode[i] = (command[2] << 8 | command[3]) if length >= 4 else 0
+        offset = i * ENTRY_BYTES
+        self._data[offset:offset + length] = command
+        self._written = n + 1
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    def entries(self) -> List[Dict[str, object]]:
+        """Snapshot of the journal, oldest entry first."""
+        written = self._written
+        count = min(written, self.capacity)
+        result = []
+        for n in range(written - count, written):
+            i = n & self._mask
+            length = self._length[i]
+            offset = i * ENTRY_BYTES
+            result.append({
+                "time": self._ts[i],
+                "camera": self._camera[i],
+                "opcode": self._opcode[i],
+                "bytes": bytes(self._data[offset:offset + length]),
+                "transport": TRANSPORT_NAMES.get(self._transport[i], "?"),
+                "result": RESULT_NAMES.get(self._result[i], "?"),
+                "latency_ms": self._latency[i] * 1000.0,
+            })
+        return result
+
+    def format(self) -> str:
+        lines = []
+        for e in self.entries():
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["time"]))
+            millis = int((e["time"] % 1) * 1000)
+            op = e["opcode"]
+            lines.append(
+                f"{stamp}.{millis:03d} cam={e['camera'] + 1} op={op >> 8:02x}:{op & 0xFF:02x} "
+                f"tx={e['transport']} result={e['result']} {e['latency_ms']:.2f}ms {e['bytes'].hex(' ')}"
+            )
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def dump(self, path: str, reason: str = "on demand") -> Optional[str]:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"# command journal dump ({reason}), {len(self)} entries\n")
+                f.write(self.format())
+            return path
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Failed to dump command journal: {e}")
+            return None
+
+
+def install_dump_hooks(journal: CommandJournal, path: str) -> None:
+    """Dump the journal on unhandled exceptions (any thread) and on SIGUSR1."""
+    logger = logging.getLogger(__name__)
+    previous_excepthook = sys.excepthook
+    previous_thread_hook = threading.excepthook
+
+    def excepthook(exc_type, exc, tb):
+        if journal.dump(path, reason=f"crash: {exc_type.__name__}"):
+            logger.error(f"Command journal dumped to {path}")
+        previous_excepthook(exc_type, exc, tb)
+
+    def thread_excepthook(args):
+        if journal.dump(path, reason=f"thread crash: {args.exc_type.__name__}"):
+            logger.error(f"Command journal dumped to {path}")
+        previous_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+    if hasattr(signal, "SIGUSR1") and threading.current_thread() is threading.main_thread():
+        def on_signal(signum, frame):
+            journal.dump(path, reason="SIGUSR1")
+        try:
+            signal.signal(signal.SIGUSR1, on_signal)
+        except (ValueError, OSError):
+            pass
@@ -0,0 +1 @@
+# Camera model command tables (generated by tools/gen_command_table.py)
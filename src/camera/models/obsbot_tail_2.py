@@ -0,0 +1,72 @@
+# Generated by tools/gen_command_table.py from obsbot_tail_2_visca_over_ip.xlsx.
+# Do not edit by hand: fix the sheet or the generator's tables and regenerate.
+
+MODEL = 'obsbot_tail_2'
+
+# name -> packet template, parameter specs ((min, max) or frozenset of legal values), value labels
+COMMANDS = {
+    'zoom_stop': {'packet': '81 01 04 07 00 FF', 'params': {}, 'labels': {}},
+    'zoom_tele': {'packet': '81 01 04 07 02 FF', 'params': {}, 'labels': {}},
+    'zoom_wide': {'packet': '81 01 04 07 03 FF', 'params': {}, 'labels': {}},
+    'zoom_tele_variable': {'packet': '81 01 04 07 2p FF', 'params': {'p': (0, 7)}, 'labels': {}},
+    'zoom_wide_variable': {'packet': '81 01 04 07 3p FF', 'params': {'p': (0, 7)}, 'labels': {}},
+    'zoom_direct': {'packet': '81 01 04 47 0z 0z 0z 0z FF', 'params': {'z': (1000, 12000)}, 'labels': {}},
+    'pan_tilt_up': {'packet': '81 01 06 01 vv ww 03 01 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_down': {'packet': '81 01 06 01 vv ww 03 02 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_left': {'packet': '81 01 06 01 vv ww 01 03 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_right': {'packet': '81 01 06 01 vv ww 02 03 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_upleft': {'packet': '81 01 06 01 vv ww 01 01 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_upright': {'packet': '81 01 06 01 vv ww 02 01 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_downleft': {'packet': '81 01 06 01 vv ww 01 02 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_downright': {'packet': '81 01 06 01 vv ww 02 02 FF', 'params': {'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_stop': {'packet': '81 01 06 01 vv ww 03 03 FF', 'params': {'v': (0, 24), 'w': (0, 23)}, 'labels': {}},
+    'pan_tilt_absolute': {'packet': '81 01 06 02 vv ww 0p 0p 0p 0p 0t 0t 0t 0t FF', 'params': {'p': (-2133, 2132), 't': (-839, 838), 'v': (1, 24), 'w': (1, 23)}, 'labels': {}},
+    'pan_tilt_home': {'packet': '81 01 06 04 FF', 'params': {}, 'labels': {}},
+    'focus_mode': {'packet': '81 01 04 38 pp FF', 'params': {'p': frozenset({2, 3})}, 'labels': {'p': {2: 'Auto Focus', 3: 'Manual Focus'}}},
+    'focus_stop': {'packet': '81 01 04 08 00 FF', 'params': {}, 'labels': {}},
+    'focus_far': {'packet': '81 01 04 08 02 FF', 'params': {}, 'labels': {}},
+    'focus_near': {'packet': '81 01 04 08 03 FF', 'params': {}, 'labels': {}},
+    'focus_direct': {'packet': '81 01 04 48 0p 0p 0p 0p FF', 'params': {'p': (0, 100)}, 'labels': {}},
+    'preset_reset': {'packet': '81 01 04 3F 00 pp FF', 'params': {'p': (0, 255)}, 'labels': {}},
+    'preset_set': {'packet': '81 01 04 3F 01 pp FF', 'params': {'p': (0, 255)}, 'labels': {}},
+    'preset_recall': {'packet': '81 01 04 3F 02 pp FF', 'params': {'p': (0, 255)}, 'labels': {}},
+    'preset_speed': {'packet': '81 01 7E 04 1C 0p 0p FF', 'params': {'p': (1, 25)}, 'labels': {}},
+    'white_balance_mode': {'packet': '81 01 04 35 0p FF', 'params': {'p': frozenset({0, 1, 2, 5})}, 'labels': {'p': {0: 'Auto1', 1: 'Indoor', 2: 'Outdoor', 5: 'Manual'}}},
+    'red_gain_up': {'packet': '81 01 04 03 02 FF', 'params': {}, 'labels': {}},
+    'red_gain_down': {'packet': '81 01 04 03 03 FF', 'params': {}, 'labels': {}},
+    'blue_gain_up': {'packet': '81 01 04 04 02 FF', 'params': {}, 'labels': {}},
+    'blue_gain_down': {'packet': '81 01 04 04 03 FF', 'params': {}, 'labels': {}},
+    'exposure_mode': {'packet': '81 01 04 39 0p FF', 'params': {'p': frozenset({0, 3})}, 'labels': {'p': {0: 'Full Auto', 3: 'Manual'}}},
+    'gain_up': {'packet': '81 01 04 0C 02 FF', 'params': {}, 'labels': {}},
+    'gain_down': {'packet': '81 01 04 0C 03 FF', 'params': {}, 'labels': {}},
+    'shutter_up': {'packet': '81 01 04 0A 02 FF', 'params': {}, 'labels': {}},
+    'shutter_down': {'packet': '81 01 04 0A 03 FF', 'params': {}, 'labels': {}},
+    'backlight': {'packet': '81 01 04 33 0p FF', 'params': {'p': frozenset({2, 3})}, 'labels': {'p': {2: 'On', 3: 'Off'}}},
+    'bright_up': {'packet': '81 01 04 0D 02 FF', 'params': {}, 'labels': {}},
+    'bright_down': {'packet': '81 01 04 0D 03 FF', 'params': {}, 'labels': {}},
+    'bright_direct': {'packet': '81 01 04 4D 00 00 0p 0p FF', 'params': {'p': (0, 255)}, 'labels': {}},
+    'ai_track_mode': {'packet': '81 01 8E 01 0p FF', 'params': {'p': frozenset({0, 1})}, 'labels': {'p': {0: 'Single-person', 1: 'Multi-person'}}},
+    'ai_track_speed': {'packet': '81 01 8E 02 0p 0q 0r 0s 0t FF', 'params': {'p': (0, 5), 'q': (0, 1), 'r': (1, 10), 's': (0, 1), 't': (1, 10)}, 'labels': {'p': {0: 'Super Lazy', 1: 'Lazy', 2: 'Slow', 3: 'Fast', 4: 'Crazy', 5: 'Custom'}, 'q': {0: 'Pan Manual', 1: 'Pan Auto'}, 's': {0: 'Pitch Manual', 1: 'Pitch Auto'}}},
+    'ai_auto_zoom': {'packet': '81 01 8E 03 0p FF', 'params': {'p': frozenset({0, 1, 2, 3, 4, 5, 6, 7})}, 'labels': {'p': {0: 'None', 1: 'CloseUp', 2: 'HalfBody', 3: 'AboveTheKnees', 4: 'NineHeadPortrait', 5: 'FullBody', 6: 'LongShot1', 7: 'LongShot2'}}},
+    'ai_only_me': {'packet': '81 01 8E 04 0p FF', 'params': {'p': frozenset({0, 1})}, 'labels': {'p': {0: 'Off', 1: 'On'}}},
+}
+
+# name -> inquiry packet, reply template, reply field specs, value labels
+INQUIRIES = {
+    'pan_tilt_position': {'packet': '81 09 06 12 FF', 'reply': 'y0 50 0p 0p 0p 0p 0t 0t 0t 0t FF', 'fields': {'p': (-2133, 2132), 't': (-839, 838)}, 'labels': {}},
+    'zoom_position': {'packet': '81 09 04 47 FF', 'reply': 'y0 50 0z 0z 0z 0z FF', 'fields': {'z': (1000, 12000)}, 'labels': {}},
+    'focus_mode': {'packet': '81 09 04 38 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({2, 3})}, 'labels': {'p': {2: 'Auto Focus', 3: 'Manual Focus'}}},
+    'focus_position': {'packet': '81 09 04 48 FF', 'reply': 'y0 50 0p 0p 0p 0p FF', 'fields': {'p': (0, 100)}, 'labels': {}},
+    'exposure_mode': {'packet': '81 09 04 39 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({0, 3})}, 'labels': {'p': {0: 'Full Auto', 3: 'Manual'}}},
+    'shutter': {'packet': '81 09 04 4A FF', 'reply': 'y0 50 00 00 0p 0p FF', 'fields': {'p': (9, 34)}, 'labels': {}},
+    'gain': {'packet': '81 09 04 4C FF', 'reply': 'y0 50 00 00 0p 0p FF', 'fields': {'p': (0, 255)}, 'labels': {}},
+    'backlight': {'packet': '81 09 04 33 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({2, 3})}, 'labels': {'p': {2: 'On', 3: 'Off'}}},
+    'bright_position': {'packet': '81 09 04 4D FF', 'reply': 'y0 50 00 00 0p 0p FF', 'fields': {'p': (0, 255)}, 'labels': {}},
+    'white_balance_mode': {'packet': '81 09 04 35 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({0, 1, 2, 5})}, 'labels': {'p': {0: 'Auto1', 1: 'Indoor', 2: 'Outdoor', 5: 'Manual'}}},
+    'red_gain': {'packet': '81 09 04 43 FF', 'reply': 'y0 50 00 00 0p 0p FF', 'fields': {'p': (0, 255)}, 'labels': {}},
+    'blue_gain': {'packet': '81 09 04 44 FF', 'reply': 'y0 50 00 00 0p 0p FF', 'fields': {'p': (0, 255)}, 'labels': {}},
+    'ai_track_mode': {'packet': '81 09 8E 01 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({0, 1})}, 'labels': {'p': {0: 'Single-person', 1: 'Multi-person'}}},
+    'ai_track_speed': {'packet': '81 09 8E 02 FF', 'reply': 'y0 50 0p 0q 0r 0s 0t FF', 'fields': {'p': (0, 5), 'q': (0, 1), 'r': (1, 10), 's': (0, 1), 't': (1, 10)}, 'labels': {'p': {0: 'Super Lazy', 1: 'Lazy', 2: 'Slow', 3: 'Fast', 4: 'Crazy', 5: 'Custom'}, 'q': {0: 'Pan Manual', 1: 'Pan Auto'}, 's': {0: 'Pitch Manual', 1: 'Pitch Auto'}}},
+    'ai_auto_zoom': {'packet': '81 09 8E 03 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({0, 1, 2, 3, 4, 5, 6, 7})}, 'labels': {'p': {0: 'None', 1: 'CloseUp', 2: 'HalfBody', 3: 'AboveKnees', 4: 'NineHeadPortrait', 5: 'FullBody', 6: 'LongShot1', 7: 'LongShot2'}}},
+    'ai_only_me': {'packet': '81 09 8E 04 FF', 'reply': 'y0 50 0p FF', 'fields': {'p': frozenset({0, 1})}, 'labels': {'p': {0: 'Off', 1: 'On'}}},
+}
@@ -0,0 +1,90 @@
+from typing import Tuple
+
+from .commands import CommandSet
+
+PAN_SPEED_MAX = 0x18
+TILT_SPEED_MAX = 0x17
+ZOOM_SPEED_MAX = 7
+
+_TILT_SPAN = 2 * TILT_SPEED_MAX + 1
+
+# Drive command per (pan sign, tilt sign), as visca_over_ip's pantilt() sends them:
+# positive pan is direction code 02 (right), positive tilt is 02 (down).
+_DRIVE = {
+    (0, 1): 'pan_tilt_down',
+    (0, -1): 'pan_tilt_up',
+    (1, 0): 'pan_tilt_right',
+    (-1, 0): 'pan_tilt_left',
+    (1, 1): 'pan_tilt_downright',
+    (-1, 1): 'pan_tilt_downleft',
+    (1, -1): 'pan_tilt_upright',
+    (-1, -1): 'pan_tilt_upleft',
+}
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+class PtzPacketTable:
+    """Every pan/tilt drive and zoom payload, built once per camera model.
+
+    Joystick input is a signed speed pair, and the speed space is small
+    (49 x 47 pan/tilt entries plus 15 zoom entries), so the payloads are
+    precomputed as immutable bytes and the hot path is a clamp and a tuple
+    index. Speeds beyond the vendor maximum are clamped, not rejected.
+    """
+
+    __slots__ = ("_pantilt", "_zoom", "stop", "zoom_stop")
+
+    def __init__(self, commands: CommandSet):
+        self.stop = commands.build('pan_tilt_stop', 0, 0)
+        self.zoom_stop = commands.build('zoom_stop')
+        pantilt = []
+        for pan in range(-PAN_SPEED_MAX, PAN_SPEED_MAX + 1):
+            for tilt in range(-TILT_SPEED_MAX, TILT_SPEED_MAX + 1):
+                name = _DRIVE.get((_sign(pan), _sign(tilt)))
+                if name is None:
+                    pantilt.append(self.stop)
+                else:
+                    # The idle axis still needs a legal speed byte; its direction code is 03
+                    pantilt.append(commands.build(name, max(1, abs(pan)), max(1, abs(tilt))))
+        self._pantilt: Tuple[bytes, ...] = tuple(pantilt)
+        zoom = []
+        for speed in range(-ZOOM_SPEED_MAX, ZOOM_SPEED_MAX + 1):
+            if speed > 0:
+                zoom.append(commands.build('zoom_tele_variable', speed))
+            elif speed < 0:
+                zoom.append(commands.build('zoom_wide_variable', -speed))
+            else:
+                zoom.append(self.zoom_stop)
+        self._zoom: Tuple[bytes, ...] = tuple(zoom)
+
+    def pantilt(self, pan_speed: int, tilt_speed: int) -> bytes:
+        if pan_speed > PAN_SPEED_MAX:
+            pan_speed = PAN_SPEED_MAX
+        elif pan_speed < -PAN_SPEED_MAX:
+            pan_speed = -PAN_SPEED_MAX
+        if tilt_speed > TILT_SPEED_MAX:
+            tilt_speed = TILT_SPEED_MAX
+        elif tilt_speed < -TILT_SPEED_MAX:
+            tilt_speed = -TILT_SPEED_MAX
+        return self._pantilt[(pan_speed + PAN_SPEED_MAX) * _TILT_SPAN + tilt_speed + TILT_SPEED_MAX]
+
+    def zoom(self, speed: int) -> bytes:
+        if speed > ZOOM_SPEED_MAX:
+            speed = ZOOM_SPEED_MAX
+        elif speed < -ZOOM_SPEED_MAX:
+            speed = -ZOOM_SPEED_MAX
+        return self._zoom[speed + ZOOM_SPEED_MAX]
+
+
+_tables = {}
+
+
+def packet_table(commands: CommandSet) -> PtzPacketTable:
+    """Shared table per command set (one per camera model)."""
+    table = _tables.get(commands.model)
+    if table is None:
+        table = _tables[commands.model] = PtzPacketTable(commands)
+    return table
@@ -0,0 +1,354 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from monitoring.metrics import REGISTRY
+
+_STEP_JITTER = REGISTRY.histogram(
+    "rpiptz_sequence_step_jitter_seconds", "How late each sequence step started versus its schedule.", ("sequence",))
+_STEPS_RUN = REGISTRY.counter("rpiptz_sequence_steps_total", "Sequence steps executed.", ("sequence",))
+
+RECALL = 'recall'
+SOFTWARE_PRESET = 'software_preset'
+SCENE = 'scene'
+MOVE = 'move'
+DWELL = 'dwell'
+WAIT = 'wait'
+
+_KINDS = (RECALL, SOFTWARE_PRESET, SCENE, MOVE, DWELL, WAIT)
+
+# Position polling while waiting for a camera to stop
+_WAIT_POLL_S = 0.2
+# A moved camera is there once within this many 0.075 degree units of its target
+_TARGET_TOLERANCE = 10
+# A recalled camera that was never seen moving only counts as settled after this long
+# (the recall may not have started yet: slow ACK, breaker retry)
+_MIN_RECALL_SETTLE_S = 1.0
+
+
+class Step(NamedTuple):
+    kind: str
+    value: object
+    camera: Optional[int]  # None: the active camera when the step runs
+    timeout: float
+
+
+class Sequence(NamedTuple):
+    name: str
+    steps: Tuple[Step, ...]
+    loop: int  # 1 runs once, 0 repeats until stopped
+
+
+def _parse_step(raw: dict, scenes: Dict[str, dict]) -> Step:
+    kinds = [k for k in _KINDS if k in raw]
+    if len(kinds) != 1:
+        raise ValueError(f"step needs exactly one of {', '.join(_KINDS)}: {raw!r}")
+    kind = kinds[0]
+    value = raw[kind]
+    camera = raw.get('camera')
+    camera = None if camera is None else int(camera)
+    if kind in (RECALL, SOFTWARE_PRESET):
+        value = int(value)
+    elif kind == DWELL:
+        value = float(value)
+        if value < 0:
+            raise ValueError(f"negative dwell: {raw!r}")
+    elif kind == SCENE:
+        if value not in scenes:
+            raise ValueError(f"unknown scene {value!r}")
+        # {camera index: VISCA preset}
+        value = tuple(sorted((int(index), int(preset)) for index, preset in scenes[value].items()))
+    elif kind == MOVE:
+        move = dict(value)
+        camera = int(move.pop('camera')) if 'camera' in move else camera
+        value = (int(move['pan']), int(move['tilt']), int(move['zoom']) if 'zoom' in move else None)
+    elif kind == WAIT:
+        value = None
+    return Step(kind, value, camera, float(raw.get('timeout', 15.0)))
+
+
+def parse_sequences(document: dict) -> Dict[str, Sequence]:
+    """Parse the `sequences:` (and `scenes:`) sections of a sequences file.
+    Raises ValueError on an invalid step."""
+    document = document or {}
+    scenes = document.get('scenes') or {}
+    sequences = {}
+    for name, raw in (document.get('sequences') or {}).items():
+        if isinstance(raw, list):
+            raw = {'steps': raw}
+        loop = raw.get('loop', 1)
+        loop = 0 if loop is True else 1 if loop is False else int(loop)
+        try:
+            steps = tuple(_parse_step(step, scenes) for step in raw.get('steps') or [])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"sequence {name!r}: {e}") from e
+        if loop == 0 and not any(step.kind in (DWELL, WAIT) for step in steps):
+            raise ValueError(f"sequence {name!r} repeats forever without a dwell or wait step")
+        sequences[str(name)] = Sequence(str(name), steps, loop)
+    return sequences
+
+
+def load_sequences(path: str) -> Dict[str, Sequence]:
+    with open(path, 'r') as file:
+        return parse_sequences(yaml.safe_load(file))
+
+
+class _Run:
+    __slots__ = ("sequence", "position", "iteration", "deadline", "wait_until", "wait_cameras",
+                 "wait_targets", "wait_started", "last_positions", "moved", "touched", "last_jitter",
+                 "cancelled")
+
+    def __init__(self, sequence: Sequence, start: float):
+        self.sequence = sequence
+        self.position = 0
+        self.iteration = 1
+        self.deadline = start
+        self.wait_until = 0.0
+        self.wait_cameras: Optional[List[int]] = None
+        self.wait_targets: Dict[int, Optional[Tuple[int, int]]] = {}
+        self.wait_started = 0.0
+        self.last_positions: Dict[int, Tuple[int, int]] = {}
+        self.moved = set()
+        # camera index -> commanded (pan, tilt) of a move step, None for a preset recall
+        self.touched: Dict[int, Optional[Tuple[int, int]]] = {}
+        self.last_jitter = 0.0
+        self.cancelled = False
+
+
+class Sequencer:
+    """Runs preset tours / cue sequences on one scheduler thread.
+
+    Each running sequence has an absolute deadline on the monotonic clock for
+    its next step. Dwell steps advance the deadline by the dwell time from the
+    previous deadline (not from when the step actually ran), so a tour does not
+    drift however late individual steps start. A wait step polls the cameras
+    the sequence has moved until a `move` camera is at its target and a
+    recalled camera has stopped (after it was seen moving, or a minimum
+    settle time), and the schedule restarts from the moment they settle. How late each step started
+    is recorded per sequence in `rpiptz_sequence_step_jitter_seconds`.
+    """
+
+    def __init__(self, camera_manager, sequences: Optional[Dict[str, Sequence]] = None):
+        self.camera_manager = camera_manager
+        self.sequences: Dict[str, Sequence] = dict(sequences or {})
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, _Run]] = []
+        self._runs: Dict[str, _Run] = {}
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_file(cls, camera_manager, path: str):
+        sequencer = cls(camera_manager)
+        sequencer.load(path)
+        return sequencer
+
+    def load(self, path: str) -> bool:
+        """(Re)load sequence definitions; running sequences keep their old definition."""
+        try:
+            sequences = load_sequences(path)
+        except FileNotFoundError:
+            sequences = {}
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            self.logger.error(f"Could not load sequences from {path}: {e}")
+            return False
+        with self._cond:
+            self.sequences = sequences
+        return True
+
+    # Control
+    def start(self, name: str) -> bool:
+        sequence = self.sequences.get(name)
+        if sequence is None or not sequence.steps:
+            return False
+        with self._cond:
+            old = self._runs.get(name)
+            if old is not None:
+                old.cancelled = True
+            run = _Run(sequence, time.monotonic())
+            self._runs[name] = run
+            heapq.heappush(self._heap, (run.deadline, next(self._counter), run))
+            if self._thread is None:
+                self._running = True
+                self._thread = threading.Thread(target=self._loop, name="Sequencer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        self.logger.info(f"Sequence {name} started")
+        return True
+
+    def stop(self, name: Optional[str] = None) -> None:
+        """Stop one sequence, or all of them. Camera motion already commanded is not stopped."""
+        with self._cond:
+            names = [name] if name is not None else list(self._runs)
+            for n in names:
+                run = self._runs.pop(n, None)
+                if run is not None:
+                    run.cancelled = True
+            self._cond.notify()
+
+    def toggle(self, name: str) -> bool:
+        if self.is_running(name):
+            self.stop(name)
+            return False
+        return self.start(name)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            for run in self._runs.values():
+                run.cancelled = True
+            self._runs.clear()
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def is_running(self, name: str) -> bool:
+        return name in self._runs
+
+    @property
+    def active(self) -> bool:
+        """True while any sequence runs."""
+        return bool(self._runs)
+
+    def status(self) -> Dict[str, dict]:
+        with self._cond:
+            runs = dict(self._runs)
+            names = list(self.sequences)
+        status = {}
+        for name in names:
+            run = runs.get(name)
+            status[name] = {
+                'running': run is not None,
+                'next_step': run.position % len(run.sequence.steps) if run else None,
+                'iteration': run.iteration if run else None,
+                'last_jitter_ms': round(run.last_jitter * 1000.0, 3) if run else None,
+            }
+        return status
+
+    # Scheduler
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if not self._running:
+                    self._thread = None
+                    return
+                deadline, _, run = heapq.heappop(self._heap)
+            try:
+                next_deadline = self._advance(run, deadline)
+            except Exception as e:
+                self.logger.error(f"Sequence {run.sequence.name} failed: {e}")
+                next_deadline = None
+            with self._cond:
+                if run.cancelled:
+                    continue
+                if next_deadline is None:
+                    if self._runs.get(run.sequence.name) is run:
+                        del self._runs[run.sequence.name]
+                    self.logger.info(f"Sequence {run.sequence.name} finished")
+                else:
+                    run.deadline = next_deadline
+                    heapq.heappush(self._heap, (next_deadline, next(self._counter), run))
+
+    def _advance(self, run: _Run, deadline: float) -> Optional[float]:
+        """Run steps until one needs time to pass; returns the next deadline, or None when done."""
+        name = run.sequence.name
+        if run.wait_cameras is not None:
+            if not self._settled(run) and time.monotonic() < run.wait_until:
+                return deadline + _WAIT_POLL_S
+            run.wait_cameras = None
+            run.position += 1
+            # The wait took as long as it took: schedule from now on
+            deadline = time.monotonic()
+        lateness = time.monotonic() - deadline
+        run.last_jitter = lateness
+        _STEP_JITTER.labels(name).observe(max(0.0, lateness))
+        steps = run.sequence.steps
+        while not run.cancelled:
+            if run.position >= len(steps):
+                if run.sequence.loop and run.iteration >= run.sequence.loop:
+                    return None
+                run.iteration += 1
+                run.position = 0
+            step = steps[run.position]
+            _STEPS_RUN.labels(name).inc()
+            if step.kind == DWELL:
+                run.position += 1
+                return deadline + step.value
+            if step.kind == WAIT:
+                run.wait_cameras = [step.camera] if step.camera is not None else sorted(run.touched)
+                run.wait_targets = {index: run.touched.get(index) for index in run.wait_cameras}
+                run.wait_started = time.monotonic()
+                run.wait_until = run.wait_started + step.timeout
+                run.last_positions = {}
+                run.moved = set()
+                run.touched = {}
+                return time.monotonic() + _WAIT_POLL_S
+            self._execute(run, step)
+            run.position += 1
+        return None
+
+    def _execute(self, run: _Run, step: Step) -> None:
+        cm = self.camera_manager
+        index = cm.active_camera_index if step.camera is None else step.camera
+        if step.kind == RECALL:
+            ok = cm.recall_preset(step.value, index=index)
+            run.touched[index] = None
+        elif step.kind == SOFTWARE_PRESET:
+            ok = cm.recall_software_preset(step.value, index=index)
+            run.touched[index] = None
+        elif step.kind == SCENE:
+            ok = True
+            for camera, preset in step.value:
+                ok = cm.recall_preset(preset, index=camera) and ok
+                run.touched[camera] = None
+        else:
+            pan, tilt, zoom = step.value
+            ok = cm.move_camera_absolute(pan, tilt, index=index)
+            if zoom is not None:
+                ok = cm.set_zoom_ratio(zoom, index=index) and ok
+            # The camera goes to the clamped position
+            (pan_min, pan_max), (tilt_min, tilt_max) = cm.pan_tilt_limits(index)
+            run.touched[index] = (max(pan_min, min(pan_max, pan)), max(tilt_min, min(tilt_max, tilt)))
+        if not ok:
+            self.logger.warning(f"Sequence {run.sequence.name}: step {run.position + 1} ({step.kind}) failed")
+
+    def _settled(self, run: _Run) -> bool:
+        """True once every waited-on camera is there: within `_TARGET_TOLERANCE` of a
+        move target, or for a recall the same position twice in a row after the camera
+        was seen moving or `_MIN_RECALL_SETTLE_S` has passed."""
+        settled = True
+        waited = time.monotonic() - run.wait_started
+        for index in run.wait_cameras:
+            position = self.camera_manager.query_pan_tilt_position(index)
+            last = run.last_positions.get(index)
+            run.last_positions[index] = position
+            if position is None:
+                settled = False
+                continue
+            if last is not None and position != last:
+                run.moved.add(index)
+            target = run.wait_targets.get(index)
+            if target is not None:
+                if max(abs(position[0] - target[0]), abs(position[1] - target[1])) > _TARGET_TOLERANCE:
+                    settled = False
+            elif position != last or (index not in run.moved and waited < _MIN_RECALL_SETTLE_S):
+                settled = False
+        return settled
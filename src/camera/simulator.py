@@ -0,0 +1,528 @@
+"""Simulated VISCA-over-IP cameras, for running the app without hardware.
+
+A camera entry with ``backend: simulator`` gets a simulated camera listening on
+its own ip/port (any 127.x.y.z address works on Linux), so the rest of the app
+(transports, I/O worker, health, tracking) talks to it over UDP exactly as to a
+real camera:
+
+    cameras:
+      - name: Sim 1
+        ip: 127.0.0.1
+        port: 52381
+        backend: simulator
+        simulator: {loss: 0.05}   # per-camera overrides of the section below
+    simulator:
+      latency: 0.002      # one-way network delay (s)
+      jitter: 0.0         # extra random delay per datagram (s)
+      loss: 0.0           # probability each datagram is dropped, either way
+      ack_delay: 0.001    # command to ACK
+      execute_time: 0.01  # ACK to completion for commands that do not move
+      ramp: 0.2           # seconds for an axis to reach full speed or stop from it
+      speeds: {}          # speed tables, same format as a camera's `calibration:`
+
+Commands are decoded with the camera's command table. Pan/tilt and zoom move at
+the speed-table rate of the commanded step and accelerate over `ramp`;
+absolute moves, home, DIRECT zoom and preset recalls complete when the axes
+arrive, drives complete at once and everything else after `execute_time`.
+Settings commands are stored and read back by the matching inquiries. One
+thread serves every simulated camera of the process.
+"""
+import heapq
+import itertools
+import logging
+import math
+import random
+import selectors
+import socket
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .commands import CommandSet, load_model
+from .estimator import DEGREES_PER_UNIT, SpeedCalibration
+from .transport import (HEADER, PAYLOAD_COMMAND, PAYLOAD_CONTROL, PAYLOAD_CONTROL_REPLY, PAYLOAD_INQUIRY,
+                        PAYLOAD_REPLY)
+
+# Reply bodies (camera address 1, socket 1)
+_ACK = b'\x90\x41\xff'
+_COMPLETION = b'\x90\x51\xff'
+_SYNTAX_ERROR = b'\x90\x60\x02\xff'
+_CANCELED = b'\x90\x61\x04\xff'
+_NOT_EXECUTABLE = b'\x90\x61\x41\xff'
+
+BACKEND = "simulator"  # `backend:` value of a camera entry served by the simulator
+
+# How a command completes
+_INSTANT = "instant"    # completion after execute_time
+_DRIVE = "drive"        # continuous drive: completion right after the ACK
+_MOTION = "motion"      # completion when the axes arrive
+_REFUSED = "refused"    # ACK, then "not executable" (e.g. recall of a preset never stored)
+
+_DIRECTION = {1: -1, 2: 1, 3: 0}  # drive direction byte -> speed sign (01 left/up, 02 right/down)
+_PAN_TILT_DRIVES = frozenset((
+    'pan_tilt_up', 'pan_tilt_down', 'pan_tilt_left', 'pan_tilt_right', 'pan_tilt_upleft',
+    'pan_tilt_upright', 'pan_tilt_downleft', 'pan_tilt_downright', 'pan_tilt_stop'))
+_ZOOM_STANDARD_STEP = 3  # speed of the fixed-speed zoom_tele / zoom_wide
+_PRESET_SPEED_MAX = 25
+_TICK_S = 0.01  # integration step, and how often arrivals are checked
+
+
+class SimulatorSettings(NamedTuple):
+    latency_s: float = 0.002
+    jitter_s: float = 0.0
+    loss: float = 0.0
+    ack_s: float = 0.001
+    execute_s: float = 0.01
+    ramp_s: float = 0.2
+    speeds: Optional[Dict] = None
+
+    _KEYS = {'latency': 'latency_s', 'jitter': 'jitter_s', 'loss': 'loss', 'ack_delay': 'ack_s',
+             'execute_time': 'execute_s', 'ramp': 'ramp_s', 'speeds': 'speeds'}
+
+    def merged(self, section: Optional[Dict]) -> "SimulatorSettings":
+        """These settings with the keys of a `simulator:` config section applied."""
+        changes = {}
+        for key, value in (section or {}).items():
+            field = self._KEYS.get(key)
+            if field is not None:
+                changes[field] = value if field == 'speeds' else float(value)
+        return self._replace(**changes)
+
+
+class _Axis:
+    """One axis: position and velocity, with acceleration-limited approach to a
+    commanded velocity (drive) or a target position (absolute move)."""
+
+    __slots__ = ("position", "velocity", "low", "high", "accel", "drive", "target", "target_rate")
+
+    def __init__(self, position: float, low: float, high: float, accel: float):
+        self.position = float(position)
+        self.velocity = 0.0
+        self.low, self.high = low, high
+        self.accel = accel
+        self.drive = 0.0
+        self.target: Optional[float] = None
+        self.target_rate = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.velocity != 0.0 or self.drive != 0.0 or self.target is not None
+
+    def drive_at(self, rate: float) -> None:
+        self.drive = rate
+        self.target = None
+
+    def move_to(self, target: float, rate: float) -> None:
+        self.drive = 0.0
+        self.target = min(self.high, max(self.low, float(target)))
+        self.target_rate = abs(rate)
+
+    def advance(self, dt: float) -> None:
+        if self.target is not None:
+            error = self.target - self.position
+            # Fastest speed from which the axis can still stop at the target
+            want = math.copysign(min(self.target_rate, math.sqrt(2 * self.accel * abs(error))), error)
+        else:
+            want = self.drive
+        change = self.accel * dt
+        if abs(want - self.velocity) <= change:
+            self.velocity = want
+        else:
+            self.velocity += math.copysign(change, want - self.velocity)
+        before = self.position
+        self.position += self.velocity * dt
+        if self.target is not None and (abs(self.target - self.position) < 0.5
+                                        or (self.target - before) * (self.target - self.position) < 0):
+            self.position, self.velocity, self.target = self.target, 0.0, None
+        if not (self.low <= self.position <= self.high):
+            self.position = min(self.high, max(self.low, self.position))
+            self.velocity = 0.0
+
+
+class _Pending(NamedTuple):
+    axes: Tuple[str, ...]
+    seq: int
+    address: Tuple[str, int]
+
+
+class SimulatedCamera:
+    """Kinematic model and settings of one camera. Thread-safe; `position()`
+    may be read from any thread while the simulator thread drives it."""
+
+    def __init__(self, address: Tuple[str, int], commands: CommandSet, settings: SimulatorSettings, name: str = ""):
+        self.address = address
+        self.name = name or f"{address[0]}:{address[1]}"
+        self.commands = commands
+        self.settings = settings
+        self.speeds = SpeedCalibration.from_config(settings.speeds)
+        self.sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        # Pan/tilt in 0.075 degree units, zoom in ratio units, rates in units per second
+        absolute = {f.name: f for f in commands['pan_tilt_absolute'].fields}
+        zoom = commands['zoom_direct'].fields[0]
+        self._pan_max = self.speeds.pan.max_rate() / DEGREES_PER_UNIT
+        self._tilt_max = self.speeds.tilt.max_rate() / DEGREES_PER_UNIT
+        self._zoom_max = self.speeds.zoom.max_rate()
+        ramp = settings.ramp_s
+
+        def accel(top):
+            return top / ramp if ramp > 0 else math.inf
+
+        self.pan = _Axis(0, absolute['p'].low, absolute['p'].high, accel(self._pan_max))
+        self.tilt = _Axis(0, absolute['t'].low, absolute['t'].high, accel(self._tilt_max))
+        self.zoom = _Axis(zoom.low, zoom.low, zoom.high, accel(self._zoom_max))
+        self._axes = {'pan': self.pan, 'tilt': self.tilt, 'zoom': self.zoom}
+        self._updated = time.monotonic()
+        self._pending: List[_Pending] = []
+        self.presets: Dict[int, Tuple[float, float, float]] = {}
+        self.preset_speed = _PRESET_SPEED_MAX
+        self.values: Dict[str, Dict[str, int]] = {}
+        for name, inquiry in commands.inquiries.items():
+            self.values[name] = {f.name: min(f.choices) if f.choices is not None else (f.low + f.high) // 2
+                                 for f in inquiry.fields}
+        self._inquiries = {inquiry.packet: inquiry for inquiry in commands.inquiries.values()}
+        self._matchers = _matchers(commands)
+        self.handled = 0
+        self.rejected = 0
+        self.dropped = 0
+
+    # Reading the model
+    def position(self) -> Tuple[float, float, float]:
+        """Current (pan, tilt, zoom)."""
+        with self._lock:
+            self._advance(time.monotonic())
+            return self.pan.position, self.tilt.position, self.zoom.position
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    def _advance(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        axes = [axis for axis in self._axes.values() if axis.active]
+        while axes and elapsed > 0:
+            dt = min(elapsed, _TICK_S)
+            for axis in axes:
+                axis.advance(dt)
+            elapsed -= dt
+
+    def arrived(self, now: float) -> List[_Pending]:
+        """Moves whose axes have all arrived; they are removed from the pending list."""
+        with self._lock:
+            self._advance(now)
+            done = [p for p in self._pending if all(self._axes[a].target is None for a in p.axes)]
+            if done:
+                self._pending = [p for p in self._pending if p not in done]
+            return done
+
+    # Commands and inquiries
+    def match(self, payload: bytes):
+        """(command, {field: value}) of a payload, or None if no command of the table matches."""
+        candidates = self._matchers.get((len(payload), payload[:4]), ())
+        for command, mask in candidates:
+            if any(payload[i] & m != command.template[i] for i, m in mask):
+                continue
+            values = {}
+            try:
+                for field in command.fields:
+                    values[field.name] = field.decode(payload)
+                    field.check(values[field.name])
+            except ValueError:
+                continue
+            return command, values
+        return None
+
+    def execute(self, payload: bytes, now: float, seq: int, address) -> Tuple[Optional[str], List[_Pending]]:
+        """Apply a command. Returns (how it completes, or None if rejected, and the
+        pending moves it cancelled)."""
+        matched = self.match(payload)
+        with self._lock:
+            self._advance(now)
+            if matched is None:
+                self.rejected += 1
+                return None, []
+            self.handled += 1
+            command, values = matched
+            kind, axes = self._apply(command.name, payload, values)
+            cancelled = [p for p in self._pending if set(p.axes) & set(axes)]
+            if cancelled:
+                self._pending = [p for p in self._pending if p not in cancelled]
+            if kind == _MOTION:
+                self._pending.append(_Pending(axes, seq, address))
+            return kind, cancelled
+
+    def _apply(self, name: str, payload: bytes, values: Dict[str, int]) -> Tuple[Optional[str], Tuple[str, ...]]:
+        speeds = self.speeds
+        if name in _PAN_TILT_DRIVES:
+            pan_step = values['v'] * _DIRECTION.get(payload[6], 0)
+            tilt_step = values['w'] * _DIRECTION.get(payload[7], 0)
+            self.pan.drive_at(speeds.pan.rate(pan_step) / DEGREES_PER_UNIT)
+            self.tilt.drive_at(speeds.tilt.rate(tilt_step) / DEGREES_PER_UNIT)
+            return _DRIVE, ('pan', 'tilt')
+        if name == 'pan_tilt_absolute':
+            self.pan.move_to(values['p'], speeds.pan.rate(values['v']) / DEGREES_PER_UNIT)
+            self.tilt.move_to(values['t'], speeds.tilt.rate(values['w']) / DEGREES_PER_UNIT)
+            return _MOTION, ('pan', 'tilt')
+        if name == 'pan_tilt_home':
+            self.pan.move_to(0, self._pan_max)
+            self.tilt.move_to(0, self._tilt_max)
+            return _MOTION, ('pan', 'tilt')
+        if name.startswith('zoom_') and name != 'zoom_direct':
+            if name in ('zoom_tele', 'zoom_wide'):
+                step = _ZOOM_STANDARD_STEP
+            else:
+                step = max(1, values['p']) if 'p' in values else 0
+            sign = -1 if 'wide' in name else 1
+            self.zoom.drive_at(sign * speeds.zoom.rate(step))
+            return _DRIVE, ('zoom',)
+        if name == 'zoom_direct':
+            self.zoom.move_to(values['z'], self._zoom_max)
+            return _MOTION, ('zoom',)
+        if name == 'preset_set':
+            self.presets[values['p']] = (self.pan.position, self.tilt.position, self.zoom.position)
+            return _INSTANT, ()
+        if name == 'preset_reset':
+            self.presets.pop(values['p'], None)
+            return _INSTANT, ()
+        if name == 'preset_recall':
+            preset = self.presets.get(values['p'])
+            if preset is None:
+                return _REFUSED, ()
+            fraction = self.preset_speed / _PRESET_SPEED_MAX
+            self.pan.move_to(preset[0], self._pan_max * fraction)
+            self.tilt.move_to(preset[1], self._tilt_max * fraction)
+            self.zoom.move_to(preset[2], self._zoom_max * fraction)
+            return _MOTION, ('pan', 'tilt', 'zoom')
+        if name == 'preset_speed':
+            self.preset_speed = values['p']
+            return _INSTANT, ()
+        # Settings: a command named like its inquiry sets the values it reads back
+        if name in self.values:
+            self.values[name] = dict(values)
+        elif name.endswith('_direct') and values:
+            self._set_value(name[:-len('_direct')], next(iter(values.values())))
+        elif name.endswith('_up') or name.endswith('_down'):
+            base, _, direction = name.rpartition('_')
+            self._step_value(base, 1 if direction == 'up' else -1)
+        return _INSTANT, ()
+
+    def _setting(self, base: str):
+        """Inquiry reading a setting: `gain` or `bright_position` for base `bright`."""
+        inquiries = self.commands.inquiries
+        return inquiries.get(base) or inquiries.get(f"{base}_position")
+
+    def _set_value(self, base: str, value: int) -> None:
+        inquiry = self._setting(base)
+        if inquiry is not None and inquiry.fields:
+            self.values[inquiry.name] = {inquiry.fields[0].name: value}
+
+    def _step_value(self, base: str, step: int) -> None:
+        inquiry = self._setting(base)
+        if inquiry is None or not inquiry.fields:
+            return
+        field = inquiry.fields[0]
+        current = self.values[inquiry.name][field.name]
+        self.values[inquiry.name] = {field.name: min(field.high, max(field.low, current + step))}
+
+    def inquire(self, payload: bytes, now: float) -> Optional[bytes]:
+        """Reply to an inquiry, or None if it is not one of the table's."""
+        inquiry = self._inquiries.get(bytes(payload))
+        with self._lock:
+            if inquiry is None:
+                self.rejected += 1
+                return None
+            self.handled += 1
+            self._advance(now)
+            if inquiry.name == 'pan_tilt_position':
+                values = {'p': round(self.pan.position), 't': round(self.tilt.position)}
+            elif inquiry.name == 'zoom_position':
+                values = {'z': round(self.zoom.position)}
+            else:
+                values = self.values[inquiry.name]
+        try:
+            return inquiry.encode(values)
+        except (KeyError, ValueError):
+            return None
+
+
+def _matchers(commands: CommandSet) -> Dict[tuple, List[tuple]]:
+    """Commands indexed by (payload length, first four bytes), each with the
+    (byte index, mask) pairs of its fixed bits; most specific template first."""
+    index: Dict[tuple, List[tuple]] = {}
+    for command in commands.commands.values():
+        masks = [0xFF] * len(command.template)
+        for field in command.fields:
+            for i, _shift, mask in field.slots:
+                masks[i] &= ~mask & 0xFF
+        if any(m != 0xFF for m in masks[:4]):
+            raise ValueError(f"{command.name}: simulator needs the first four bytes fixed")
+        fixed = [(i, m) for i, m in enumerate(masks) if m]
+        key = (len(command.template), command.template[:4])
+        index.setdefault(key, []).append((sum(bin(m).count('1') for m in masks), command, fixed))
+    return {key: [(c, fixed) for _bits, c, fixed in sorted(entries, key=lambda e: -e[0])]
+            for key, entries in index.items()}
+
+
+class CameraSimulator:
+    """Serves any number of SimulatedCameras from one thread.
+
+    Incoming datagrams and every reply pass through the loss and latency model
+    of their camera; replies carry the request's sequence number.
+    """
+
+    def __init__(self, settings: SimulatorSettings = SimulatorSettings(), seed: Optional[int] = None):
+        self.settings = settings
+        self._random = random.Random(seed)
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._cameras: Dict[Tuple[str, int], SimulatedCamera] = {}
+        self._timers: List[tuple] = []  # heap of (due, n, function, args); simulator thread only
+        self._order = itertools.count()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "CameraSimulator":
+        section = (config or {}).get('simulator') or {}
+        return cls(SimulatorSettings().merged(section), seed=section.get('seed'))
+
+    def add(self, ip: str, port: int, model: Optional[str] = None, overrides: Optional[Dict] = None,
+            name: str = "") -> SimulatedCamera:
+        """Start a simulated camera listening on ip:port (port 0 picks a free one;
+        the bound address is `camera.address`). Raises OSError if it is taken."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind((ip, int(port)))
+        except OSError:
+            sock.close()
+            raise
+        sock.setblocking(False)
+        camera = SimulatedCamera(sock.getsockname(), load_model(model), self.settings.merged(overrides), name)
+        camera.sock = sock
+        camera.overrides = dict(overrides or {})
+        with self._lock:
+            self._cameras[camera.address] = camera
+            self._selector.register(sock, selectors.EVENT_READ, camera)
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._loop, name="CameraSimulator", daemon=True)
+                self._thread.start()
+        self.logger.info(f"Simulated camera {camera.name} listening on {camera.address[0]}:{camera.address[1]}")
+        return camera
+
+    def remove(self, camera: Optional[SimulatedCamera]) -> None:
+        if camera is None:
+            return
+        with self._lock:
+            self._cameras.pop(camera.address, None)
+            try:
+                self._selector.unregister(camera.sock)
+            except Exception:
+                pass
+        camera.sock.close()
+
+    @property
+    def cameras(self) -> List[SimulatedCamera]:
+        with self._lock:
+            return list(self._cameras.values())
+
+    def close(self) -> None:
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for camera in self.cameras:
+            self.remove(camera)
+
+    def _loop(self) -> None:
+        while self._running:
+            timeout = 0.2
+            if self._timers:
+                timeout = min(timeout, max(0.0, self._timers[0][0] - time.monotonic()))
+            busy = [camera for camera in self.cameras if camera.busy]
+            if busy:
+                timeout = min(timeout, _TICK_S)
+            try:
+                events = self._selector.select(timeout)
+            except (OSError, ValueError):
+                # A camera was removed underneath us; the next select sees the new map
+                time.sleep(0.01)
+                continue
+            for key, _mask in events:
+                self._receive(key.data)
+            now = time.monotonic()
+            for camera in busy:
+                for pending in camera.arrived(now):
+                    self._reply(camera, pending.address, pending.seq, _COMPLETION, now)
+            while self._timers and self._timers[0][0] <= now:
+                _due, _n, function, args = heapq.heappop(self._timers)
+                try:
+                    function(*args)
+                except Exception as e:
+                    self.logger.error(f"Simulator error: {e}")
+
+    def _later(self, due: float, function, *args) -> None:
+        heapq.heappush(self._timers, (due, next(self._order), function, args))
+
+    def _delay(self, camera: SimulatedCamera) -> float:
+        settings = camera.settings
+        return settings.latency_s + (self._random.uniform(0.0, settings.jitter_s) if settings.jitter_s else 0.0)
+
+    def _lost(self, camera: SimulatedCamera) -> bool:
+        if camera.settings.loss and self._random.random() < camera.settings.loss:
+            camera.dropped += 1
+            return True
+        return False
+
+    def _receive(self, camera: SimulatedCamera) -> None:
+        while True:
+            try:
+                data, address = camera.sock.recvfrom(64)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if len(data) < HEADER.size + 1 or self._lost(camera):
+                continue
+            self._later(time.monotonic() + self._delay(camera), self._handle, camera, data, address)
+
+    def _handle(self, camera: SimulatedCamera, data: bytes, address) -> None:
+        ptype, _length, seq = HEADER.unpack_from(data)
+        payload = data[HEADER.size:]
+        now = time.monotonic()
+        acked = now + camera.settings.ack_s
+        if ptype == PAYLOAD_CONTROL:
+            # Sequence number reset
+            self._reply(camera, address, seq, b'\x01', acked, PAYLOAD_CONTROL_REPLY)
+        elif ptype == PAYLOAD_INQUIRY:
+            self._reply(camera, address, seq, camera.inquire(payload, now) or _SYNTAX_ERROR, acked)
+        elif ptype == PAYLOAD_COMMAND:
+            kind, cancelled = camera.execute(payload, now, seq, address)
+            for pending in cancelled:
+                self._reply(camera, pending.address, pending.seq, _CANCELED, acked)
+            if kind is None:
+                self._reply(camera, address, seq, _SYNTAX_ERROR, acked)
+                return
+            self._reply(camera, address, seq, _ACK, acked)
+            if kind == _DRIVE:
+                self._reply(camera, address, seq, _COMPLETION, acked)
+            elif kind == _INSTANT:
+                self._reply(camera, address, seq, _COMPLETION, acked + camera.settings.execute_s)
+            elif kind == _REFUSED:
+                self._reply(camera, address, seq, _NOT_EXECUTABLE, acked + camera.settings.execute_s)
+
+    def _reply(self, camera: SimulatedCamera, address, seq: int, body: bytes, at: float,
+               payload_type: int = PAYLOAD_REPLY) -> None:
+        if self._lost(camera):
+            return
+        packet = HEADER.pack(payload_type, len(body), seq) + body
+        self._later(at + self._delay(camera), self._send, camera, packet, address)
+
+    @staticmethod
+    def _send(camera: SimulatedCamera, packet: bytes, address) -> None:
+        try:
+            camera.sock.sendto(packet, address)
+        except OSError:
+            pass
@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+# Inquiries that make up one camera's tracking state, in sweep order
+TRACKING_INQUIRIES = ('ai_track_mode', 'ai_track_speed', 'ai_auto_zoom', 'ai_only_me')
+
+
+class TrackingState(NamedTuple):
+    """OBSBOT AI tracking settings (vendor sheet, 8E 01..04).
+
+    The camera tracks on an axis when that axis is set to Auto in the track
+    speed command (q: pan, s: pitch); while it does, manual drive on that axis
+    would fight the tracker.
+    """
+    mode: int = 0        # 0 single-person, 1 multi-person
+    speed: int = 2       # 0 super lazy, 1 lazy, 2 slow, 3 fast, 4 crazy, 5 custom
+    pan_auto: bool = False
+    pan_speed: int = 5   # 1..10, used with speed 5 (custom)
+    tilt_auto: bool = False
+    tilt_speed: int = 5
+    auto_zoom: int = 0   # 0 none, 1 close-up .. 7 long shot 2 (vendor labels)
+    only_me: bool = False
+
+    @property
+    def active(self) -> bool:
+        return self.pan_auto or self.tilt_auto
+
+    def speed_params(self):
+        """Parameters of the ai_track_speed command (p, q, r, s, t)."""
+        return (self.speed, int(self.pan_auto), self.pan_speed, int(self.tilt_auto), self.tilt_speed)
+
+    def to_dict(self) -> Dict[str, object]:
+        state = self._asdict()
+        state['active'] = self.active
+        return state
+
+
+def state_from_replies(commands, replies) -> Optional[TrackingState]:
+    """Decode the TRACKING_INQUIRIES replies of one camera; None if any is missing."""
+    decoded = []
+    for name, reply in zip(TRACKING_INQUIRIES, replies):
+        fields = commands.inquiry(name).parse(reply)
+        if fields is None:
+            return None
+        decoded.append(fields)
+    mode, speed, zoom, only_me = decoded
+    return TrackingState(
+        mode=mode['p'],
+        speed=speed['p'],
+        pan_auto=bool(speed['q']),
+        pan_speed=speed['r'],
+        tilt_auto=bool(speed['s']),
+        tilt_speed=speed['t'],
+        auto_zoom=zoom['p'],
+        only_me=bool(only_me['p']),
+    )
+
+
+class TrackingSync:
+    """Re-reads every camera's tracking state in the background every `interval_s`,
+    so a tracker switched on from the vendor app is noticed too."""
+
+    def __init__(self, refresh: Callable[[], object], interval_s: float = 10.0):
+        self._refresh = refresh
+        self.interval_s = float(interval_s)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_s <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="TrackingSync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._refresh()
+            except Exception as e:
+                self.logger.error(f"Tracking state sweep failed: {e}")
+            self._stop.wait(self.interval_s)
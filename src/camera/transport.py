@@ -0,0 +1,282 @@
+import itertools
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+# VISCA-over-IP payload types (Sony VISCA over IP header, bytes 0-1)
+PAYLOAD_COMMAND = 0x0100
+PAYLOAD_INQUIRY = 0x0110
+PAYLOAD_REPLY = 0x0111
+PAYLOAD_CONTROL = 0x0200
+PAYLOAD_CONTROL_REPLY = 0x0201
+
+# Header: payload type (2), payload length (2), sequence number (4)
+HEADER = struct.Struct(">HHI")
+
+# Bound on outstanding send timestamps kept for ACK latency
+_MAX_PENDING_ACKS = 256
+
+# sendmsg() is not available on Windows
+_HAVE_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+
+class _Waiter:
+    __slots__ = ("event", "reply")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.reply: Optional[bytes] = None
+
+
+class ViscaTransport:
+    """Persistent VISCA-over-IP transport for a single camera.
+
+    Keeps one connected UDP socket open for the lifetime of the camera and frames
+    raw VISCA payloads (e.g. ``81 01 04 07 00 FF``) with the 8-byte VISCA-over-IP
+    header, instead of opening a new socket for every command.
+
+    When opened through a TransportPool, replies are read by the pool's receiver
+    thread: ACKs feed `ack_latency` and inquiry replies wake the waiting caller.
+    Standalone transports read their own replies inside `inquire()`.
+    """
+
+    def __init__(self, ip: str, port: int, timeout: float = 0.3, pool: Optional["TransportPool"] = None):
+        self.ip = ip
+        self.port = int(port)
+        self.timeout = timeout
+        self._pool = pool
+        self._seq = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._inquiry_lock = threading.Lock()
+        self._waiters = {}  # seq -> _Waiter
+        self._sent_at = {}  # seq -> monotonic send time (only while ack_latency is set)
+        self.ack_latency = None  # optional metrics Histogram child
+        self.last_reply: Optional[float] = None
+        self.errors = 0
+        # Reusable header: each send patches it in place and hands header + payload
+        # to one sendmsg(), so the hot path never concatenates a new packet
+        self._header = bytearray(HEADER.size)
+        self._iov = [self._header, b""]
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # A connected UDP socket lets the kernel report ICMP errors (camera port closed)
+        self._sock.connect((ip, self.port))
+        if pool is not None:
+            self._sock.setblocking(False)
+        else:
+            self._sock.settimeout(timeout)
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def _send_locked(self, payload: bytes, payload_type: int, waiter: Optional[_Waiter] = None) -> int:
+        with self._send_lock:
+            seq = next(self._seq) & 0xFFFFFFFF
+            if waiter is not None:
+                self._waiters[seq] = waiter
+            elif self.ack_latency is not None and payload_type == PAYLOAD_COMMAND:
+                if len(self._sent_at) >= _MAX_PENDING_ACKS:
+                    self._sent_at.clear()
+                self._sent_at[seq] = time.monotonic()
+            HEADER.pack_into(self._header, 0, payload_type, len(payload), seq)
+            if _HAVE_SENDMSG:
+                self._iov[1] = payload
+                self._sock.sendmsg(self._iov)
+            else:
+                self._sock.send(bytes(self._header) + payload)
+        return seq
+
+    def send(self, payload: bytes, payload_type: int = PAYLOAD_COMMAND) -> int:
+        """Frame and send a VISCA payload. Returns the sequence number used."""
+        return self._send_locked(payload, payload_type)
+
+    def reset_sequence(self) -> None:
+        """Ask the camera to reset its expected sequence number (control command 01)."""
+        with self._send_lock:
+            self._seq = itertools.count(1)
+            self._sock.send(HEADER.pack(PAYLOAD_CONTROL, 1, 0) + b"\x01")
+
+    def inquire(self, payload: bytes, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Send an inquiry (``81 09 ...``) and wait for its ``y0 50 ... FF`` reply.
+
+        Replies are matched on sequence number; ACK/completion packets for earlier
+        commands that arrive in between are not mistaken for the answer. Returns the
+        raw reply payload, or None on timeout or error reply.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if self._pool is not None:
+            waiter = _Waiter()
+            seq = self._send_locked(payload, PAYLOAD_INQUIRY, waiter)
+            if waiter.event.wait(timeout):
+                return waiter.reply
+            self._waiters.pop(seq, None)
+            return None
+        with self._inquiry_lock:
+            seq = self.send(payload, PAYLOAD_INQUIRY)
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._sock.settimeout(remaining)
+                try:
+                    data = self._sock.recv(64)
+                except socket.timeout:
+                    return None
+                finally:
+                    self._sock.settimeout(self.timeout)
+                if len(data) < HEADER.size + 3:
+                    continue
+                ptype, _length, rseq = HEADER.unpack_from(data)
+                if ptype != PAYLOAD_REPLY or rseq != seq:
+                    continue
+                self.last_reply = time.monotonic()
+                body = data[HEADER.size:]
+                kind = body[1] & 0xF0
+                if kind == 0x50:
+                    return body
+                if kind == 0x60:
+                    return None
+
+    def begin_inquiry(self, payload: bytes) -> Tuple[int, _Waiter]:
+        """Send an inquiry without waiting (pooled transports only); see `inquire_all()`."""
+        waiter = _Waiter()
+        return self._send_locked(payload, PAYLOAD_INQUIRY, waiter), waiter
+
+    def _on_readable(self) -> None:
+        """Drain the socket (pool receiver thread only)."""
+        while True:
+            try:
+                data = self._sock.recv(64)
+            except BlockingIOError:
+                return
+            except OSError:
+                # e.g. ConnectionRefusedError from an ICMP port-unreachable
+                self.errors += 1
+                return
+            if len(data) < HEADER.size + 3:
+                continue
+            ptype, _length, seq = HEADER.unpack_from(data)
+            if ptype != PAYLOAD_REPLY:
+                continue
+            now = time.monotonic()
+            self.last_reply = now
+            kind = data[HEADER.size + 1] & 0xF0
+            if kind == 0x40:
+                sent = self._sent_at.pop(seq, None)
+                if sent is not None and self.ack_latency is not None:
+                    self.ack_latency.observe(now - sent)
+                continue
+            waiter = self._waiters.pop(seq, None)
+            if waiter is None:
+                # Completion for a command (or a reply we stopped waiting for)
+                self._sent_at.pop(seq, None)
+                continue
+            waiter.reply = data[HEADER.size:] if kind == 0x50 else None
+            waiter.event.set()
+
+    def close(self) -> None:
+        # A send in progress finishes first
+        with self._send_lock:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+
+
+class TransportPool:
+    """Owns the camera transports and a single receiver thread for all of them.
+
+    One selector thread serves every camera, so adding cameras does not add
+    threads, and replies are consumed as they arrive rather than only when
+    somebody happens to be waiting for an inquiry.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self, ip: str, port: int, timeout: float = 0.3) -> ViscaTransport:
+        transport = ViscaTransport(ip, port, timeout=timeout, pool=self)
+        with self._lock:
+            self._selector.register(transport, selectors.EVENT_READ, transport)
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._loop, name="ViscaReceiver", daemon=True)
+                self._thread.start()
+        return transport
+
+    def release(self, transport: Optional[ViscaTransport]) -> None:
+        if transport is None:
+            return
+        with self._lock:
+            try:
+                self._selector.unregister(transport)
+            except Exception:
+                pass
+        transport.close()
+
+    def close(self) -> None:
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        with self._lock:
+            for key in list(self._selector.get_map().values()):
+                try:
+                    self._selector.unregister(key.fileobj)
+                except Exception:
+                    pass
+                key.data.close()
+
+    def _loop(self) -> None:
+        while self._running:
+            try:
+                events = self._selector.select(0.2)
+            except (OSError, ValueError):
+                # A transport was closed underneath us; the next select sees the new map
+                time.sleep(0.05)
+                continue
+            for key, _mask in events:
+                key.data._on_readable()
+
+
+def inquire_all(requests: Sequence[Tuple[ViscaTransport, bytes]], timeout: float = 0.3) -> List[Optional[bytes]]:
+    """Pipelined inquiries: send every (transport, payload) first, then collect the
+    replies against one shared deadline, so N inquiries cost about one round trip
+    instead of N. Standalone transports (no pool receiver) are asked one by one.
+    Returns the replies in request order, None where none arrived."""
+    pending = []
+    for transport, payload in requests:
+        if transport._pool is not None:
+            try:
+                pending.append(transport.begin_inquiry(payload))
+            except OSError:
+                pending.append(None)
+        else:
+            pending.append(transport.inquire(payload, timeout))
+    deadline = time.monotonic() + timeout
+    replies: List[Optional[bytes]] = []
+    for (transport, _payload), entry in zip(requests, pending):
+        if not isinstance(entry, tuple):
+            replies.append(entry)
+            continue
+        seq, waiter = entry
+        if waiter.event.wait(max(0.0, deadline - time.monotonic())):
+            replies.append(waiter.reply)
+        else:
+            transport._waiters.pop(seq, None)
+            replies.append(None)
+    return replies
+
+
+def decode_nibbles(data: bytes) -> int:
+    """Decode VISCA ``0p 0p 0p 0p`` style nibble fields into an integer."""
+    value = 0
+    for b in data:
+        value = (value << 4) | (b & 0x0F)
+    return value
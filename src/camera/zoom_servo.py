@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from .packets import PtzPacketTable, ZOOM_SPEED_MAX
+
+ZOOM_RATIO_MIN = 1000
+ZOOM_RATIO_MAX = 12000
+
+
+class ZoomServo:
+    """Closed-loop zoom to a target ratio using zoom position inquiries.
+
+    Each tick reads the current ratio (``81 09 04 47``) and drives variable-speed
+    zoom toward the target, with speed proportional to the remaining error so the
+    move slows down near the target. Inside `landing_window` it stops and sends a
+    DIRECT zoom for the exact ratio. Commands are only sent when the speed changes,
+    and ticks are paced at `rate_hz`, so the command rate is bounded.
+
+    `send(payload)` and `inquire_ratio()` are supplied by the CameraManager so the
+    servo goes through the same breaker, journal and metrics as everything else.
+    The worker thread only exists while a move is in progress.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], bool],
+        inquire_ratio: Callable[[], Optional[int]],
+        packets: PtzPacketTable,
+        build_direct: Callable[[int], bytes],
+        rate_hz: float = 10.0,
+        full_speed_error: int = 4000,
+        landing_window: int = 300,
+        timeout_s: float = 10.0,
+        max_missed_replies: int = 3,
+        on_ratio: Optional[Callable[[int], None]] = None,
+    ):
+        self._send = send
+        self._inquire_ratio = inquire_ratio
+        self._packets = packets
+        self._build_direct = build_direct
+        self.tick_s = 1.0 / max(1.0, float(rate_hz))
+        self.full_speed_error = max(1, int(full_speed_error))
+        self.landing_window = int(landing_window)
+        self.timeout_s = float(timeout_s)
+        self.max_missed_replies = int(max_missed_replies)
+        self._on_ratio = on_ratio
+        self._lock = threading.Lock()
+        self._target: Optional[int] = None
+        self._deadline = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def active(self) -> bool:
+        return self._target is not None
+
+    def move_to(self, ratio: int) -> None:
+        """Start (or retarget) a move. Safe to call repeatedly, e.g. from a slider."""
+        ratio = max(ZOOM_RATIO_MIN, min(ZOOM_RATIO_MAX, int(ratio)))
+        with self._lock:
+            self._target = ratio
+            self._deadline = time.monotonic() + self.timeout_s
+            # The worker clears _thread under the lock when it exits, so a retarget
+            # either reaches the running loop or starts a new one
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ZoomServo", daemon=True)
+                self._thread.start()
+
+    def cancel(self) -> None:
+        """Abandon the move without sending anything (manual zoom took over)."""
+        with self._lock:
+            self._target = None
+
+    def stop(self) -> None:
+        self.cancel()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def speed_for(self, error: int) -> int:
+        """Proportional profile: full speed far away, 1 just outside the landing window."""
+        magnitude = abs(error)
+        speed = 1 + (ZOOM_SPEED_MAX - 1) * min(magnitude, self.full_speed_error) // self.full_speed_error
+        return speed if error > 0 else -speed
+
+    def _run(self) -> None:
+        current_speed = 0
+        missed = 0
+        while True:
+            started = time.monotonic()
+            with self._lock:
+                target = self._target
+                deadline = self._deadline
+                if target is None:
+                    self._thread = None
+            if target is None:
+                # Cancelled: whoever cancelled owns the zoom now, so send nothing
+                return
+            ratio = self._inquire_ratio()
+            if ratio is None:
+                missed += 1
+                if missed >= self.max_missed_replies:
+                    self.logger.warning("Zoom servo: no position replies, landing with DIRECT")
+                    self._land(target, current_speed)
+                    current_speed = missed = 0
+                    continue
+            else:
+                missed = 0
+                if self._on_ratio is not None:
+                    self._on_ratio(ratio)
+                error = target - ratio
+                if abs(error) <= self.landing_window or started >= deadline:
+                    self._land(target, current_speed)
+                    current_speed = 0
+                    continue
+                speed = self.speed_for(error)
+                if speed != current_speed:
+                    self._send(self._packets.zoom(speed))
+                    current_speed = speed
+            time.sleep(max(0.0, self.tick_s - (time.monotonic() - started)))
+
+    def _land(self, target: int, current_speed: int) -> None:
+        if current_speed:
+            self._send(self._packets.zoom_stop)
+        self._send(self._build_direct(target))
+        with self._lock:
+            # A retarget during landing keeps the loop running toward the new target
+            if self._target == target:
+                self._target = None
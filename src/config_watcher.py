@@ -0,0 +1,312 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from camera.commands import DEFAULT_MODEL
+
+
+# <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len (name follows)
+
+_CAMERA_KEYS = ('name', 'ip', 'port', 'model', 'calibration', 'backend', 'simulator')
+
+
+class _Inotify:
+    """Minimal inotify binding (libc via ctypes) watching one directory."""
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory, not the file: editors and provisioning tools replace
+        # the file by rename, which would orphan a watch on the old inode
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch({directory}) failed")
+
+    def names(self):
+        """File names with pending events (non-blocking)."""
+        names = set()
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _wd, _mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            names.add(data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace'))
+            offset += length
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """Re-reads config.yaml when it changes on disk and hands the parsed document
+    to `on_change(new_config)` from the watcher thread.
+
+    Uses inotify where available and falls back to polling the file's mtime
+    every `poll_s`. Bursts of events (truncate + write + close, or several
+    saves in a row) are collapsed over `debounce_s`, and a file whose bytes did
+    not change, or that does not parse, is ignored.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[Dict], None], debounce_s: float = 0.25, poll_s: float = 1.0):
+        self.path = os.path.abspath(path)
+        self._on_change = on_change
+        self.debounce_s = float(debounce_s)
+        self.poll_s = float(poll_s)
+        self._last = self._read_bytes()
+        self._stop_r, self._stop_w = None, None
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _read_bytes(self) -> Optional[bytes]:
+        try:
+            with open(self.path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_r, self._stop_w = os.pipe()
+        try:
+            inotify = _Inotify(os.path.dirname(self.path))
+        except (OSError, AttributeError) as e:
+            self.logger.info(f"inotify unavailable ({e}); polling {self.path} every {self.poll_s}s")
+            inotify = None
+        self._thread = threading.Thread(target=self._loop, args=(inotify,), name="ConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        os.write(self._stop_w, b'x')
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        os.close(self._stop_r)
+        os.close(self._stop_w)
+
+    def _loop(self, inotify: Optional[_Inotify]) -> None:
+        name = os.path.basename(self.path)
+        stat = _stat(self.path)
+        try:
+            while True:
+                if inotify is not None:
+                    ready, _, _ = select.select([self._stop_r, inotify.fd], [], [])
+                    if self._stop_r in ready:
+                        return
+                    if name not in inotify.names():
+                        continue
+                    # Let the writer finish: wait until the events stop coming
+                    while True:
+                        ready, _, _ = select.select([self._stop_r, inotify.fd], [], [], self.debounce_s)
+                        if self._stop_r in ready:
+                            return
+                        if not ready:
+                            break
+                        inotify.names()
+                else:
+                    if select.select([self._stop_r], [], [], self.poll_s)[0]:
+                        return
+                    current = _stat(self.path)
+                    if current == stat:
+                        continue
+                    stat = current
+                self._check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def _check(self) -> None:
+        data = self._read_bytes()
+        if data is None or data == self._last:
+            return
+        try:
+            config = yaml.safe_load(data) or {}
+        except yaml.YAMLError as e:
+            self.logger.error(f"Ignoring unparsable {self.path}: {e}")
+            return
+        self._last = data
+        try:
+            self._on_change(config)
+        except Exception as e:
+            self.logger.error(f"Applying changed config failed: {e}")
+
+
+def _stat(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ConfigDiff(NamedTuple):
+    """What changed between two config documents.
+
+    Cameras are matched by address (ip, port), then by name, so deleting or
+    inserting one in the middle of the list does not touch the others.
+    `cameras_matched` pairs (old index, new index); `cameras_changed` and
+    `cameras_added` are new indices, `cameras_removed` old ones.
+    """
+    cameras_changed: Tuple[int, ...] = ()
+    cameras_added: Tuple[int, ...] = ()
+    cameras_removed: Tuple[int, ...] = ()
+    cameras_matched: Tuple[Tuple[int, int], ...] = ()
+    cameras_reordered: bool = False
+    gamepad: bool = False
+    sections: Tuple[str, ...] = ()  # other top-level sections that changed
+
+    @property
+    def empty(self) -> bool:
+        return not (self.camera_list_changed or self.gamepad or self.sections)
+
+    @property
+    def camera_list_changed(self) -> bool:
+        return bool(self.cameras_changed or self.cameras_added or self.cameras_removed or self.cameras_reordered)
+
+
+def _camera_address(camera: Dict) -> Tuple:
+    return camera.get('ip'), int(camera.get('port', 52381))
+
+
+def _camera_key(camera: Dict) -> Tuple:
+    defaults = {'port': 52381, 'model': DEFAULT_MODEL, 'backend': 'visca'}
+    return tuple(camera.get(key) or defaults.get(key) for key in _CAMERA_KEYS)
+
+
+def match_cameras(old_cameras: List[Dict], new_cameras: List[Dict]) -> Dict[int, int]:
+    """new index -> old index of the same camera: same address first, then same name
+    (a camera that was re-addressed)."""
+    matched: Dict[int, int] = {}
+    for key in (_camera_address, lambda camera: camera.get('name')):
+        free = {}
+        for index, camera in enumerate(old_cameras):
+            if index not in matched.values():
+                free.setdefault(key(camera), index)
+        for index, camera in enumerate(new_cameras):
+            if index not in matched and key(camera) in free:
+                matched[index] = free.pop(key(camera))
+    return matched
+
+
+def diff_config(old: Dict, new: Dict) -> ConfigDiff:
+    old_cameras = old.get('cameras') or []
+    new_cameras = new.get('cameras') or []
+    matched = match_cameras(old_cameras, new_cameras)
+    removed = tuple(i for i in range(len(old_cameras)) if i not in matched.values())
+    added = tuple(i for i in range(len(new_cameras)) if i not in matched)
+    # Removing and appending keeps the survivors in their old order, new ones at the end
+    kept = [i for i in range(len(new_cameras)) if i in matched]
+    reordered = [matched[i] for i in kept] != sorted(matched.values()) or (
+        bool(added) and bool(kept) and min(added) < max(kept))
+    sections = tuple(sorted(
+        key for key in set(old) | set(new)
+        if key not in ('cameras', 'gamepad') and old.get(key) != new.get(key)
+    ))
+    return ConfigDiff(
+        cameras_changed=tuple(i for i in kept if _camera_key(old_cameras[matched[i]]) != _camera_key(new_cameras[i])),
+        cameras_added=added,
+        cameras_removed=removed,
+        cameras_matched=tuple(sorted((old_index, new_index) for new_index, old_index in matched.items())),
+        cameras_reordered=reordered,
+        gamepad=(old.get('gamepad') or {}).get('mapping') != (new.get('gamepad') or {}).get('mapping'),
+        sections=sections,
+    )
+
+
+def apply_cameras(camera_manager, diff: ConfigDiff, new_cameras: List[Dict]) -> None:
+    """Bring the CameraManager's list in line with `new_cameras`: remove, update and add
+    only the cameras in `diff`, then restore the config order. Unchanged cameras keep
+    their transport and state."""
+    current: List[object] = list(range(len(camera_manager.cameras)))  # old index, or ('new', index)
+    for old_index in reversed(diff.cameras_removed):
+        if old_index in current:
+            camera_manager.remove_camera(current.index(old_index))
+            current.remove(old_index)
+    old_of = {new_index: old_index for old_index, new_index in diff.cameras_matched}
+    for new_index in diff.cameras_changed:
+        if old_of[new_index] in current:
+            camera_manager.update_camera_config(current.index(old_of[new_index]), new_cameras[new_index])
+    for new_index in diff.cameras_added:
+        if camera_manager.add_camera(new_cameras[new_index]):
+            current.append(('new', new_index))
+    if diff.cameras_reordered:
+        wanted = [old_of.get(i, ('new', i)) for i in range(len(new_cameras))]
+        camera_manager.reorder_cameras([current.index(key) for key in wanted if key in current])
+
+
+def apply_config(camera_manager, controller_manager, config: Dict, new_config: Dict) -> ConfigDiff:
+    """Apply the camera list and gamepad mapping changes; `config` is updated in place
+    to `new_config`. Other sections are left to ConfigApplier's handlers."""
+    diff = diff_config(config, new_config)
+    if diff.empty:
+        return diff
+    apply_cameras(camera_manager, diff, new_config.get('cameras') or [])
+    config.clear()
+    config.update(new_config)
+    if diff.gamepad:
+        controller_manager.update_gamepad_mapping(controller_manager.get_gamepad_mapping())
+    return diff
+
+
+class ConfigApplier:
+    """One changed-config handler for both front ends (GUI and headless).
+
+    Cameras and the gamepad mapping are applied here; other top-level sections
+    through handlers registered with `on(section, handler)`, called with the new
+    config. `ignore` names sections this front end does not use. Any other
+    changed section only takes effect after a restart, and is logged as such.
+    """
+
+    def __init__(self, camera_manager, controller_manager, config: Dict, ignore=()):
+        self.camera_manager = camera_manager
+        self.controller_manager = controller_manager
+        self.config = config
+        self._handlers: Dict[str, Callable[[Dict], None]] = {}
+        self._ignored = set(ignore)
+        self.logger = logging.getLogger(__name__)
+
+    def on(self, section: str, handler: Callable[[Dict], None]) -> None:
+        self._handlers[section] = handler
+
+    def apply(self, new_config: Dict) -> ConfigDiff:
+        diff = apply_config(self.camera_manager, self.controller_manager, self.config, new_config)
+        if diff.empty:
+            return diff
+        restart = []
+        for section in diff.sections:
+            handler = self._handlers.get(section)
+            if handler is not None:
+                try:
+                    handler(new_config)
+                except Exception as e:
+                    self.logger.error(f"Applying changed '{section}' config failed: {e}")
+            elif section not in self._ignored:
+                restart.append(section)
+        if restart:
+            self.logger.warning(f"Changed config section(s) {', '.join(restart)} require a restart to take effect")
+        self.logger.info(f"Configuration reloaded: {diff}")
+        return diff
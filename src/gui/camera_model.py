@@ -0,0 +1,152 @@
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QAbstractItemView, QFrame, QListView, QScroller, QStyle, QStyledItemDelegate
+
+# Roles beyond Qt.DisplayRole (the camera name)
+STATUS_ROLE = Qt.UserRole + 1    # 'online', 'degraded' or 'offline'
+TRACKING_ROLE = Qt.UserRole + 2  # True while the AI tracker drives the camera
+POSITION_ROLE = Qt.UserRole + 3  # short pan/tilt/zoom text from the position estimate
+
+
+class CameraListModel(QAbstractListModel):
+    """One row per camera of the CameraManager, shared by the camera selectors of
+    every tab.
+
+    `refresh()` re-reads the cameras (from memory only) and emits signals just
+    for rows that changed: cameras added or removed at the end of the list are
+    inserted or removed, and a changed name, status, tracking flag or position
+    emits dataChanged for that row, so views never rebuild.
+    """
+
+    def __init__(self, camera_manager, parent=None):
+        super().__init__(parent)
+        self.camera_manager = camera_manager
+        self._rows = []  # (name, status, tracking, position) per camera
+        self.refresh()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        name, status, tracking, position = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == STATUS_ROLE:
+            return status
+        if role == TRACKING_ROLE:
+            return tracking
+        if role == POSITION_ROLE:
+            return position
+        if role == Qt.ToolTipRole:
+            return f"{name}: {status}{', tracking' if tracking else ''}"
+        return None
+
+    def _read_row(self, index, name, tracking_states):
+        status = self.camera_manager.get_camera_health(index) or "online"
+        state = tracking_states.get(index)
+        # Only the active camera may ask for an early heartbeat; the others show what is known
+        active = index == self.camera_manager.active_camera_index
+        estimate = self.camera_manager.get_position_estimate(index, request_fix=active)
+        position = "" if estimate is None else (
+            f"{estimate['pan_deg']:.0f}° {estimate['tilt_deg']:.0f}° {estimate['zoom_x']:.1f}x")
+        return name, status, bool(state is not None and state.active), position
+
+    def refresh(self):
+        names = self.camera_manager.get_camera_list()
+        tracking_states = self.camera_manager.get_tracking_states()
+        if len(names) < len(self._rows):
+            self.beginRemoveRows(QModelIndex(), len(names), len(self._rows) - 1)
+            del self._rows[len(names):]
+            self.endRemoveRows()
+        for i in range(len(self._rows)):
+            row = self._read_row(i, names[i], tracking_states)
+            if row != self._rows[i]:
+                self._rows[i] = row
+                self.dataChanged.emit(self.index(i), self.index(i))
+        if len(names) > len(self._rows):
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, len(names) - 1)
+            self._rows.extend(self._read_row(i, names[i], tracking_states) for i in range(start, len(names)))
+            self.endInsertRows()
+
+
+class CameraDelegate(QStyledItemDelegate):
+    """Paints a camera as a touch button: name, status border, tracking mark and
+    position line. Same colours as the push buttons of the app style."""
+
+    _BORDER = {"degraded": "#f0ad4e", "offline": "#d9534f"}
+
+    def __init__(self, parent=None, height=48):
+        super().__init__(parent)
+        self.item_width = 120
+        self.item_height = height
+
+    def sizeHint(self, option, index):
+        return QSize(self.item_width, self.item_height)
+
+    def paint(self, painter, option, index):
+        status = index.data(STATUS_ROLE)
+        selected = bool(option.state & QStyle.State_Selected)
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        border = self._BORDER.get(status)
+        painter.setPen(QPen(QColor(border or ("#007acc" if selected else "#555555")), 2 if border else 1))
+        painter.setBrush(QColor("#007acc" if selected else "#2d2d2d"))
+        painter.drawRoundedRect(rect, 8, 8)
+
+        text_rect = rect.adjusted(6, 2, -6, -2)
+        painter.setPen(QColor(border if status == "offline" and not selected else "#ffffff"))
+        painter.setFont(QFont("Arial", 11, QFont.Bold))
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop, index.data(Qt.DisplayRole) or "")
+        position = index.data(POSITION_ROLE)
+        if position:
+            painter.setPen(QColor("#dddddd" if selected else "#aaaaaa"))
+            painter.setFont(QFont("Arial", 8))
+            painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignBottom, position)
+        if index.data(TRACKING_ROLE):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#5cb85c"))
+            painter.drawEllipse(rect.right() - 12, rect.top() + 5, 7, 7)
+        painter.restore()
+
+
+class CameraSelector(QListView):
+    """Horizontal camera strip over a CameraListModel. Items share the width while
+    they fit and keep a touch-sized minimum beyond that, where the strip scrolls
+    by swiping. Views given the same selection model stay in step without any
+    per-button syncing."""
+
+    MIN_ITEM_WIDTH = 110
+
+    def __init__(self, model, selection_model=None, height=48, parent=None):
+        super().__init__(parent)
+        self._delegate = CameraDelegate(self, height)
+        self.setItemDelegate(self._delegate)
+        self.setModel(model)
+        if selection_model is not None:
+            self.setSelectionModel(selection_model)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setFixedHeight(height + self.horizontalScrollBar().sizeHint().height() + 4)
+        QScroller.grabGesture(self.viewport(), QScroller.LeftMouseButtonGesture)
+        model.rowsInserted.connect(self._fit_items)
+        model.rowsRemoved.connect(self._fit_items)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._fit_items()
+
+    def _fit_items(self, *args):
+        count = max(1, self.model().rowCount())
+        width = max(self.MIN_ITEM_WIDTH, self.viewport().width() // count)
+        if width != self._delegate.item_width:
+            self._delegate.item_width = width
+            self.scheduleDelayedItemsLayout()
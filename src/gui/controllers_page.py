@@ -137,6 +137,7 @@ class ControllersPage(QWidget):
         self.timer = QTimer()
         self.timer.timeout.connect(self._update_live)
         self.timer.start(100)
+        self._test_dialog = None
 
     def _apply_mapping(self):
         mapping = self._collect_mapping()
@@ -151,9 +152,21 @@ class ControllersPage(QWidget):
         except Exception:
             pass
 
+    def set_idle(self, idle):
+        """Idle power mode: stop polling the live values (and an open test dialog)."""
+        if idle:
+            self.timer.stop()
+        else:
+            self.timer.start(100)
+        if self._test_dialog is not None:
+            self._test_dialog.set_idle(idle)
+
     def _open_test_dialog(self):
-        dlg = ControllerTestDialog(self.controller_manager, self)
-        dlg.exec_()
+        self._test_dialog = ControllerTestDialog(self.controller_manager, self)
+        try:
+            self._test_dialog.exec_()
+        finally:
+            self._test_dialog = None
 
     def _open_deadzone_dialog(self):
         dlg = DeadzoneDialog(current=self.deadzone_spin.value(), parent=self)
@@ -196,7 +209,11 @@ class ControllersPage(QWidget):
     
 
     def _collect_mapping(self):
-        return {
+        # Keep settings this page does not edit (extra button actions, bindings, timing)
+        current = self.controller_manager.get_gamepad_mapping()
+        buttons = dict(current.get("buttons") or {})
+        mapping = dict(current)
+        mapping.update({
             "pan_axis": int(self.pan_axis_combo.currentData()),
             "tilt_axis": int(self.tilt_axis_combo.currentData()),
             "zoom_axis": int(self.zoom_axis_combo.currentData()),
@@ -204,13 +221,15 @@ class ControllersPage(QWidget):
             "invert_tilt": bool(self.invert_tilt_cb.isChecked()),
             "invert_zoom": bool(self.invert_zoom_cb.isChecked()),
             "deadzone": float(self.deadzone_spin.value()),
-            "buttons": {
-                "zoom_in": int(self.zoom_in_button.value()),
-                "zoom_out": int(self.zoom_out_button.value()),
-                "stop": int(self.stop_button.value()),
-                "preset_store_toggle": int(self.preset_store_toggle_button.value()),
-            }
-        }
+        })
+        buttons.update({
+            "zoom_in": int(self.zoom_in_button.value()),
+            "zoom_out": int(self.zoom_out_button.value()),
+            "stop": int(self.stop_button.value()),
+            "preset_store_toggle": int(self.preset_store_toggle_button.value()),
+        })
+        mapping["buttons"] = buttons
+        return mapping
 
     def _update_live(self):
         pan, tilt, zoom = self.controller_manager.get_values()
@@ -238,6 +257,12 @@ class ControllerTestDialog(QDialog):
         self._joystick = None
         self._init_joystick()
 
+    def set_idle(self, idle):
+        if idle:
+            self._timer.stop()
+        else:
+            self._timer.start(50)
+
     def _init_joystick(self):
         if pygame is None:
             self.status_label.setText("pygame not available. Install pygame.")
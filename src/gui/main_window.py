@@ -1,11 +1,23 @@
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QPushButton, QLabel, QComboBox, QTabWidget, 
                             QGridLayout, QLineEdit, QSpinBox, QGroupBox,
-                            QSlider, QMessageBox, QStyle, QProxyStyle, QButtonGroup, QSizePolicy)
-from PyQt5.QtCore import Qt, QTimer, QSize
+                            QSlider, QMessageBox, QStyle, QProxyStyle, QButtonGroup,
+                            QCheckBox)
+from PyQt5.QtCore import Qt, QEvent, QTimer, QSize, QItemSelectionModel, pyqtSignal
 from PyQt5.QtGui import QFont
+import time
+from config_watcher import ConfigApplier
+from monitoring.metrics import REGISTRY
+from joystick.input_pipeline import InputPipeline
+from .camera_model import CameraListModel, CameraSelector
 from .controllers_page import ControllersPage
 
+# Touch, mouse and key events that count as input for the idle power mode
+_INPUT_EVENTS = frozenset((QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.TouchBegin, QEvent.TouchUpdate,
+                           QEvent.KeyPress, QEvent.Wheel))
+
+_UI_LAG = REGISTRY.histogram("rpiptz_gui_event_loop_lag_seconds", "Delay of the 100 ms UI timer beyond its interval (Qt event-loop lag).")
+
 # Custom slider style for touch screens
 class TouchSliderStyle(QProxyStyle):
     def __init__(self):
@@ -19,13 +31,27 @@ class TouchSliderStyle(QProxyStyle):
         return super().pixelMetric(metric, option, widget)
 
 class MainWindow(QMainWindow):
-    def __init__(self, camera_manager, controller_manager, config_ref, config_saver):
+    # Parsed config.yaml from the file watcher thread; handled on the UI thread
+    config_file_changed = pyqtSignal(object)
+    # Idle power mode switched (from the idle monitor or gamepad thread); handled on the UI thread
+    idle_changed = pyqtSignal(bool)
+
+    def __init__(self, camera_manager, controller_manager, config_ref, config_saver, sequencer=None,
+                 idle_monitor=None, config_applier=None):
         super().__init__()
         
         self.camera_manager = camera_manager
         self.controller_manager = controller_manager
         self._config_ref = config_ref
         self._config_saver = config_saver
+        self.sequencer = sequencer
+        self.idle_monitor = idle_monitor
+        # Joystick -> camera command mapping, shared with the headless daemon
+        self.input_pipeline = InputPipeline.from_config(camera_manager, config_ref, sequencer=sequencer)
+        # config.yaml changes on disk; `headless:` is the daemon's section
+        self.config_applier = config_applier or ConfigApplier(camera_manager, controller_manager, config_ref,
+                                                              ignore=('headless',))
+        self.config_applier.on('input', self.input_pipeline.apply_config)
         
         # Set up the main window
         self.setWindowTitle("Camera Controller")
@@ -56,16 +82,26 @@ class MainWindow(QMainWindow):
         self.presets_tab = QWidget()  # New presets tab
         self.system_tab = QWidget()  # New system tab
         self.controllers_tab = QWidget()  # New controllers tab
+        self.tracking_tab = QWidget()
         
         self.tab_widget.addTab(self.control_tab, "Control")
         self.tab_widget.addTab(self.controllers_tab, "Controllers")
         self.tab_widget.addTab(self.presets_tab, "Presets")  # Add presets tab
+        self.tab_widget.addTab(self.tracking_tab, "Tracking")
         self.tab_widget.addTab(self.config_tab, "Config")
         self.tab_widget.addTab(self.system_tab, "System")  # Add system tab
         
+        # One camera model for every tab; the control and presets selectors share the
+        # active-camera selection, the config tab keeps its own
+        self.camera_model = CameraListModel(camera_manager, self)
+        self.active_camera_selection = QItemSelectionModel(self.camera_model, self)
+        self.active_camera_selection.currentChanged.connect(self.on_active_camera_selected)
+        self.config_selected_index = 0
+
         # Set up the tabs
         self.setup_control_tab()
         self.setup_presets_tab()
+        self.setup_tracking_tab()
         self.setup_config_tab()
         self.setup_system_tab()  # Setup the new system tab
         self.setup_controllers_tab()
@@ -85,17 +121,26 @@ class MainWindow(QMainWindow):
         # self.main_layout.addWidget(self.exit_button)
         
         # Start controller monitoring with button callback (external controllers only)
-        self.controller_manager.start_monitoring(self.on_joystick_movement, self.on_button_action)
+        self.controller_manager.start_monitoring(self.on_joystick_movement, self.on_button_action,
+                                                 self.camera_manager.stop_all_motion)
         
         # Timer for updating UI
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_ui)
         self.update_timer.start(100)  # Update every 100ms
+        self._last_update_tick = time.monotonic()
 
         # State for press-and-hold (single-shot on press, explicit stop on release)
         self._move_hold_dx = 0
         self._move_hold_dy = 0
         self._zoom_hold_dir = 0
+
+        self.config_file_changed.connect(self.on_config_file_changed)
+        if idle_monitor is not None:
+            self.idle_changed.connect(self.on_idle_changed)
+            idle_monitor.add_listener(self.idle_changed.emit)
+            # Every touch or key anywhere in the app is input
+            QApplication.instance().installEventFilter(self)
     
     def setup_control_tab(self):
         """Set up the control tab with camera selection and controls"""
@@ -103,30 +148,14 @@ class MainWindow(QMainWindow):
         layout.setSpacing(6)
         layout.setContentsMargins(6, 6, 6, 6)
         
-        # Camera selection - replace dropdown with buttons
+        # Camera selection: a swipeable strip, so any number of cameras fits the screen
         camera_group = QGroupBox("Camera")
         camera_group.setFlat(True)
         camera_layout = QHBoxLayout()
         camera_layout.setContentsMargins(2, 2, 2, 2)
-        camera_layout.setSpacing(4)
-        
-        # Create camera selection buttons instead of dropdown
-        self.camera_buttons = []
-        for i, camera_name in enumerate(self.camera_manager.get_camera_list()):
-            btn = QPushButton(camera_name)
-            btn.setCheckable(True)
-            btn.setMinimumHeight(36)
-            btn.setFont(QFont("Arial", 11, QFont.Bold))
-            btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            # Use a lambda with default argument to capture the correct index
-            btn.clicked.connect(lambda checked, idx=i: self.on_camera_button_clicked(idx))
-            camera_layout.addWidget(btn)
-            self.camera_buttons.append(btn)
-        
-        # Set the first camera as active
-        if self.camera_buttons:
-            self.camera_buttons[0].setChecked(True)
-        
+        self.camera_selector = CameraSelector(self.camera_model, self.active_camera_selection, height=44)
+        camera_layout.addWidget(self.camera_selector)
+        self._select_camera_row(self.active_camera_selection, self.camera_manager.active_camera_index)
         camera_group.setLayout(camera_layout)
         layout.addWidget(camera_group)
         
@@ -148,9 +177,12 @@ class MainWindow(QMainWindow):
         self.pan_tilt_label.setFont(QFont("Arial", 11))
         self.zoom_label = QLabel("Zoom: 0")
         self.zoom_label.setFont(QFont("Arial", 11))
+        self.position_label = QLabel("Camera: -")
+        self.position_label.setFont(QFont("Arial", 11))
         
         joystick_layout.addWidget(self.pan_tilt_label, 0, 0)
         joystick_layout.addWidget(self.zoom_label, 1, 0)
+        joystick_layout.addWidget(self.position_label, 2, 0)
         
         joystick_group.setLayout(joystick_layout)
         left_controls.addWidget(joystick_group)
@@ -222,6 +254,8 @@ class MainWindow(QMainWindow):
             if self.speed_buttons.id(btn) == 16:
                 btn.setChecked(True)
                 break
+        self.speed_buttons.buttonClicked.connect(self._on_speed_button_clicked)
+        self.input_pipeline.speed = self.get_speed()
         speed_group.setLayout(speed_layout)
         left_controls.addWidget(speed_group)
         
@@ -297,24 +331,9 @@ class MainWindow(QMainWindow):
         camera_group = QGroupBox("Camera")
         camera_layout = QHBoxLayout()
         camera_layout.setContentsMargins(2, 2, 2, 2)
-        camera_layout.setSpacing(4)
-        
-        # Create camera selection buttons for presets tab
-        self.preset_camera_buttons = []
-        for i, camera_name in enumerate(self.camera_manager.get_camera_list()):
-            btn = QPushButton(camera_name)
-            btn.setCheckable(True)
-            btn.setMinimumHeight(40)
-            btn.setFont(QFont("Arial", 10))
-            # Use a lambda with default argument to capture the correct index
-            btn.clicked.connect(lambda checked, idx=i: self.on_preset_camera_clicked(idx))
-            camera_layout.addWidget(btn)
-            self.preset_camera_buttons.append(btn)
-        
-        # Set the first camera as active
-        if self.preset_camera_buttons:
-            self.preset_camera_buttons[0].setChecked(True)
-        
+        # Same selection as the control tab
+        self.preset_camera_selector = CameraSelector(self.camera_model, self.active_camera_selection)
+        camera_layout.addWidget(self.preset_camera_selector)
         camera_group.setLayout(camera_layout)
         layout.addWidget(camera_group)
         
@@ -346,19 +365,23 @@ class MainWindow(QMainWindow):
         
         presets_group.setLayout(presets_layout)
         layout.addWidget(presets_group)
-    
-    def on_preset_camera_clicked(self, index):
-        """Handle camera selection in presets tab"""
-        # Update button states
-        for i, btn in enumerate(self.preset_camera_buttons):
-            btn.setChecked(i == index)
-        
-        # Update camera buttons in control tab to match
-        for i, btn in enumerate(self.camera_buttons):
-            btn.setChecked(i == index)
-        
-        # Set the active camera
-        self.camera_manager.set_active_camera(index)
+
+        # Sequences from config/sequences.yaml: tap to start, tap again to stop
+        self.sequence_buttons = {}
+        if self.sequencer is not None and self.sequencer.sequences:
+            sequences_group = QGroupBox("Sequences")
+            sequences_layout = QHBoxLayout()
+            sequences_layout.setContentsMargins(4, 4, 4, 4)
+            for name in self.sequencer.sequences:
+                btn = QPushButton(name)
+                btn.setCheckable(True)
+                btn.setMinimumHeight(44)
+                btn.setFont(QFont("Arial", 11))
+                btn.clicked.connect(lambda checked, seq=name: self.on_sequence_button(seq))
+                sequences_layout.addWidget(btn)
+                self.sequence_buttons[name] = btn
+            sequences_group.setLayout(sequences_layout)
+            layout.addWidget(sequences_group)
     
     def on_preset_button(self, preset_num):
         """Handle preset button press"""
@@ -377,6 +400,104 @@ class MainWindow(QMainWindow):
             if not success:
                 QMessageBox.warning(self, "Error", f"Failed to recall Preset {preset_num}")
     
+    def on_sequence_button(self, name):
+        """Start or stop a sequence; the button state follows the sequencer in update_ui."""
+        if self.sequencer.is_running(name):
+            self.sequencer.stop(name)
+        elif not self.sequencer.start(name):
+            QMessageBox.warning(self, "Error", f"Failed to start sequence {name}")
+
+    def setup_tracking_tab(self):
+        """Set up the AI tracking tab (OBSBOT cameras) for the active camera"""
+        layout = QVBoxLayout(self.tracking_tab)
+        layout.setSpacing(6)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.tracking_button = QPushButton("AI TRACKING")
+        self.tracking_button.setCheckable(True)
+        self.tracking_button.setMinimumHeight(56)
+        self.tracking_button.setFont(QFont("Arial", 12, QFont.Bold))
+        self.tracking_button.setStyleSheet("QPushButton:checked { background-color: #5cb85c; color: black; }")
+        self.tracking_button.clicked.connect(self.on_tracking_button)
+        layout.addWidget(self.tracking_button)
+
+        settings_group = QGroupBox("Settings")
+        settings_layout = QGridLayout()
+        settings_layout.setSpacing(6)
+
+        self.tracking_mode_combo = QComboBox()
+        self.tracking_mode_combo.addItems(["Single person", "Multi person"])
+        self.tracking_speed_combo = QComboBox()
+        self.tracking_speed_combo.addItems(["Super lazy", "Lazy", "Slow", "Fast", "Crazy", "Custom"])
+        self.tracking_zoom_combo = QComboBox()
+        self.tracking_zoom_combo.addItems(
+            ["None", "Close-up", "Half body", "Above the knees", "Nine-head portrait", "Full body",
+             "Long shot 1", "Long shot 2"]
+        )
+        for row, (label, combo, field) in enumerate((
+            ("Mode", self.tracking_mode_combo, 'mode'),
+            ("Speed", self.tracking_speed_combo, 'speed'),
+            ("Auto zoom", self.tracking_zoom_combo, 'auto_zoom'),
+        )):
+            combo.setMinimumHeight(36)
+            # activated only fires on user choice, not when update_ui syncs the combo
+            combo.activated.connect(lambda value, name=field: self.on_tracking_setting(name, value))
+            settings_layout.addWidget(QLabel(label), row, 0)
+            settings_layout.addWidget(combo, row, 1)
+
+        self.tracking_only_me = QCheckBox("Only me")
+        self.tracking_only_me.clicked.connect(lambda checked: self.on_tracking_setting('only_me', checked))
+        settings_layout.addWidget(self.tracking_only_me, 3, 0, 1, 2)
+        settings_group.setLayout(settings_layout)
+        layout.addWidget(settings_group)
+
+        refresh_button = QPushButton("Refresh")
+        refresh_button.setMinimumHeight(40)
+        refresh_button.clicked.connect(self.on_tracking_refresh)
+        layout.addWidget(refresh_button)
+
+        self.tracking_status_label = QLabel("Tracking state not read yet")
+        self.tracking_status_label.setWordWrap(True)
+        layout.addWidget(self.tracking_status_label)
+        layout.addStretch()
+
+    def on_tracking_button(self):
+        """Hand the active camera to the AI tracker, or take it back"""
+        enabled = self.tracking_button.isChecked()
+        if not self.camera_manager.set_tracking_enabled(enabled):
+            self.tracking_button.setChecked(not enabled)
+            QMessageBox.warning(self, "Error", "Failed to change AI tracking")
+
+    def on_tracking_setting(self, field, value):
+        if not self.camera_manager.set_tracking(**{field: value}):
+            QMessageBox.warning(self, "Error", "Failed to change AI tracking settings")
+
+    def on_tracking_refresh(self):
+        self.camera_manager.refresh_tracking()
+
+    def update_tracking(self):
+        """Reflect the cached tracking state of the active camera on the tracking tab."""
+        supported = self.camera_manager.supports_tracking(self.camera_manager.active_camera_index)
+        self.tracking_tab.setEnabled(supported)
+        states = self.camera_manager.get_tracking_states()
+        names = self.camera_manager.get_camera_list()
+        self.tracking_status_label.setText("\n".join(
+            f"{names[i]}: {'tracking' if state.active else 'manual'}"
+            for i, state in sorted(states.items()) if i < len(names)
+        ) or "Tracking state not read yet")
+        state = self.camera_manager.get_tracking()
+        if state is None:
+            return
+        if self.tracking_button.isChecked() != state.active:
+            self.tracking_button.setChecked(state.active)
+        for combo, value in ((self.tracking_mode_combo, state.mode),
+                             (self.tracking_speed_combo, state.speed),
+                             (self.tracking_zoom_combo, state.auto_zoom)):
+            if combo.currentIndex() != value and 0 <= value < combo.count():
+                combo.setCurrentIndex(value)
+        if self.tracking_only_me.isChecked() != state.only_me:
+            self.tracking_only_me.setChecked(state.only_me)
+
     def setup_config_tab(self):
         """Set up the configuration tab with camera settings"""
         layout = QVBoxLayout(self.config_tab)
@@ -388,24 +509,10 @@ class MainWindow(QMainWindow):
         camera_group.setFlat(True)
         camera_layout = QHBoxLayout()
         camera_layout.setContentsMargins(2, 2, 2, 2)
-        camera_layout.setSpacing(4)
-        
-        self.config_camera_buttons = []
-        for i, camera_name in enumerate(self.camera_manager.get_camera_list()):
-            btn = QPushButton(camera_name)
-            btn.setCheckable(True)
-            btn.setMinimumHeight(40)
-            btn.setFont(QFont("Arial", 10))
-            btn.clicked.connect(lambda checked, idx=i: self.on_config_camera_button_clicked(idx))
-            camera_layout.addWidget(btn)
-            self.config_camera_buttons.append(btn)
-        
-        if self.config_camera_buttons:
-            self.config_camera_buttons[0].setChecked(True)
-            self.config_selected_index = 0
-        else:
-            self.config_selected_index = 0
-        
+        self.config_camera_selector = CameraSelector(self.camera_model)
+        self.config_camera_selector.selectionModel().currentChanged.connect(
+            lambda current, previous: self.on_config_camera_selected(current.row()))
+        camera_layout.addWidget(self.config_camera_selector)
         camera_group.setLayout(camera_layout)
         layout.addWidget(camera_group)
         
@@ -443,7 +550,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.save_config_button)
         
         # Initialize with first camera
-        self.on_config_camera_selected(getattr(self, 'config_selected_index', 0))
+        self._select_camera_row(self.config_camera_selector.selectionModel(), self.config_selected_index)
     
     def on_config_camera_selected(self, index):
         """Handle configuration camera selection change"""
@@ -454,27 +561,19 @@ class MainWindow(QMainWindow):
             self.camera_port_edit.setValue(camera.port)
             self.config_selected_index = index
 
-    def on_config_camera_button_clicked(self, index):
-        # Update button checks
-        for i, btn in enumerate(getattr(self, 'config_camera_buttons', [])):
-            btn.setChecked(i == index)
-        self.on_config_camera_selected(index)
-    
     def on_save_config(self):
         """Save camera configuration"""
         index = getattr(self, 'config_selected_index', 0)
         name = self.camera_name_edit.text()
         ip = self.camera_ip_edit.text()
         port = self.camera_port_edit.value()
+        cameras = self._config_ref.get('cameras', [])
+        entry = dict(cameras[index]) if 0 <= index < len(cameras) else {}
+        entry.update(name=name, ip=ip, port=int(port))
         
-        if self.camera_manager.update_camera_config(index, name, ip, port):
-            # Update camera button text
-            if 0 <= index < len(self.camera_buttons):
-                self.camera_buttons[index].setText(name)
-            if hasattr(self, 'preset_camera_buttons') and 0 <= index < len(self.preset_camera_buttons):
-                self.preset_camera_buttons[index].setText(name)
-            if hasattr(self, 'config_camera_buttons') and 0 <= index < len(self.config_camera_buttons):
-                self.config_camera_buttons[index].setText(name)
+        if self.camera_manager.update_camera_config(index, entry):
+            # Renamed row repaints in every selector
+            self.camera_model.refresh()
             
             # Persist to config and save file
             try:
@@ -489,21 +588,36 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.warning(self, "Error", "Failed to save camera configuration.")
     
+    def on_config_file_changed(self, new_config):
+        """config.yaml changed on disk: apply only what changed."""
+        diff = self.config_applier.apply(new_config)
+        if diff.camera_list_changed:
+            self.refresh_cameras()
+
+    def refresh_cameras(self):
+        """Cameras were added, removed or renamed: the model updates the changed rows in
+        every selector and the selections follow."""
+        self.camera_model.refresh()
+        self._select_camera_row(self.active_camera_selection, self.camera_manager.active_camera_index)
+        config_selection = self.config_camera_selector.selectionModel()
+        if config_selection.currentIndex().row() < 0:
+            self._select_camera_row(config_selection, 0)
+        # The selected camera's fields may have changed on disk
+        self.on_config_camera_selected(config_selection.currentIndex().row())
+
+    def _select_camera_row(self, selection, row):
+        """Make `row` current in a selector's selection model (no-op if it already is)."""
+        if selection.currentIndex().row() == row or not (0 <= row < self.camera_model.rowCount()):
+            return
+        selection.setCurrentIndex(self.camera_model.index(row), QItemSelectionModel.ClearAndSelect)
+
     def on_joystick_movement(self, x, y, zoom):
-        """Handle joystick movement"""
-        # Get the current speed setting
-        speed = self.get_speed()
-        
-        # Scale values to appropriate ranges for camera control
-        pan_speed = int(x * speed)  # Use the speed setting
-        tilt_speed = int(-y * speed)  # Use the speed setting
-        zoom_speed = int(zoom * 7)  # VISCA zoom speed range: 0 to 7
-        
-        # Move camera (send stop when both are zero)
-        self.camera_manager.move_camera(pan_speed, tilt_speed)
-        
-        # Zoom camera (send stop when zero)
-        self.camera_manager.zoom_camera(zoom_speed)
+        """Handle joystick movement (called from the controller thread)"""
+        self.input_pipeline.on_axes(x, y, zoom)
+
+    def _on_speed_button_clicked(self, button):
+        # Push the speed to the pipeline so the controller thread never reads widgets
+        self.input_pipeline.speed = self.get_speed()
     
     def on_speed_slider_changed(self, value):
         """Handle speed slider change"""
@@ -550,13 +664,9 @@ class MainWindow(QMainWindow):
             self.camera_manager.zoom_camera(zoom_speed)
 
     def on_button_action(self, action: str, pressed: bool):
-        if action == "zoom_in":
-            self.camera_manager.zoom_camera(5 if pressed else 0)
-        elif action == "zoom_out":
-            self.camera_manager.zoom_camera(-5 if pressed else 0)
-        elif action == "stop":
-            self.camera_manager.stop_camera()
-        elif action == "preset_store_toggle":
+        if self.input_pipeline.on_button(action, pressed):
+            return
+        if action == "preset_store_toggle":
             if pressed and hasattr(self, 'store_mode_button'):
                 self.store_mode_button.setChecked(not self.store_mode_button.isChecked())
     
@@ -565,28 +675,69 @@ class MainWindow(QMainWindow):
         checked_id = self.speed_buttons.checkedId() if hasattr(self, 'speed_buttons') else -1
         return checked_id if checked_id > 0 else 24
     
-    def on_camera_button_clicked(self, index):
-        """Handle camera selection in control tab"""
-        # Update button states
-        for i, btn in enumerate(self.camera_buttons):
-            btn.setChecked(i == index)
-        
-        # Update camera buttons in presets tab to match
-        for i, btn in enumerate(self.preset_camera_buttons):
-            btn.setChecked(i == index)
-        
-        # Set the active camera
-        self.camera_manager.set_active_camera(index)
+    def on_active_camera_selected(self, current, previous):
+        """Camera picked in the control or presets tab (both share the selection)"""
+        index = current.row()
+        if index >= 0 and index != self.camera_manager.active_camera_index:
+            self.camera_manager.set_active_camera(index)
     
     def update_ui(self):
         """Update UI elements with current values"""
+        # Event-loop lag: how late this 100 ms timer fired
+        now = time.monotonic()
+        _UI_LAG.observe(max(0.0, now - self._last_update_tick - self.update_timer.interval() / 1000.0))
+        self._last_update_tick = now
+
+        # Press-and-hold moves are sent once; renew their deadman lease while a button is held
+        if any(btn.isDown() for btn in (self.btn_up, self.btn_down, self.btn_left, self.btn_right,
+                                        self.zoom_in_btn, self.zoom_out_btn)):
+            self.camera_manager.keep_motion_alive()
+
         # Get joystick values
         x, y, zoom = self.controller_manager.get_values()
         
         # Update labels
         self.pan_tilt_label.setText(f"Pan/Tilt: {x:.2f}, {y:.2f}")
         self.zoom_label.setText(f"Zoom: {zoom:.2f}")
-    
+
+        # Estimated camera position (from memory; never blocks the UI thread)
+        estimate = self.camera_manager.get_position_estimate()
+        if estimate is not None:
+            self.position_label.setText(
+                f"Camera: {estimate['pan_deg']:.1f}°, {estimate['tilt_deg']:.1f}°, "
+                f"{estimate['zoom_x']:.1f}x ({estimate['confidence']:.0%})"
+            )
+
+        # Health, tracking and position of every camera; only changed rows repaint
+        self.camera_model.refresh()
+
+        # Gamepad macros can switch the active camera
+        self._select_camera_row(self.active_camera_selection, self.camera_manager.active_camera_index)
+
+        # Sequences can also finish or be started from the gamepad / network
+        for name, btn in self.sequence_buttons.items():
+            running = self.sequencer.is_running(name)
+            if btn.isChecked() != running:
+                btn.setChecked(running)
+
+        # Tracking can be switched from the gamepad, the API or the vendor app
+        self.update_tracking()
+
+    def eventFilter(self, obj, event):
+        if event.type() in _INPUT_EVENTS:
+            self.idle_monitor.activity()
+        return False
+
+    def on_idle_changed(self, idle):
+        """Idle power mode: stop the UI timers while idle, refresh at once on wake-up."""
+        if idle:
+            self.update_timer.stop()
+        else:
+            self._last_update_tick = time.monotonic()
+            self.update_timer.start(100)
+            self.update_ui()
+        self.controllers_page.set_idle(idle)
+
     def keyPressEvent(self, event):
         """Handle key press events"""
         # Exit fullscreen mode with Escape key
@@ -607,6 +758,10 @@ class MainWindow(QMainWindow):
             self.camera_manager.stop_camera()
         except Exception:
             pass
+        try:
+            self.camera_manager.stop_health_monitor()
+        except Exception:
+            pass
         event.accept()
 
     def setup_system_tab(self):
@@ -677,6 +832,7 @@ class MainWindow(QMainWindow):
             QPushButton:hover { background-color: #383838; }
             QPushButton:pressed { background-color: #444; }
             QPushButton:checked { background-color: #007acc; border-color: #007acc; color: white; }
+            QListView { background-color: transparent; }
             QTabBar::tab { background: #2d2d2d; color: #f0f0f0; padding: 10px 16px; margin: 4px; border-radius: 8px; font-size: 12px; min-height: 28px; }
             QTabBar::tab:selected { background: #007acc; color: #ffffff; }
             QTabWidget::pane { border-top: 2px solid #444; }
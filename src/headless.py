@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import signal
+import threading
+
+from app_config import read_config
+from camera.camera_manager import CameraManager
+from joystick.controller_manager import ControllerManager
+from joystick.input_pipeline import InputPipeline
+from services import (create_config_applier, create_config_watcher, create_idle_monitor, create_sequencer,
+                      sequences_path, start_services, stop_services)
+
+
+class HeadlessDaemon:
+    """Runs ControllerManager -> InputPipeline -> CameraManager on an asyncio loop
+    without Qt, for installs that only use a gamepad or hardware panel.
+
+    config.yaml is watched and changes are applied incrementally while running;
+    SIGHUP forces a reload. SIGINT/SIGTERM stop the daemon.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.camera_manager = CameraManager(config['cameras'], config)
+        self.sequencer = create_sequencer(self.camera_manager, config)
+        # Idle power mode: the gamepad poll slows down and idle cameras are probed rarely
+        self.idle_monitor = create_idle_monitor(self.camera_manager, config, self.sequencer)
+        self.controller_manager = ControllerManager(config, self.idle_monitor)
+        headless_cfg = config.get('headless') or {}
+        self.pipeline = InputPipeline.from_config(self.camera_manager, config, speed=int(headless_cfg.get('speed', 16)),
+                                                  sequencer=self.sequencer)
+        self._config_applier = create_config_applier(self.camera_manager, self.controller_manager, config,
+                                                     self.sequencer)
+        self._config_applier.on('input', self.pipeline.apply_config)
+        self._config_applier.on('headless', self._apply_headless_config)
+        self._loop = None
+        self._stop_event = None
+        self._metrics_exporter = None
+        self._config_watcher = None
+        # Latest axes from the controller thread; coalesced so a busy loop never queues stale input
+        self._pending_axes = None
+        self._axes_lock = threading.Lock()
+
+    # Controller thread -> event loop
+    def _on_axes_threadsafe(self, x, y, zoom):
+        with self._axes_lock:
+            scheduled = self._pending_axes is not None
+            self._pending_axes = (x, y, zoom)
+        if not scheduled:
+            self._loop.call_soon_threadsafe(self._flush_axes)
+
+    def _flush_axes(self):
+        with self._axes_lock:
+            axes, self._pending_axes = self._pending_axes, None
+        if axes is not None:
+            self.pipeline.on_axes(*axes)
+
+    def _on_controller_disconnected(self):
+        # Drop input still queued for the loop, then stop right away from this thread
+        with self._axes_lock:
+            self._pending_axes = None
+        self.camera_manager.stop_all_motion()
+
+    def _on_button_threadsafe(self, action, pressed):
+        self._loop.call_soon_threadsafe(self.pipeline.on_button, action, pressed)
+
+    def reload(self):
+        """SIGHUP: re-read config.yaml now (changes are also picked up by the file watcher)."""
+        try:
+            new_config = read_config()
+        except Exception as e:
+            self.logger.error(f"Config reload failed: {e}")
+            return
+        self.apply_config(new_config)
+        self.sequencer.load(sequences_path(self.config))
+
+    def _on_config_file_changed(self, new_config):
+        self._loop.call_soon_threadsafe(self.apply_config, new_config)
+
+    def apply_config(self, new_config):
+        """Apply only what changed; unchanged cameras keep their transport and state."""
+        return self._config_applier.apply(new_config)
+
+    def _apply_headless_config(self, new_config):
+        headless_cfg = new_config.get('headless') or {}
+        self.pipeline.speed = int(headless_cfg.get('speed', self.pipeline.speed))
+
+    async def run(self, check_only=False, on_ready=None):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            self._loop.add_signal_handler(sig, self._stop_event.set)
+        if hasattr(signal, 'SIGHUP'):
+            self._loop.add_signal_handler(signal.SIGHUP, self.reload)
+
+        self.controller_manager.start_monitoring(self._on_axes_threadsafe, self._on_button_threadsafe,
+                                                 self._on_controller_disconnected)
+        try:
+            self.camera_manager.sync_active_camera_position()
+        except Exception:
+            pass
+        self._metrics_exporter = start_services(self.camera_manager, self.config, self.sequencer)
+        self._config_watcher = create_config_watcher(self.config, self._on_config_file_changed)
+        self.logger.info(f"Headless daemon running with {len(self.camera_manager.cameras)} camera(s)")
+        if on_ready is not None:
+            on_ready()
+        if not check_only:
+            self.idle_monitor.start()
+        try:
+            if not check_only:
+                await self._stop_event.wait()
+        finally:
+            self.shutdown()
+        return 0
+
+    def shutdown(self):
+        self.idle_monitor.stop()
+        if self._config_watcher is not None:
+            self._config_watcher.stop()
+        try:
+            self.controller_manager.stop_monitoring()
+        except Exception:
+            pass
+        try:
+            self.camera_manager.stop_camera()
+        except Exception:
+            pass
+        stop_services(self.camera_manager, self._metrics_exporter, self.sequencer)
+
+
+def run_headless(config, check_only=False, on_ready=None):
+    """Entry point used by main.py --headless. Returns the process exit code."""
+    daemon = HeadlessDaemon(config)
+    return asyncio.run(daemon.run(check_only=check_only, on_ready=on_ready))
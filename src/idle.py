@@ -0,0 +1,150 @@
+"""Idle power mode: slow the app down while nobody touches the controls.
+
+    idle:
+      timeout: 60             # seconds without input before going idle; 0 disables
+      poll_interval: 0.1      # gamepad poll period while idle (s)
+      heartbeat_interval: 30  # heartbeats of cameras that are not tracking, and the
+                              # tracking sweep, while idle (s)
+
+While idle the UI timers stop, the gamepad is polled at `poll_interval` without
+sending anything for a centred stick, and idle cameras are probed rarely. The
+first input (stick, button, touch, key) switches everything back. Nothing goes
+idle while a camera is being driven or a sequence runs.
+
+Wall time and process CPU time are counted per state in
+`rpiptz_idle_state_seconds_total{state}` and `rpiptz_idle_cpu_seconds_total{state}`;
+their ratio is the share of one core each state uses, also logged at every
+transition.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from monitoring.metrics import REGISTRY
+
+ACTIVE = "active"
+IDLE = "idle"
+
+_IDLE = REGISTRY.gauge("rpiptz_idle", "1 while the app is in idle power mode.")
+_TRANSITIONS = REGISTRY.counter("rpiptz_idle_transitions_total", "Switches into and out of idle mode.", ("state",))
+_STATE_SECONDS = REGISTRY.counter("rpiptz_idle_state_seconds_total", "Wall time spent per idle state.", ("state",))
+_CPU_SECONDS = REGISTRY.counter("rpiptz_idle_cpu_seconds_total", "Process CPU time used per idle state.", ("state",))
+
+
+class IdleMonitor:
+    """Tracks the time of the last input and switches between active and idle.
+
+    Input sources call `activity()` (cheap: a timestamp store while active).
+    `busy()` keeps the app active while something is moving without input.
+    Listeners get `listener(idle)` on every switch, on the thread that made it:
+    the monitor thread when going idle, the input thread when waking up.
+    """
+
+    def __init__(self, timeout_s: float = 60.0, busy: Optional[Callable[[], bool]] = None):
+        self.timeout_s = float(timeout_s)
+        self._busy = busy
+        self._listeners: List[Callable[[bool], None]] = []
+        # Held through the listeners too, so they see the switches in order
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._woken = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_input = time.monotonic()
+        self.idle = False
+        self._segment = self._booked = (time.monotonic(), time.process_time())
+        self.logger = logging.getLogger(__name__)
+        REGISTRY.add_collector(self._collect)
+
+    @classmethod
+    def from_config(cls, config: Dict, busy: Optional[Callable[[], bool]] = None) -> "IdleMonitor":
+        return cls(((config or {}).get('idle') or {}).get('timeout', 60.0), busy)
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout_s > 0
+
+    def add_listener(self, listener: Callable[[bool], None]) -> None:
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self._thread is not None or not self.enabled:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="IdleMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._woken.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def activity(self) -> None:
+        """Input happened: stay active, or leave idle mode right away."""
+        self._last_input = time.monotonic()
+        if self.idle:
+            self._switch(False)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if self.idle:
+                # Nothing to do until activity() wakes us up
+                self._woken.wait()
+                self._woken.clear()
+                continue
+            remaining = self._last_input + self.timeout_s - time.monotonic()
+            if remaining > 0:
+                self._stop.wait(remaining)
+                continue
+            if self._is_busy():
+                self._last_input = time.monotonic()
+                continue
+            self._switch(True)
+
+    def _is_busy(self) -> bool:
+        if self._busy is None:
+            return False
+        try:
+            return bool(self._busy())
+        except Exception as e:
+            self.logger.error(f"Idle busy check failed: {e}")
+            return True
+
+    def _switch(self, idle: bool) -> None:
+        with self._lock:
+            if self.idle == idle:
+                return
+            now, cpu = self._book()
+            # Wall and CPU time of the state that just ended
+            wall, cpu = now - self._segment[0], cpu - self._segment[1]
+            self._segment = self._booked
+            self.idle = idle
+            _IDLE.set(1 if idle else 0)
+            _TRANSITIONS.labels(IDLE if idle else ACTIVE).inc()
+            usage = cpu / wall if wall > 0 else 0.0
+            if idle:
+                self.logger.info(f"No input for {self.timeout_s:.0f}s, entering idle mode "
+                                 f"(CPU {usage:.1%} of one core over {wall:.0f}s active)")
+            else:
+                self._woken.set()
+                self.logger.info(f"Input, leaving idle mode (CPU {usage:.1%} of one core over {wall:.0f}s idle)")
+            for listener in list(self._listeners):
+                try:
+                    listener(idle)
+                except Exception as e:
+                    self.logger.error(f"Idle listener failed: {e}")
+
+    def _book(self):
+        """Add the time since the last booking to the current state's counters (lock held)."""
+        now, cpu = time.monotonic(), time.process_time()
+        state = IDLE if self.idle else ACTIVE
+        _STATE_SECONDS.labels(state).inc(now - self._booked[0])
+        _CPU_SECONDS.labels(state).inc(cpu - self._booked[1])
+        self._booked = (now, cpu)
+        return now, cpu
+
+    def _collect(self) -> None:
+        with self._lock:
+            self._book()
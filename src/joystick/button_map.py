@@ -0,0 +1,192 @@
+from typing import Callable, Dict, FrozenSet, List, Sequence, Tuple
+
+# Gestures a single-button binding can use
+HOLD = "hold"      # action(True) on press, action(False) on release (the classic mapping)
+TAP = "tap"        # short press, fires on release
+LONG = "long"      # fires once the button has been held for long_press_s
+DOUBLE = "double"  # two taps within double_tap_s
+
+_GESTURES = (HOLD, TAP, LONG, DOUBLE)
+
+Dispatch = Callable[[str, bool], None]
+
+
+class _ButtonBindings:
+    """Compiled bindings of one button, indexed by gesture."""
+
+    __slots__ = ("hold", "tap", "long", "double", "chords")
+
+    def __init__(self):
+        self.hold: Tuple[str, ...] = ()
+        self.tap: Tuple[str, ...] = ()
+        self.long: Tuple[str, ...] = ()
+        self.double: Tuple[str, ...] = ()
+        self.chords = False  # member of at least one chord
+
+
+def _actions(raw) -> Tuple[str, ...]:
+    """A binding's action or macro (a list of actions run in order)."""
+    if isinstance(raw, (list, tuple)):
+        return tuple(str(a) for a in raw)
+    return (str(raw),)
+
+
+class ButtonMap:
+    """Compiled gamepad button map: chords, long-press, double-tap and macros.
+
+    Built once from the controller mapping, e.g.::
+
+        buttons: {zoom_in: 0, stop: 2}          # legacy action -> button (hold)
+        bindings:
+          - {button: 3, press: long, action: preset_store_toggle}
+          - {button: 1, press: double, action: ["camera:1", "preset:2"]}
+          - {buttons: [4, 5], action: sequence_stop}
+
+    `update(state, now)` takes the full button state tuple of one poll; the
+    caller only calls it when that tuple differs from the previous poll. Each
+    changed button is resolved with one dict lookup. Gesture actions and
+    macros are dispatched as a press followed by a release, so the same
+    `dispatch(action, pressed)` handler serves every kind of binding.
+
+    A chord fires when exactly its buttons are down. Tap, long and double
+    gestures of a button that took part in a chord are dropped until it is
+    released, while hold bindings always fire.
+    """
+
+    def __init__(self, mapping: Dict[str, object], dispatch: Dispatch):
+        self._dispatch = dispatch
+        timing = mapping.get("button_timing") or {}
+        self.long_press_s = float(timing.get("long_press", 0.6))
+        self.double_tap_s = float(timing.get("double_tap", 0.3))
+        self._buttons: Dict[int, _ButtonBindings] = {}
+        self._chords: Dict[FrozenSet[int], Tuple[str, ...]] = {}
+        self._compile(mapping)
+        self._watched = tuple(sorted(self._buttons))
+        self._previous: Tuple[int, ...] = ()
+        self._pressed: set = set()
+        self._down_at: Dict[int, float] = {}
+        self._used_in_chord: set = set()
+        # Timed gestures waiting for the clock: button -> deadline
+        self._long_due: Dict[int, float] = {}
+        self._tap_due: Dict[int, float] = {}
+
+    def _binding(self, button: int) -> _ButtonBindings:
+        bindings = self._buttons.get(button)
+        if bindings is None:
+            bindings = self._buttons[button] = _ButtonBindings()
+        return bindings
+
+    def _compile(self, mapping: Dict[str, object]) -> None:
+        for action, button in (mapping.get("buttons") or {}).items():
+            try:
+                bindings = self._binding(int(button))
+            except (TypeError, ValueError):
+                continue
+            bindings.hold += (str(action),)
+        for raw in mapping.get("bindings") or []:
+            actions = _actions(raw.get("action", ()))
+            if "buttons" in raw:
+                chord = frozenset(int(b) for b in raw["buttons"])
+                if len(chord) < 2:
+                    raise ValueError(f"a chord needs at least two buttons: {raw!r}")
+                self._chords[chord] = self._chords.get(chord, ()) + actions
+                for button in chord:
+                    self._binding(button).chords = True
+                continue
+            gesture = raw.get("press", HOLD)
+            if gesture not in _GESTURES:
+                raise ValueError(f"unknown press type {gesture!r}; use one of {', '.join(_GESTURES)}")
+            bindings = self._binding(int(raw["button"]))
+            setattr(bindings, gesture, getattr(bindings, gesture) + actions)
+
+    @property
+    def has_timers(self) -> bool:
+        """True while a long press or a delayed tap is pending; poll `tick()` then."""
+        return bool(self._long_due or self._tap_due)
+
+    # Dispatch helpers
+    def _fire(self, actions: Tuple[str, ...]) -> None:
+        for action in actions:
+            self._dispatch(action, True)
+            self._dispatch(action, False)
+
+    # Input
+    def update(self, state: Sequence[int], now: float) -> None:
+        # Expire pending gestures first so a late second tap is not taken for a double
+        self.tick(now)
+        previous = self._previous
+        self._previous = tuple(state)
+        for button in self._watched:
+            down = bool(state[button]) if button < len(state) else False
+            was = bool(previous[button]) if button < len(previous) else False
+            if down == was:
+                continue
+            if down:
+                self._on_press(button, now)
+            else:
+                self._on_release(button, now)
+
+    def _on_press(self, button: int, now: float) -> None:
+        self._pressed.add(button)
+        bindings = self._buttons.get(button)
+        if bindings is None:
+            return
+        self._down_at[button] = now
+        for action in bindings.hold:
+            self._dispatch(action, True)
+        if bindings.chords:
+            actions = self._chords.get(frozenset(self._pressed))
+            if actions:
+                self._used_in_chord.update(self._pressed)
+                self._long_due.clear()
+                self._fire(actions)
+                return
+        if bindings.long:
+            self._long_due[button] = now + self.long_press_s
+
+    def _on_release(self, button: int, now: float) -> None:
+        self._pressed.discard(button)
+        bindings = self._buttons.get(button)
+        if bindings is None:
+            return
+        for action in bindings.hold:
+            self._dispatch(action, False)
+        long_pending = self._long_due.pop(button, None) is not None
+        held = now - self._down_at.pop(button, now)
+        if button in self._used_in_chord:
+            self._used_in_chord.discard(button)
+            return
+        if bindings.long and not long_pending:
+            # The long press already fired while the button was held
+            return
+        if held >= self.long_press_s:
+            return
+        if bindings.double:
+            if self._tap_due.pop(button, None) is not None:
+                self._fire(bindings.double)
+                return
+            # Wait to see whether a second tap follows; a lone tap fires from tick()
+            self._tap_due[button] = now + self.double_tap_s
+            return
+        self._fire(bindings.tap)
+
+    def tick(self, now: float) -> None:
+        """Fire long presses and single taps whose time has come."""
+        if self._long_due:
+            for button, due in list(self._long_due.items()):
+                if now >= due:
+                    del self._long_due[button]
+                    self._fire(self._buttons[button].long)
+        if self._tap_due:
+            for button, due in list(self._tap_due.items()):
+                if now >= due:
+                    del self._tap_due[button]
+                    self._fire(self._buttons[button].tap)
+
+
+def parse_action(action: str) -> Tuple[str, List[str]]:
+    """Split a macro action like 'preset:3@1' into ('preset', ['3', '1'])."""
+    name, _, argument = action.partition(":")
+    if not argument:
+        return name, []
+    return name, argument.split("@")
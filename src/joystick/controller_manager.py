@@ -5,6 +5,7 @@ try:
 except ImportError:
     pygame = None
 
+from realtime import RealtimeProfile
 from .gamepad_controller import GamepadController
 
 
@@ -15,13 +16,16 @@ class ControllerManager:
     - Game controllers via pygame (GamepadController)
     """
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, idle=None):
         self._config = config
+        # idle.IdleMonitor fed by (and slowing down) the gamepad poll, if given
+        self._idle = idle
         self._active: Optional[object] = None
         self._active_type: Optional[str] = None  # "gamepad"
         self._active_gamepad_index: Optional[int] = None
         self._last_callback: Optional[Callable[[float, float, float], None]] = None
         self._last_button_callback: Optional[Callable[[str, bool], None]] = None
+        self._last_disconnect_callback: Optional[Callable[[], None]] = None
 
     # Discovery
     def list_gamepads(self) -> List[Dict[str, str]]:
@@ -65,16 +69,25 @@ class ControllerManager:
     # Activation
     def activate_gamepad(self, device_index: int, mapping: Dict[str, object]) -> None:
         self.deactivate()
-        self._active = GamepadController(device_index, mapping)
+        idle_cfg = self._config.get("idle") or {}
+        self._active = GamepadController(device_index, mapping,
+                                         realtime=RealtimeProfile.from_config(self._config, 'input'),
+                                         idle=self._idle, idle_poll_interval_s=idle_cfg.get("poll_interval", 0.1))
         self._active_type = "gamepad"
         self._active_gamepad_index = device_index
         # If monitoring callbacks were previously set, restart monitoring with the new device
         if self._last_callback is not None:
             try:
-                self._active.start_monitoring(self._last_callback, self._last_button_callback)
+                self._active.start_monitoring(self._last_callback, self._last_button_callback,
+                                              self._last_disconnect_callback)
             except TypeError:
                 self._active.start_monitoring(self._last_callback)
 
+    def update_gamepad_mapping(self, mapping: Dict[str, object]) -> None:
+        """Apply a changed mapping to the active gamepad in place (no device re-open)."""
+        if self._active is not None and hasattr(self._active, "update_mapping"):
+            self._active.update_mapping(mapping)
+
     def deactivate(self) -> None:
         if self._active and hasattr(self._active, "stop_monitoring"):
             try:
@@ -86,10 +99,14 @@ class ControllerManager:
         self._active_gamepad_index = None
 
     # Unified interface
-    def start_monitoring(self, callback: Callable[[float, float, float], None], button_callback: Optional[Callable[[str, bool], None]] = None) -> None:
+    def start_monitoring(self, callback: Callable[[float, float, float], None], button_callback: Optional[Callable[[str, bool], None]] = None,
+                         disconnect_callback: Optional[Callable[[], None]] = None) -> None:
+        """`disconnect_callback` is called from the polling thread when the active
+        controller is unplugged; polling stops after it."""
         # Remember callbacks so we can reattach after device changes
         self._last_callback = callback
         self._last_button_callback = button_callback
+        self._last_disconnect_callback = disconnect_callback
         # Prefer first available gamepad; do not auto-activate analog
         if self._active is None and pygame is not None:
             pads = self.list_gamepads()
@@ -101,7 +118,7 @@ class ControllerManager:
                     pass
         if self._active is not None:
             try:
-                self._active.start_monitoring(callback, button_callback)
+                self._active.start_monitoring(callback, button_callback, disconnect_callback)
             except TypeError:
                 self._active.start_monitoring(callback)
 
@@ -1,12 +1,20 @@
+import logging
 import threading
 import time
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 try:
     import pygame
 except ImportError:
     pygame = None  # Will be checked at runtime
 
+from monitoring.metrics import REGISTRY
+from realtime import ManualGc, PeriodicTicker, RealtimeProfile
+from .button_map import ButtonMap
+
+_POLLS = REGISTRY.counter("rpiptz_controller_polls_total", "Gamepad poll iterations.")
+_POLL_RATE = REGISTRY.gauge("rpiptz_controller_poll_rate_hz", "Measured gamepad polling rate over the last second.")
+
 
 class GamepadController:
     """Polls a single game controller using pygame and produces normalized
@@ -16,7 +24,8 @@ class GamepadController:
     as well as optional axis inversion and deadzone.
     """
 
-    def __init__(self, device_index: int, mapping: Dict[str, object], poll_interval_s: float = 0.02):
+    def __init__(self, device_index: int, mapping: Dict[str, object], poll_interval_s: float = 0.02,
+                 realtime: Optional[RealtimeProfile] = None, idle=None, idle_poll_interval_s: float = 0.1):
         if pygame is None:
             raise RuntimeError("pygame is not installed. Install pygame to enable gamepad support.")
 
@@ -31,33 +40,66 @@ class GamepadController:
 
         self._joystick = pygame.joystick.Joystick(device_index)
         self._joystick.init()
+        # pygame 2 reports unplugging as JOYDEVICEREMOVED with this id
+        get_instance_id = getattr(self._joystick, "get_instance_id", None)
+        self._instance_id = get_instance_id() if get_instance_id else None
 
-        self._mapping = {
-            "pan_axis": int(mapping.get("pan_axis", 0)),
-            "tilt_axis": int(mapping.get("tilt_axis", 1)),
-            "zoom_axis": int(mapping.get("zoom_axis", 3)),
-            "invert_pan": bool(mapping.get("invert_pan", False)),
-            "invert_tilt": bool(mapping.get("invert_tilt", False)),
-            "invert_zoom": bool(mapping.get("invert_zoom", False)),
-            "deadzone": float(mapping.get("deadzone", 0.1)),
-        }
-        # Optional buttons mapping
-        self._buttons_map = dict(mapping.get("buttons", {}))
+        self._set_mapping(mapping)
+        self._button_map: Optional[ButtonMap] = None
+        self._last_buttons: Tuple[int, ...] = ()
+        try:
+            self._num_buttons = self._joystick.get_numbuttons()
+        except Exception:
+            self._num_buttons = 0
+        self.logger = logging.getLogger(__name__)
 
         self._poll_interval_s = poll_interval_s
+        self._realtime = realtime or RealtimeProfile()
+        # Optional idle.IdleMonitor: stick/button input is activity, and while idle
+        # the poll slows to idle_poll_interval_s and a centred stick sends nothing
+        self._idle = idle
+        self._idle_poll_interval_s = idle_poll_interval_s
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._callback: Optional[Callable[[float, float, float], None]] = None
         self._button_callback: Optional[Callable[[str, bool], None]] = None
+        self._disconnect_callback: Optional[Callable[[], None]] = None
 
         # Last values cache for get_values()
         self._last_pan: float = 0.0
         self._last_tilt: float = 0.0
         self._last_zoom: float = 0.0
 
-    def start_monitoring(self, callback: Callable[[float, float, float], None], button_callback: Optional[Callable[[str, bool], None]] = None) -> None:
+    def _set_mapping(self, mapping: Dict[str, object]) -> None:
+        self._mapping = {
+            "pan_axis": int(mapping.get("pan_axis", 0)),
+            "tilt_axis": int(mapping.get("tilt_axis", 1)),
+            "zoom_axis": int(mapping.get("zoom_axis", 3)),
+            "invert_pan": bool(mapping.get("invert_pan", False)),
+            "invert_tilt": bool(mapping.get("invert_tilt", False)),
+            "invert_zoom": bool(mapping.get("invert_zoom", False)),
+            "deadzone": float(mapping.get("deadzone", 0.1)),
+        }
+        # Button bindings (legacy action -> button, plus chords/gestures/macros), compiled on start
+        self._button_mapping = {
+            "buttons": dict(mapping.get("buttons", {})),
+            "bindings": list(mapping.get("bindings") or []),
+            "button_timing": dict(mapping.get("button_timing") or {}),
+        }
+
+    def update_mapping(self, mapping: Dict[str, object]) -> None:
+        """Swap in a new mapping while polling, without reopening the device.
+        The poll thread picks up the new dicts and button map on its next iteration."""
+        self._set_mapping(mapping)
+        if self._button_map is not None:
+            self._button_map = self._compile_buttons()
+
+    def start_monitoring(self, callback: Callable[[float, float, float], None], button_callback: Optional[Callable[[str, bool], None]] = None,
+                         disconnect_callback: Optional[Callable[[], None]] = None) -> None:
         self._callback = callback
         self._button_callback = button_callback
+        self._disconnect_callback = disconnect_callback
+        self._button_map = self._compile_buttons() if button_callback and self._num_buttons else None
         self._running = True
         self._thread = threading.Thread(target=self._monitor_loop, name="GamepadControllerThread", daemon=True)
         self._thread.start()
@@ -68,55 +110,109 @@ class GamepadController:
             self._thread.join(timeout=1.0)
             self._thread = None
 
+    def _dispatch_button(self, action: str, pressed: bool) -> None:
+        try:
+            self._button_callback(action, pressed)
+        except Exception as e:
+            self.logger.error(f"Button action {action} failed: {e}")
+
+    def _compile_buttons(self) -> ButtonMap:
+        try:
+            return ButtonMap(self._button_mapping, self._dispatch_button)
+        except (KeyError, TypeError, ValueError) as e:
+            # A broken binding list should not cost the basic buttons
+            self.logger.error(f"Invalid gamepad button bindings, using plain buttons only: {e}")
+            return ButtonMap({"buttons": self._button_mapping["buttons"]}, self._dispatch_button)
+
     def _apply_deadzone(self, value: float) -> float:
         return 0.0 if abs(value) < self._mapping["deadzone"] else value
 
     def _monitor_loop(self) -> None:
-        while self._running:
-            # Pump the event queue to keep joystick state fresh
-            pygame.event.pump()
-
-            def read_axis(axis_index: int, invert: bool) -> float:
-                try:
-                    v = self._joystick.get_axis(axis_index)
-                except Exception:
-                    v = 0.0
-                if invert:
-                    v = -v
-                return self._apply_deadzone(v)
-
-            pan = read_axis(self._mapping["pan_axis"], self._mapping["invert_pan"])
-            tilt = read_axis(self._mapping["tilt_axis"], self._mapping["invert_tilt"])
-            zoom = read_axis(self._mapping["zoom_axis"], self._mapping["invert_zoom"])
-
-            # Cache
-            self._last_pan, self._last_tilt, self._last_zoom = pan, tilt, zoom
-
-            if self._callback:
-                self._callback(pan, tilt, zoom)
-
-            # Handle buttons
+        profile = self._realtime
+        profile.apply_to_current_thread("gamepad")
+        manual_gc = profile.enabled and profile.manual_gc
+        if manual_gc:
+            ManualGc.enter()
+        # Real-time profile: absolute deadlines; otherwise sleep a period after each poll
+        ticker = PeriodicTicker(self._poll_interval_s, "gamepad", absolute=profile.enabled, manual_gc=manual_gc)
+        rate_window_start = time.monotonic()
+        rate_window_polls = 0
+        try:
+            while self._running:
+                _POLLS.inc()
+                rate_window_polls += 1
+                now = time.monotonic()
+                if now - rate_window_start >= 1.0:
+                    _POLL_RATE.set(rate_window_polls / (now - rate_window_start))
+                    rate_window_start, rate_window_polls = now, 0
+
+                self._poll_once()
+
+                if self._idle is not None:
+                    period = self._idle_poll_interval_s if self._idle.idle else self._poll_interval_s
+                    if period != ticker.period_s:
+                        ticker.set_period(period)
+                ticker.wait()
+        finally:
+            if manual_gc:
+                ManualGc.exit()
+
+    def _read_axis(self, axis_index: int, invert: bool) -> float:
+        try:
+            v = self._joystick.get_axis(axis_index)
+        except Exception:
+            v = 0.0
+        if invert:
+            v = -v
+        return self._apply_deadzone(v)
+
+    def _poll_once(self) -> None:
+        """One polling iteration: read axes and buttons and dispatch callbacks."""
+        # Pump the event queue to keep joystick state fresh
+        pygame.event.pump()
+        if self._removed():
+            # Unplugged: the axes now read stale or zero, so hand over and stop polling
+            self.logger.warning("Gamepad disconnected")
+            self._running = False
+            if self._disconnect_callback:
+                self._disconnect_callback()
+            return
+
+        pan = self._read_axis(self._mapping["pan_axis"], self._mapping["invert_pan"])
+        tilt = self._read_axis(self._mapping["tilt_axis"], self._mapping["invert_tilt"])
+        zoom = self._read_axis(self._mapping["zoom_axis"], self._mapping["invert_zoom"])
+
+        # Cache
+        self._last_pan, self._last_tilt, self._last_zoom = pan, tilt, zoom
+
+        idle = self._idle
+        if idle is not None and (pan or tilt or zoom):
+            idle.activity()
+        # While idle the cameras are already stopped; a centred stick sends nothing
+        if self._callback and (idle is None or not idle.idle):
+            self._callback(pan, tilt, zoom)
+
+        # Handle buttons: one bulk state read and one tuple comparison per poll
+        button_map = self._button_map
+        if button_map is not None:
             try:
-                num_buttons = self._joystick.get_numbuttons()
+                state = tuple(map(self._joystick.get_button, range(self._num_buttons)))
             except Exception:
-                num_buttons = 0
-            if num_buttons and self._button_callback and self._buttons_map:
-                for action, btn_index in self._buttons_map.items():
-                    try:
-                        idx = int(btn_index)
-                        if idx < 0 or idx >= num_buttons:
-                            continue
-                        state = self._joystick.get_button(idx)
-                        prev = getattr(self, "_last_buttons", {}).get(idx, 0)
-                        if state != prev:
-                            if not hasattr(self, "_last_buttons"):
-                                self._last_buttons = {}
-                            self._last_buttons[idx] = state
-                            self._button_callback(action, bool(state))
-                    except Exception:
-                        continue
-
-            time.sleep(self._poll_interval_s)
+                return
+            if state != self._last_buttons:
+                self._last_buttons = state
+                if idle is not None:
+                    idle.activity()
+                button_map.update(state, time.monotonic())
+            elif button_map.has_timers:
+                button_map.tick(time.monotonic())
+
+    def _removed(self) -> bool:
+        removed_event = getattr(pygame, "JOYDEVICEREMOVED", None)
+        if removed_event is None or self._instance_id is None:
+            return False
+        return any(getattr(event, "instance_id", None) == self._instance_id
+                   for event in pygame.event.get(removed_event))
 
     def get_values(self):
         # Ensure we poll once to keep values fresh if thread not running
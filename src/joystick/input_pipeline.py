@@ -0,0 +1,153 @@
+from .button_map import parse_action
+from .position_control import PositionControl
+
+
+class ZoomSpeedCurve:
+    """Pan/tilt speed factor for a zoom ratio (1000 = 1x .. 12000 = 12x).
+
+    The field of view shrinks roughly with 1/zoom, so the factor is
+    (1000 / ratio) ** exponent, floored at `min_factor`. exponent 0 disables it.
+    """
+
+    def __init__(self, enabled: bool = True, exponent: float = 1.0, min_factor: float = 0.15):
+        self.enabled = bool(enabled)
+        self.exponent = float(exponent)
+        self.min_factor = max(0.0, min(1.0, float(min_factor)))
+
+    @classmethod
+    def from_config(cls, input_cfg):
+        cfg = (input_cfg or {}).get('zoom_speed_scaling') or {}
+        return cls(
+            enabled=cfg.get('enabled', True),
+            exponent=cfg.get('exponent', 1.0),
+            min_factor=cfg.get('min_factor', 0.15),
+        )
+
+    def factor(self, ratio: int) -> float:
+        if not self.enabled or ratio <= 1000:
+            return 1.0
+        return max(self.min_factor, (1000.0 / ratio) ** self.exponent)
+
+
+class InputPipeline:
+    """Maps normalized controller input (-1..1 per axis) and button actions to
+    camera commands. Shared by the touch UI and the headless daemon."""
+
+    # VISCA zoom variable speed range is 0..7
+    ZOOM_SPEED_MAX = 7
+
+    RATE = "rate"
+    POSITION = "position"
+
+    def __init__(self, camera_manager, speed: int = 16, zoom_curve: ZoomSpeedCurve = None,
+                 position: PositionControl = None, mode: str = RATE, sequencer=None):
+        self.camera_manager = camera_manager
+        self.speed = speed
+        self.zoom_curve = zoom_curve or ZoomSpeedCurve()
+        self.position = position or PositionControl(camera_manager)
+        self.mode = mode if mode in (self.RATE, self.POSITION) else self.RATE
+        self._last_zoom_speed = None
+        self.sequencer = sequencer
+
+    @classmethod
+    def from_config(cls, camera_manager, config, speed: int = 16, sequencer=None):
+        input_cfg = config.get('input') or {}
+        return cls(
+            camera_manager,
+            speed=speed,
+            zoom_curve=ZoomSpeedCurve.from_config(input_cfg),
+            position=PositionControl.from_config(camera_manager, input_cfg),
+            mode=input_cfg.get('mode', cls.RATE),
+            sequencer=sequencer,
+        )
+
+    def apply_config(self, config) -> None:
+        """Pick up changed `input:` settings (zoom scaling, position control, mode)."""
+        input_cfg = config.get('input') or {}
+        self.zoom_curve = ZoomSpeedCurve.from_config(input_cfg)
+        self.position = PositionControl.from_config(self.camera_manager, input_cfg)
+        self.set_mode(input_cfg.get('mode', self.RATE))
+
+    def set_mode(self, mode: str) -> None:
+        """Switch between rate control (streamed speeds) and position control."""
+        if mode == self.mode or mode not in (self.RATE, self.POSITION):
+            return
+        if mode == self.POSITION:
+            # Stop streamed motion; the position target starts from where the camera is
+            self.camera_manager.move_camera(0, 0)
+            self.position.reset()
+        self.mode = mode
+
+    def _scaled(self, value: float, factor: float) -> int:
+        unscaled = int(value * self.speed)
+        if factor >= 1.0 or unscaled == 0:
+            return unscaled
+        # Keep the stick live at long focal lengths: anything that moved before still moves
+        scaled = int(value * self.speed * factor)
+        return scaled or (1 if unscaled > 0 else -1)
+
+    def on_axes(self, x: float, y: float, zoom: float) -> None:
+        # Slow pan/tilt down as the active camera zooms in
+        factor = self.zoom_curve.factor(self.camera_manager.get_zoom_ratio())
+        zoom_speed = int(zoom * self.ZOOM_SPEED_MAX)
+
+        if self.mode == self.POSITION:
+            # Stick offsets an absolute target; sends are coalesced by PositionControl
+            self.position.on_axes(x, y, factor)
+            # Keep the packet rate down here too: a stopped zoom is not re-sent every tick
+            if zoom_speed == 0 and self._last_zoom_speed == 0:
+                return
+        else:
+            # Scale values to appropriate ranges for camera control
+            pan_speed = self._scaled(x, factor)
+            tilt_speed = self._scaled(-y, factor)
+
+            # Move camera (send stop when both are zero)
+            self.camera_manager.move_camera(pan_speed, tilt_speed)
+
+        # Zoom camera (send stop when zero)
+        self.camera_manager.zoom_camera(zoom_speed)
+        self._last_zoom_speed = zoom_speed
+
+    def on_button(self, action: str, pressed: bool) -> bool:
+        """Handle camera-level button actions. Returns False for actions the
+        caller (e.g. UI-only toggles) must handle itself."""
+        if action == "zoom_in":
+            self.camera_manager.zoom_camera(5 if pressed else 0)
+        elif action == "zoom_out":
+            self.camera_manager.zoom_camera(-5 if pressed else 0)
+        elif action == "stop":
+            self.camera_manager.stop_camera()
+        elif action == "position_mode_toggle":
+            if pressed:
+                self.set_mode(self.RATE if self.mode == self.POSITION else self.POSITION)
+        elif action.startswith("sequence:") and self.sequencer is not None:
+            # e.g. buttons: {"sequence:sermon_walk": 4} starts/stops that sequence
+            if pressed:
+                self.sequencer.toggle(action[len("sequence:"):])
+        elif action == "sequence_stop" and self.sequencer is not None:
+            if pressed:
+                self.sequencer.stop()
+        elif action.startswith("camera:"):
+            # camera:N switches the active camera (0-based index)
+            if pressed:
+                self.position.reset()
+                self.camera_manager.set_active_camera(int(parse_action(action)[1][0]))
+        elif action.startswith("tracking:"):
+            # tracking:on|off|toggle, optionally @N for camera N
+            if pressed:
+                args = parse_action(action)[1]
+                index = int(args[1]) if len(args) > 1 else None
+                enabled = {"on": True, "off": False}.get(args[0])
+                if enabled is None:
+                    enabled = not self.camera_manager.is_tracking(index)
+                self.camera_manager.set_tracking_enabled(enabled, index)
+        elif action.startswith("preset:"):
+            # preset:P recalls VISCA preset P on the active camera, preset:P@N on camera N
+            if pressed:
+                args = parse_action(action)[1]
+                index = int(args[1]) if len(args) > 1 else None
+                self.camera_manager.recall_preset(int(args[0]), index=index)
+        else:
+            return False
+        return True
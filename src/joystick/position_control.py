@@ -0,0 +1,94 @@
+import time
+from typing import Optional, Tuple
+
+# Absolute pan/tilt positions are in units of 0.075 degrees (vendor sheet)
+DEGREES_PER_UNIT = 0.075
+
+
+class PositionControl:
+    """Position-control joystick mode: the stick moves a target absolute position.
+
+    The target starts at the camera's current pan/tilt (from a position inquiry)
+    and is offset by stick deflection times `max_rate_deg_s`. Changes are
+    coalesced into ``81 01 06 02`` absolute moves sent at most `send_hz` times a
+    second, with the final target always sent once the stick settles, and the
+    camera servos to it internally.
+    """
+
+    def __init__(
+        self,
+        camera_manager,
+        max_rate_deg_s: float = 30.0,
+        send_hz: float = 10.0,
+        invert_pan: bool = False,
+        invert_tilt: bool = False,
+    ):
+        self.camera_manager = camera_manager
+        self.max_rate = float(max_rate_deg_s) / DEGREES_PER_UNIT
+        self.send_interval = 1.0 / max(1.0, float(send_hz))
+        self.pan_sign = -1.0 if invert_pan else 1.0
+        self.tilt_sign = -1.0 if invert_tilt else 1.0
+        self._index: Optional[int] = None
+        self._pan = 0.0
+        self._tilt = 0.0
+        self._sent: Optional[Tuple[int, int]] = None
+        self._last_tick = 0.0
+        self._next_send = 0.0
+        self._retry_at = 0.0
+        self._limits = ((0, 0), (0, 0))
+
+    @classmethod
+    def from_config(cls, camera_manager, input_cfg):
+        cfg = (input_cfg or {}).get('position') or {}
+        return cls(
+            camera_manager,
+            max_rate_deg_s=cfg.get('max_rate_deg_s', 30.0),
+            send_hz=cfg.get('send_hz', 10.0),
+            invert_pan=cfg.get('invert_pan', False),
+            invert_tilt=cfg.get('invert_tilt', False),
+        )
+
+    def reset(self) -> None:
+        """Forget the target; the next input re-reads the camera position."""
+        self._index = None
+
+    def _sync(self, now: float) -> bool:
+        if now < self._retry_at:
+            return False
+        index = self.camera_manager.active_camera_index
+        position = self.camera_manager.query_pan_tilt_position(index)
+        if position is None:
+            # Inquiries block; don't retry on every poll tick
+            self._retry_at = now + 1.0
+            return False
+        self._index = index
+        self._limits = self.camera_manager.pan_tilt_limits(index)
+        self._pan, self._tilt = float(position[0]), float(position[1])
+        self._sent = position
+        self._last_tick = now
+        return True
+
+    def on_axes(self, x: float, y: float, factor: float = 1.0) -> None:
+        now = time.monotonic()
+        if self._index != self.camera_manager.active_camera_index and not self._sync(now):
+            return
+        # Cap dt so a stalled loop does not turn into a large jump
+        dt = min(now - self._last_tick, 0.1)
+        self._last_tick = now
+        if x or y:
+            (pan_min, pan_max), (tilt_min, tilt_max) = self._limits
+            step = self.max_rate * factor * dt
+            self._pan = max(pan_min, min(pan_max, self._pan + self.pan_sign * x * step))
+            # Same directions as rate mode: stick x is pan speed (positive drives right, raising
+            # pan) and -y is tilt speed (positive drives down, lowering tilt)
+            self._tilt = max(tilt_min, min(tilt_max, self._tilt + self.tilt_sign * y * step))
+        target = (int(round(self._pan)), int(round(self._tilt)))
+        if target != self._sent and now >= self._next_send:
+            if self.camera_manager.move_camera_absolute(*target, manual=True):
+                self._sent = target
+            else:
+                # Refused (the AI tracker drives the camera) or not sent: start again from
+                # where the camera really is, re-read at most once a second
+                self._index = None
+                self._retry_at = now + 1.0
+            self._next_send = now + self.send_interval
@@ -1,93 +1,193 @@
 #!/usr/bin/env python3
+import time
+_PROCESS_START = time.monotonic()
+
+import argparse
 import sys
-import os
-import yaml
-from PyQt5.QtWidgets import QApplication
-from gui.main_window import MainWindow
-from camera.camera_manager import CameraManager
-from joystick.controller_manager import ControllerManager
-
-def load_config():
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'config.yaml')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as file:
-            cfg = yaml.safe_load(file) or {}
-        # One-time migration: update default camera 1 IP if it's still the old default
+from app_config import load_config, save_config
+from monitoring import tracing
+from monitoring.logs import setup_logging, shutdown_logging
+from monitoring.metrics import REGISTRY, read_rss_bytes
+
+_STARTUP_SECONDS = REGISTRY.gauge("rpiptz_startup_seconds", "Time from process start until the front-end was ready.")
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Raspberry Pi PTZ camera controller")
+    parser.add_argument('--headless', action='store_true',
+                        help="run without Qt: gamepad input drives the cameras directly")
+    parser.add_argument('--check', action='store_true',
+                        help="start up, report startup time and RSS, then exit")
+    parser.add_argument('--calibrate', nargs='*', type=int, default=None, metavar='INDEX',
+                        help="measure pan/tilt/zoom speed tables for the cameras (all, or the given indexes), "
+                             "save them to config.yaml and exit")
+    parser.add_argument('--save-profile', default=None, metavar='NAME',
+                        help="capture every camera's image settings into config/profiles/NAME.yaml and exit")
+    parser.add_argument('--apply-profile', default=None, metavar='NAME',
+                        help="push the image settings in config/profiles/NAME.yaml to the cameras and exit")
+    parser.add_argument('--trace', nargs='?', const='1', default=None, metavar='PATH',
+                        help=f"record spans to a Chrome/Perfetto trace JSON (or set {tracing.ENV_TRACE})")
+    parser.add_argument('--profile', nargs='?', const='1', default=None, metavar='PATH',
+                        help=f"run sampled cProfile windows on the UI thread (or set {tracing.ENV_PROFILE})")
+    # Leave unknown arguments (e.g. Qt's -platform) for QApplication
+    return parser.parse_known_args(argv[1:])
+
+def report_startup(mode):
+    elapsed = time.monotonic() - _PROCESS_START
+    _STARTUP_SECONDS.set(elapsed)
+    return f"startup mode={mode} seconds={elapsed:.3f} rss_bytes={read_rss_bytes()}"
+
+def run_headless_mode(args, config):
+    from headless import run_headless
+    from services import instrument_core
+
+    trace_path = tracing.resolve_output_path(args.trace, tracing.ENV_TRACE, tracing.DEFAULT_TRACE_PATH)
+    if trace_path:
+        tracing.enable(trace_path)
+        instrument_core()
+
+    def on_ready():
+        line = report_startup('headless')
+        if args.check:
+            print(line)
+
+    return run_headless(config, check_only=args.check, on_ready=on_ready)
+
+def run_calibration(args, config):
+    from camera.camera_manager import CameraManager
+
+    camera_manager = CameraManager(config['cameras'], config)
+    indexes = args.calibrate or range(len(camera_manager.cameras))
+    failures = 0
+    for index in indexes:
+        camera = camera_manager.cameras[index]
+        print(f"Calibrating {camera.name} ({camera.ip}); the camera will move for several minutes")
         try:
-            if (
-                isinstance(cfg.get('cameras'), list)
-                and len(cfg['cameras']) > 0
-                and cfg['cameras'][0].get('ip') == '192.168.1.100'
-            ):
-                cfg['cameras'][0]['ip'] = '192.168.0.101'
-                with open(config_path, 'w') as f:
-                    yaml.dump(cfg, f)
-        except Exception:
-            pass
-        return cfg
-    else:
-        # Default configuration
-        default_config = {
-            'cameras': [
-                {'name': 'Camera 1', 'ip': '192.168.0.101', 'port': 52381},
-                {'name': 'Camera 2', 'ip': '192.168.1.101', 'port': 52381},
-                {'name': 'Camera 3', 'ip': '192.168.1.102', 'port': 52381}
-            ],
-            'joystick': {
-                'x_pin': 0,  # Analog pin for X-axis
-                'y_pin': 1,  # Analog pin for Y-axis
-                'zoom_pin': 2,  # Analog pin for zoom control
-                'deadzone': 0.1  # Deadzone for joystick
-            },
-            'gamepad': {
-                'mapping': {
-                    'pan_axis': 0,
-                    'tilt_axis': 1,
-                    'zoom_axis': 3,
-                    'invert_pan': False,
-                    'invert_tilt': False,
-                    'invert_zoom': False,
-                    'deadzone': 0.1
-                }
-            }
-        }
-        # Create config directory if it doesn't exist
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        # Save default config
-        with open(config_path, 'w') as file:
-            yaml.dump(default_config, file)
-        return default_config
+            calibration = camera_manager.calibrate_speeds(index)
+        except Exception as e:
+            print(f"{camera.name}: calibration failed: {e}")
+            failures += 1
+            continue
+        config['cameras'][index]['calibration'] = calibration.to_config()
+        save_config(config)
+        for axis, points in calibration.to_config().items():
+            print(f"  {axis}: " + ', '.join(f"{step}:{rate}" for step, rate in points))
+    camera_manager.stop_camera()
+    return 1 if failures else 0
+
+def run_profile(args, config):
+    from camera.camera_manager import CameraManager
+    from services import apply_image_profile, create_profile_store, save_image_profile
+
+    camera_manager = CameraManager(config['cameras'], config)
+    profiles = create_profile_store(config)
+    try:
+        if args.save_profile:
+            profile = save_image_profile(camera_manager, profiles, args.save_profile)
+            if profile is None:
+                print("No camera answered; profile not saved")
+                return 1
+            for index, values in sorted(profile.items()):
+                print(f"{camera_manager.cameras[index].name}: " + ', '.join(f"{k}={v}" for k, v in values.items()))
+            return 0
+        results = apply_image_profile(camera_manager, profiles, args.apply_profile)
+        if results is None:
+            print(f"No profile named {args.apply_profile} in {profiles.directory}")
+            return 1
+        for index, ok in sorted(results.items()):
+            print(f"{camera_manager.cameras[index].name}: {'ok' if ok else 'FAILED'}")
+        return 0 if all(results.values()) else 1
+    except ValueError as e:
+        print(e)
+        return 1
+
+def run_gui_mode(args, qt_argv, config):
+    # Qt is only imported for the GUI build
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from gui.main_window import MainWindow
+    from camera.camera_manager import CameraManager
+    from joystick.controller_manager import ControllerManager
+    from services import (create_config_applier, create_config_watcher, create_idle_monitor, create_sequencer,
+                          instrument_core, start_services, stop_services)
+
+    trace_path = tracing.resolve_output_path(args.trace, tracing.ENV_TRACE, tracing.DEFAULT_TRACE_PATH)
+    if trace_path:
+        tracing.enable(trace_path)
+        instrument_core()
+        # Qt slot handlers
+        tracing.instrument_class(MainWindow, lambda name: name.startswith('on_') or name.startswith('update_'), cat='qt')
+    profile_path = tracing.resolve_output_path(args.profile, tracing.ENV_PROFILE, tracing.DEFAULT_PROFILE_PATH)
+    profile_session = tracing.ProfileSession(profile_path) if profile_path else None
 
-def main():
-    # Load configuration
-    config = load_config()
-    
     # Initialize application
-    app = QApplication(sys.argv)
-    
+    app = QApplication(sys.argv[:1] + qt_argv)
+
     # Initialize camera manager
-    camera_manager = CameraManager(config['cameras'])
-    
+    camera_manager = CameraManager(config['cameras'], config)
+
+    sequencer = create_sequencer(camera_manager, config)
+    idle_monitor = create_idle_monitor(camera_manager, config, sequencer)
+
     # Initialize controller manager
-    controller_manager = ControllerManager(config)
-    
-    # Initialize main window
-    # Save config helper
-    def save_config():
-        config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'config.yaml')
-        with open(config_path, 'w') as file:
-            yaml.dump(config, file)
+    controller_manager = ControllerManager(config, idle_monitor)
 
-    window = MainWindow(camera_manager, controller_manager, config, save_config)
+    # Initialize main window
+    config_applier = create_config_applier(camera_manager, controller_manager, config, sequencer,
+                                           ignore=('headless',))
+    window = MainWindow(camera_manager, controller_manager, config, lambda: save_config(config), sequencer,
+                        idle_monitor, config_applier)
     # Ensure camera starts from its current position on connect
     try:
         camera_manager.sync_active_camera_position()
     except Exception:
         pass
+    metrics_exporter = start_services(camera_manager, config, sequencer)
+    config_watcher = None if args.check else create_config_watcher(config, window.config_file_changed.emit)
     window.show()
-    
+
+    if args.check:
+        app.processEvents()
+        print(report_startup('gui'))
+        window.close()
+        stop_services(camera_manager, metrics_exporter, sequencer)
+        return 0
+    report_startup('gui')
+    idle_monitor.start()
+
+    if profile_session is not None:
+        profile_timer = QTimer()
+        profile_timer.timeout.connect(profile_session.tick)
+        profile_timer.start(250)
+        profile_session.tick()
+
     # Start the application
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    idle_monitor.stop()
+    if config_watcher is not None:
+        config_watcher.stop()
+    if profile_session is not None:
+        profile_session.stop()
+    stop_services(camera_manager, metrics_exporter, sequencer)
+    return exit_code
+
+def main():
+    args, qt_argv = parse_args(sys.argv)
+
+    # Load configuration
+    config = load_config()
+    # Log records are written by a listener thread, never by the input/UI threads
+    log_listener = setup_logging(config)
+
+    try:
+        if args.calibrate is not None:
+            sys.exit(run_calibration(args, config))
+        if args.save_profile or args.apply_profile:
+            sys.exit(run_profile(args, config))
+        if args.headless:
+            sys.exit(run_headless_mode(args, config))
+        sys.exit(run_gui_mode(args, qt_argv, config))
+    finally:
+        shutdown_logging(log_listener)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1 @@
+# Monitoring package initialization
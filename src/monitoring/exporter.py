@@ -0,0 +1,86 @@
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from .http_server import LocalHttpServer
+from .metrics import REGISTRY, MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsExporter:
+    """Exposes a MetricsRegistry over HTTP (`/metrics`) and/or as a node_exporter
+    textfile-collector file that is rewritten atomically every `textfile_interval` s.
+
+    Config (all optional):
+        metrics:
+          bind: 127.0.0.1
+          port: 9108
+          textfile: /var/lib/node_exporter/textfile_collector/rpiptz.prom
+          textfile_interval: 15
+    """
+
+    def __init__(self, config: Dict, registry: MetricsRegistry = REGISTRY):
+        self._config = config or {}
+        self.registry = registry
+        self.http_server: Optional[LocalHttpServer] = None
+        self._textfile = self._config.get("textfile")
+        self._textfile_interval = float(self._config.get("textfile_interval", 15))
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def start(self) -> None:
+        port = self._config.get("port")
+        if port:
+            self.http_server = LocalHttpServer(self._config.get("bind", "127.0.0.1"), int(port))
+            self.http_server.add_route("GET", "/metrics", self._handle_metrics)
+            try:
+                self.http_server.start()
+            except OSError as e:
+                self.logger.error(f"Could not start metrics endpoint on port {port}: {e}")
+                self.http_server = None
+        if self._textfile:
+            self._thread = threading.Thread(target=self._textfile_loop, name="MetricsTextfile", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self.http_server is not None:
+            self.http_server.stop()
+            self.http_server = None
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._textfile:
+            # Final snapshot so the collector sees the last values
+            self.write_textfile()
+
+    def _handle_metrics(self, path, query, body):
+        return 200, CONTENT_TYPE, self.registry.render().encode("utf-8")
+
+    def write_textfile(self) -> None:
+        tmp_path = f"{self._textfile}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(self.registry.render())
+            # Atomic replace so node_exporter never reads a partial file
+            os.replace(tmp_path, self._textfile)
+        except Exception as e:
+            self.logger.error(f"Failed to write metrics textfile {self._textfile}: {e}")
+
+    def _textfile_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self.write_textfile()
+            self._stop_event.wait(self._textfile_interval)
+
+
+def start_metrics_export(config: Optional[Dict]) -> Optional[MetricsExporter]:
+    """Start exporting if a port or textfile is configured; returns None otherwise."""
+    config = config or {}
+    if not (config.get("port") or config.get("textfile")):
+        return None
+    exporter = MetricsExporter(config)
+    exporter.start()
+    return exporter
@@ -0,0 +1,88 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+# A route handler receives (path, query string, request body) and returns
+# (status code, content type, body bytes)
+Handler = Callable[[str, str, bytes], Tuple[int, str, bytes]]
+
+
+class LocalHttpServer:
+    """Small threaded HTTP server for local endpoints (metrics and friends).
+
+    Routes are registered per method and exact path, or per path prefix when the
+    registered path ends with '/'.
+    """
+
+    def __init__(self, bind: str = "127.0.0.1", port: int = 9108):
+        self.bind = bind
+        self.port = int(port)
+        self._routes: Dict[Tuple[str, str], Handler] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def add_route(self, method: str, path: str, handler: Handler) -> None:
+        self._routes[(method.upper(), path)] = handler
+
+    def _resolve(self, method: str, path: str) -> Optional[Handler]:
+        handler = self._routes.get((method, path))
+        if handler is not None:
+            return handler
+        # Longest matching prefix route wins
+        best = None
+        for (m, p), h in self._routes.items():
+            if m == method and p.endswith("/") and path.startswith(p):
+                if best is None or len(p) > len(best[0]):
+                    best = (p, h)
+        return best[1] if best else None
+
+    def start(self) -> None:
+        if self._server is not None:
+            return
+        server_ref = self
+
+        class _RequestHandler(BaseHTTPRequestHandler):
+            def _dispatch(self, method):
+                path, _, query = self.path.partition("?")
+                handler = server_ref._resolve(method, path)
+                if handler is None:
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length > 0 else b""
+                try:
+                    status, content_type, payload = handler(path, query, body)
+                except Exception as e:
+                    server_ref.logger.error(f"HTTP handler for {path} failed: {e}")
+                    self.send_error(500)
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                # Keep scrapes out of the application log
+                pass
+
+        self._server = ThreadingHTTPServer((self.bind, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="LocalHttpServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"HTTP endpoint listening on {self.bind}:{self.port}")
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._thread = None
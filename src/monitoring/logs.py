@@ -0,0 +1,153 @@
+"""Logging off the hot threads, with repeated messages rate-limited.
+
+Every logger hands its records to a bounded queue; one listener thread formats
+them and writes to stderr and, optionally, a rotating file. The thread that logs
+(gamepad poll, Qt, event loop) never waits for the SD card.
+
+    logging:
+      level: INFO
+      file: /var/log/rpiptz.log   # optional, rotated
+      max_bytes: 1048576
+      backups: 3
+      rate_limit_interval: 5      # seconds; 0 disables rate limiting
+
+Records with the same message (or the same `extra={'rate_key': ...}`) pass once
+per interval; the next one that passes carries the count of the ones dropped
+in between, e.g. "TCP send to Camera 2 failed: ... (x250 suppressed in last 5.0s)".
+For debug messages on hot paths, pass arguments instead of formatting them
+(`logger.debug("sent %s", HexBytes(packet))`): they are only rendered when the
+record is actually emitted.
+"""
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional
+
+from monitoring.metrics import REGISTRY
+
+_SUPPRESSED = REGISTRY.counter("rpiptz_log_records_suppressed_total", "Log records dropped by rate limiting.")
+_DROPPED = REGISTRY.counter("rpiptz_log_records_dropped_total", "Log records dropped because the log queue was full.")
+
+FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+class HexBytes:
+    """Lazy `bytes.hex(' ')` for log arguments."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __str__(self) -> str:
+        return bytes(self.data).hex(' ')
+
+
+class RateLimitFilter(logging.Filter):
+    """Passes the first record per key in each `interval_s` window and counts the rest."""
+
+    def __init__(self, interval_s: float = 5.0, max_keys: int = 1024):
+        super().__init__()
+        self.interval_s = float(interval_s)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._windows: Dict[object, list] = {}  # key -> [window start, suppressed, last suppressed record]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.interval_s <= 0:
+            return True
+        key = getattr(record, 'rate_key', None) or (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is not None and now - window[0] < self.interval_s:
+                window[1] += 1
+                window[2] = record
+                _SUPPRESSED.inc()
+                return False
+            if window is None and len(self._windows) >= self.max_keys:
+                self._prune(now)
+            self._windows[key] = [now, 0, None]
+        if window is not None and window[1]:
+            _annotate(record, window[1], now - window[0])
+        return True
+
+    def _prune(self, now: float) -> None:
+        for key, window in list(self._windows.items()):
+            if now - window[0] >= self.interval_s and not window[1]:
+                del self._windows[key]
+        if len(self._windows) >= self.max_keys:
+            self._windows.clear()
+
+    def pending(self) -> List[logging.LogRecord]:
+        """Last suppressed record of every open window, annotated with its count
+        (emitted at shutdown so no repeat count is lost)."""
+        now = time.monotonic()
+        with self._lock:
+            windows, self._windows = self._windows, {}
+        records = []
+        for start, suppressed, record in windows.values():
+            if suppressed and record is not None:
+                _annotate(record, suppressed, now - start)
+                records.append(record)
+        return records
+
+
+def _annotate(record: logging.LogRecord, suppressed: int, elapsed_s: float) -> None:
+    record.msg = f"{record.getMessage()} (x{suppressed} suppressed in last {elapsed_s:.1f}s)"
+    record.args = None
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Drops (and counts) records instead of blocking or raising when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DROPPED.inc()
+
+
+def setup_logging(config: Optional[Dict] = None) -> QueueListener:
+    """Route the root logger through a queue to a listener thread. Returns the
+    listener; pass it to shutdown_logging() on exit."""
+    cfg = (config or {}).get('logging') or {}
+    formatter = logging.Formatter(FORMAT)
+    handlers = [logging.StreamHandler()]
+    if cfg.get('file'):
+        try:
+            handlers.append(RotatingFileHandler(cfg['file'], maxBytes=int(cfg.get('max_bytes', 1 << 20)),
+                                                backupCount=int(cfg.get('backups', 3))))
+        except OSError as e:
+            logging.getLogger(__name__).error(f"Cannot open log file {cfg['file']}: {e}")
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    queue_handler = _DroppingQueueHandler(queue.Queue(int(cfg.get('queue_size', 10000))))
+    rate_limit = RateLimitFilter(cfg.get('rate_limit_interval', 5.0))
+    queue_handler.addFilter(rate_limit)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(str(cfg.get('level', 'INFO')).upper())
+
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.rate_limit = rate_limit
+    listener.start()
+    return listener
+
+
+def shutdown_logging(listener: Optional[QueueListener]) -> None:
+    """Write out what is still queued, plus the repeat counts of open windows."""
+    if listener is None:
+        return
+    listener.stop()
+    for record in listener.rate_limit.pending():
+        for handler in listener.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+    for handler in listener.handlers:
+        handler.flush()
@@ -0,0 +1,225 @@
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default latency buckets (seconds) tuned for LAN VISCA round trips and UI frame lag
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    """Monotonic counter. `inc()` is a plain attribute add so it is cheap on hot paths."""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; `observe()` is one bisect plus three adds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # One extra slot for +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricFamily:
+    """A named metric with optional labels. Children are created once per label set
+    and should be cached by callers so hot paths never touch the family."""
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str] = (), factory=None):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = factory()
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._factory()
+        return child
+
+    def remove(self, *values):
+        """Drop the children whose leading label values are `values` (all of them for
+        a partial key, e.g. every reason of one camera)."""
+        prefix = tuple(str(v) for v in values)
+        with self._lock:
+            for key in [k for k in self._children if k[:len(prefix)] == prefix]:
+                del self._children[key]
+
+    def remove_label(self, labelname: str, value) -> None:
+        """Drop every child whose `labelname` label is `value`."""
+        if labelname not in self.labelnames:
+            return
+        position, value = self.labelnames.index(labelname), str(value)
+        with self._lock:
+            for key in [k for k in self._children if k[position] == value]:
+                del self._children[key]
+
+    # Unlabeled convenience
+    def inc(self, amount=1):
+        self._children[()].inc(amount)
+
+    def set(self, value):
+        self._children[()].set(value)
+
+    def observe(self, value):
+        self._children[()].observe(value)
+
+    def samples(self):
+        return list(self._children.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, name, help_text, kind, labelnames, factory) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help_text, kind, labelnames, factory)
+            return family
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(name, help_text, "counter", labelnames, Counter)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(name, help_text, "gauge", labelnames, Gauge)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricFamily:
+        return self._register(name, help_text, "histogram", labelnames, lambda: Histogram(buckets))
+
+    def remove(self, labelname: str, value) -> None:
+        """Stop exporting every series labelled `labelname=value`, in all families
+        (e.g. a removed or renamed camera)."""
+        with self._lock:
+            families = list(self._families.values())
+        for family in families:
+            family.remove_label(labelname, value)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callable run before each render, for values that are sampled
+        at scrape time (process stats, camera health) rather than pushed."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception:
+                pass
+        lines = []
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda f: f.name)
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in family.samples():
+                if family.kind == "histogram":
+                    cumulative = 0
+                    for bound, count in zip(child.buckets + (float("inf"),), list(child.counts)):
+                        cumulative += count
+                        le = _format_value(float(bound))
+                        lines.append(f"{family.name}_bucket{_format_labels(family.labelnames, values, ('le', le))} {cumulative}")
+                    labels = _format_labels(family.labelnames, values)
+                    lines.append(f"{family.name}_sum{labels} {_format_value(float(child.sum))}")
+                    lines.append(f"{family.name}_count{labels} {child.count}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(family.labelnames, values)} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# Process metrics, sampled at scrape time
+_PROCESS_CPU = REGISTRY.counter("process_cpu_seconds_total", "Total user and system CPU time spent in seconds.")
+_PROCESS_RSS = REGISTRY.gauge("process_resident_memory_bytes", "Resident memory size in bytes.")
+_PROCESS_START = REGISTRY.gauge("process_start_time_seconds", "Start time of the process since unix epoch in seconds.")
+_PROCESS_START.set(time.time())
+
+
+def read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        try:
+            import resource
+            # ru_maxrss is the peak, in KiB on Linux; better than nothing off-Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except Exception:
+            return 0
+
+
+def _collect_process():
+    t = os.times()
+    # Counter semantics, but the value comes from the kernel rather than inc()
+    _PROCESS_CPU.labels().value = t.user + t.system
+    _PROCESS_RSS.set(read_rss_bytes())
+
+
+REGISTRY.add_collector(_collect_process)
@@ -0,0 +1,211 @@
+"""Opt-in span tracing (Chrome/Perfetto trace JSON) and sampled cProfile sessions.
+
+Nothing here is on any code path unless enabled: `instrument_class()` wraps methods
+only while a tracer is active, so a disabled build runs the original functions.
+Enable with `--trace [PATH]` on the command line or `RPIPTZ_TRACE=PATH` (`1` picks
+the default path), then open the JSON in chrome://tracing or ui.perfetto.dev.
+"""
+import atexit
+import cProfile
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Optional, Union
+
+ENV_TRACE = "RPIPTZ_TRACE"
+ENV_PROFILE = "RPIPTZ_PROFILE"
+DEFAULT_TRACE_PATH = "rpiptz-trace.json"
+DEFAULT_PROFILE_PATH = "rpiptz-profile.prof"
+
+logger = logging.getLogger(__name__)
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "cat", "args", "_start")
+
+    def __init__(self, tracer, name, cat, args):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracer.record(self.name, self.cat, self._start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects complete ("X") events in a bounded deque; oldest events drop first."""
+
+    def __init__(self, path: str, max_events: int = 200000):
+        self.path = path
+        self._events = deque(maxlen=max_events)
+        self._thread_names = {}
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, cat: str = "app", args: Optional[dict] = None) -> _Span:
+        return _Span(self, name, cat, args)
+
+    def record(self, name, cat, start_ns, end_ns, args=None) -> None:
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+        self._events.append((name, cat, tid, start_ns, end_ns, args))
+
+    def write(self, path: Optional[str] = None) -> str:
+        path = path or self.path
+        pid = os.getpid()
+        origin = self._origin_ns
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        for name, cat, tid, start, end, args in list(self._events):
+            event = {
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - origin) / 1000.0, "dur": (end - start) / 1000.0,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        logger.info(f"Wrote {len(events)} trace events to {path}")
+        return path
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable(path: Optional[str] = None, max_events: int = 200000) -> Tracer:
+    """Turn tracing on for this process; the trace is written at exit."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path or DEFAULT_TRACE_PATH, max_events)
+        atexit.register(_write_at_exit)
+    return _tracer
+
+
+def _write_at_exit():
+    if _tracer is not None:
+        try:
+            _tracer.write()
+        except Exception as e:
+            logger.error(f"Failed to write trace: {e}")
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, cat: str = "app", args: Optional[dict] = None):
+    """Context manager for ad-hoc spans; a shared no-op object when tracing is off."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, cat, args)
+
+
+def instrument_class(cls, methods: Union[Iterable[str], Callable[[str], bool]], cat: str = "app") -> int:
+    """Wrap methods of `cls` in spans named `Class.method`. No-op when tracing is off.
+
+    Call before instances are created (Qt captures bound methods at connect time).
+    `methods` is a list of names or a predicate over attribute names. Returns the
+    number of methods wrapped.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return 0
+    if callable(methods):
+        names = [n for n, v in vars(cls).items() if callable(v) and methods(n)]
+    else:
+        names = [n for n in methods if callable(vars(cls).get(n))]
+    for attr in names:
+        original = vars(cls)[attr]
+        if getattr(original, "__traced__", False):
+            continue
+        span_name = f"{cls.__name__}.{attr}"
+
+        def make_wrapper(func, label):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    tracer.record(label, cat, start, time.perf_counter_ns())
+            wrapper.__traced__ = True
+            return wrapper
+
+        setattr(cls, attr, make_wrapper(original, span_name))
+    return len(names)
+
+
+class ProfileSession:
+    """Sampled cProfile session for the thread that calls `tick()` (the Qt/main loop).
+
+    Profiling runs for `window_s` out of every `interval_s` so a long session stays
+    cheap; stats accumulate across windows and are dumped in pstats format (view
+    with `python -m pstats` or snakeviz) on `stop()`.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH, window_s: float = 5.0, interval_s: float = 30.0):
+        self.path = path
+        self.window_s = float(window_s)
+        self.interval_s = max(float(interval_s), self.window_s)
+        self._profile = cProfile.Profile()
+        self._active = False
+        self._window_end = 0.0
+        self._next_start = 0.0
+        self.windows = 0
+
+    def tick(self) -> None:
+        now = time.monotonic()
+        if self._active and now >= self._window_end:
+            self._profile.disable()
+            self._active = False
+        elif not self._active and now >= self._next_start:
+            self._profile.enable()
+            self._active = True
+            self.windows += 1
+            self._window_end = now + self.window_s
+            self._next_start = now + self.interval_s
+
+    def stop(self) -> None:
+        if self._active:
+            self._profile.disable()
+            self._active = False
+        if self.windows:
+            self._profile.dump_stats(self.path)
+            logger.info(f"Wrote profile ({self.windows} windows) to {self.path}")
+
+
+def resolve_output_path(cli_value: Optional[str], env_var: str, default: str) -> Optional[str]:
+    """CLI wins over the environment; '1'/'true' (or a bare CLI flag) select the default path."""
+    value = cli_value if cli_value is not None else os.environ.get(env_var)
+    if not value or value.lower() in ("0", "false", "off"):
+        return None
+    if value.lower() in ("1", "true", "on"):
+        return default
+    return value
@@ -0,0 +1,199 @@
+"""Opt-in real-time profile for the input and send threads.
+
+    realtime:
+      enabled: true
+      policy: fifo          # fifo, rr or other
+      priority: 20          # 1..99 for fifo/rr
+      manual_gc: true       # freeze the heap, collect only in idle slack
+      input: {cpus: [3]}    # per-role overrides (input thread, I/O worker "send")
+      send: {cpus: [2]}
+
+Scheduling policy and affinity need CAP_SYS_NICE (or an rtprio limit) and an
+isolated core (isolcpus=) to pay off; whatever is not permitted is logged and
+skipped, so the profile degrades to plain threads.
+"""
+import gc
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from monitoring.metrics import REGISTRY
+
+_PERIOD_ERROR = REGISTRY.histogram(
+    "rpiptz_tick_period_error_seconds", "Deviation of each periodic tick from its nominal period.", ("thread",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+_PERIOD_JITTER = REGISTRY.gauge(
+    "rpiptz_tick_period_jitter_seconds", "Standard deviation of the tick period over the last second.", ("thread",))
+_MISSED_TICKS = REGISTRY.counter("rpiptz_tick_missed_total", "Ticks skipped because a tick overran.", ("thread",))
+_IDLE_GC = REGISTRY.counter("rpiptz_idle_gc_collections_total", "Garbage collections run in idle slack.")
+
+_POLICIES = {
+    'fifo': getattr(os, 'SCHED_FIFO', None),
+    'rr': getattr(os, 'SCHED_RR', None),
+    'other': getattr(os, 'SCHED_OTHER', None),
+}
+
+_log = logging.getLogger(__name__)
+
+
+class RealtimeProfile(NamedTuple):
+    enabled: bool = False
+    policy: str = 'fifo'
+    priority: int = 10
+    cpus: Tuple[int, ...] = ()
+    manual_gc: bool = True
+
+    @classmethod
+    def from_config(cls, config: Dict, role: str) -> "RealtimeProfile":
+        """The `realtime:` section with the `realtime.<role>:` overrides applied."""
+        section = dict((config or {}).get('realtime') or {})
+        section.update(section.pop(role, None) or {})
+        for other in ('input', 'send'):
+            section.pop(other, None)
+        return cls(
+            enabled=bool(section.get('enabled', False)),
+            policy=str(section.get('policy', 'fifo')),
+            priority=int(section.get('priority', 10)),
+            cpus=tuple(int(c) for c in section.get('cpus') or ()),
+            manual_gc=bool(section.get('manual_gc', True)),
+        )
+
+    def to_config(self) -> Dict:
+        """Plain dict (picklable into a worker process); from_config(..., role) restores it."""
+        return {'realtime': {'enabled': self.enabled, 'policy': self.policy, 'priority': self.priority,
+                             'cpus': list(self.cpus), 'manual_gc': self.manual_gc}}
+
+    def apply_to_current_thread(self, name: str) -> List[str]:
+        """Set scheduling policy and CPU affinity of the calling thread (Linux applies
+        both per thread for pid 0). Returns what was applied."""
+        if not self.enabled:
+            return []
+        applied = []
+        policy = _POLICIES.get(self.policy)
+        if policy is not None and hasattr(os, 'sched_setscheduler'):
+            priority = self.priority if self.policy in ('fifo', 'rr') else 0
+            try:
+                os.sched_setscheduler(0, policy, os.sched_param(priority))
+                applied.append(f"{self.policy}:{priority}")
+            except (OSError, ValueError) as e:
+                _log.warning(f"{name}: could not set {self.policy} priority {priority}: {e}")
+        if self.cpus and hasattr(os, 'sched_setaffinity'):
+            try:
+                os.sched_setaffinity(0, set(self.cpus))
+                applied.append(f"cpus:{','.join(map(str, self.cpus))}")
+            except (OSError, ValueError) as e:
+                _log.warning(f"{name}: could not pin to CPUs {list(self.cpus)}: {e}")
+        if applied:
+            _log.info(f"{name}: real-time profile {' '.join(applied)}")
+        return applied
+
+
+class ManualGc:
+    """Process-wide switch to manual garbage collection while at least one real-time
+    thread is running: the heap built at startup is frozen (never rescanned),
+    automatic collection is off, and the real-time loops call `collect_if_due()`
+    when they have slack before their next deadline."""
+
+    _lock = threading.Lock()
+    _users = 0
+
+    @classmethod
+    def enter(cls) -> None:
+        with cls._lock:
+            cls._users += 1
+            if cls._users == 1:
+                gc.collect()
+                gc.freeze()
+                gc.disable()
+
+    @classmethod
+    def exit(cls) -> None:
+        with cls._lock:
+            cls._users -= 1
+            if cls._users == 0:
+                gc.unfreeze()
+                gc.enable()
+
+    @staticmethod
+    def collect_if_due() -> None:
+        """Run the collection the automatic thresholds would have run by now."""
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        if counts[0] < thresholds[0]:
+            return
+        generation = 0
+        if counts[1] >= thresholds[1]:
+            generation = 2 if counts[2] >= thresholds[2] else 1
+        gc.collect(generation)
+        _IDLE_GC.inc()
+
+
+class PeriodicTicker:
+    """Paces a polling loop and records how regular its period is.
+
+    With `absolute` the ticks follow fixed deadlines (start + n * period), so
+    time spent in the loop body does not push the period out; an overrun skips
+    the missed ticks instead of bursting to catch up. Without it the loop
+    sleeps a full period after each iteration, as plain threads do. Either way
+    the deviation of each period is observed in
+    `rpiptz_tick_period_error_seconds{thread}` and the one-second standard
+    deviation is exported as `rpiptz_tick_period_jitter_seconds{thread}`.
+    """
+
+    def __init__(self, period_s: float, name: str, absolute: bool = True, manual_gc: bool = False,
+                 gc_slack_s: float = 0.005):
+        self.period_s = float(period_s)
+        self.absolute = absolute
+        self.manual_gc = manual_gc
+        self.gc_slack_s = gc_slack_s
+        self._error = _PERIOD_ERROR.labels(name)
+        self._jitter = _PERIOD_JITTER.labels(name)
+        self._missed = _MISSED_TICKS.labels(name)
+        self._periods = deque(maxlen=max(2, int(1.0 / self.period_s)))
+        self._window_start = time.monotonic()
+        self._deadline: Optional[float] = None
+        self._last_tick: Optional[float] = None
+
+    def set_period(self, period_s: float) -> None:
+        """Change the period (e.g. slower polling while idle); the next tick is one
+        new period after the next wait() and is not counted as period error."""
+        self.period_s = float(period_s)
+        self._periods = deque(maxlen=max(2, int(1.0 / self.period_s)))
+        self._deadline = None
+        self._last_tick = None
+
+    def wait(self) -> None:
+        """Sleep until the next tick."""
+        now = time.monotonic()
+        if self._deadline is None:
+            self._deadline = now
+        self._deadline += self.period_s
+        if self.absolute:
+            if now > self._deadline:
+                missed = int((now - self._deadline) / self.period_s) + 1
+                self._missed.inc(missed)
+                self._deadline += missed * self.period_s
+            if self.manual_gc and self._deadline - now > self.gc_slack_s:
+                ManualGc.collect_if_due()
+            delay = self._deadline - time.monotonic()
+        else:
+            if self.manual_gc:
+                ManualGc.collect_if_due()
+            delay = self.period_s
+        if delay > 0:
+            time.sleep(delay)
+        self._record(time.monotonic())
+
+    def _record(self, tick: float) -> None:
+        if self._last_tick is not None:
+            period = tick - self._last_tick
+            self._periods.append(period)
+            self._error.observe(abs(period - self.period_s))
+        self._last_tick = tick
+        if tick - self._window_start >= 1.0 and len(self._periods) >= 2:
+            self._jitter.set(statistics.pstdev(self._periods))
+            self._window_start = tick
@@ -0,0 +1,216 @@
+import json
+import os
+from app_config import CONFIG_PATH, PROJECT_DIR
+from camera.camera_manager import CameraManager
+from camera.image_settings import ProfileStore
+from camera.journal import install_dump_hooks
+from camera.sequencer import Sequencer
+from config_watcher import ConfigApplier, ConfigWatcher
+from idle import IdleMonitor
+from joystick.gamepad_controller import GamepadController
+from monitoring import tracing
+from monitoring.exporter import start_metrics_export
+
+
+def instrument_core():
+    """Trace spans for the input and camera paths shared by the GUI and headless builds."""
+    tracing.instrument_class(GamepadController, ['_poll_once'], cat='input')
+    tracing.instrument_class(CameraManager, ['_send_command', '_send_packet', '_send_via_fallbacks', 'move_camera', 'zoom_camera'], cat='camera')
+
+
+def setup_journal(camera_manager, config, metrics_exporter):
+    """Dump the command journal on crash/SIGUSR1 and serve it next to /metrics."""
+    journal_cfg = config.get('journal') or {}
+    default_path = os.path.join(PROJECT_DIR, 'logs', 'command-journal.txt')
+    install_dump_hooks(camera_manager.journal, journal_cfg.get('dump_path') or default_path)
+    if metrics_exporter is not None and metrics_exporter.http_server is not None:
+        metrics_exporter.http_server.add_route(
+            'GET', '/journal',
+            lambda path, query, body: (200, 'text/plain; charset=utf-8', camera_manager.journal.format().encode('utf-8')),
+        )
+
+
+def sequences_path(config):
+    return (config.get('sequences') or {}).get('path') or os.path.join(PROJECT_DIR, 'config', 'sequences.yaml')
+
+
+def create_sequencer(camera_manager, config):
+    """Sequencer with the definitions from config/sequences.yaml (or `sequences.path`)."""
+    return Sequencer.from_file(camera_manager, sequences_path(config))
+
+
+def create_idle_monitor(camera_manager, config, sequencer=None):
+    """Idle power mode (`idle:`); a driven camera or a running sequence keeps the app active.
+    Call start() once the input sources are wired up."""
+    def busy():
+        return camera_manager.is_busy() or (sequencer is not None and sequencer.active)
+
+    idle_monitor = IdleMonitor.from_config(config, busy)
+    idle_monitor.add_listener(camera_manager.set_idle)
+    return idle_monitor
+
+
+def profiles_path(config):
+    return (config.get('profiles') or {}).get('path') or os.path.join(PROJECT_DIR, 'config', 'profiles')
+
+
+def create_profile_store(config):
+    """Image-settings profiles in config/profiles (or `profiles.path`), one YAML file each."""
+    return ProfileStore(profiles_path(config))
+
+
+def save_image_profile(camera_manager, profiles, name):
+    """Capture every camera's image settings into the named profile.
+    Returns the captured profile, or None if no camera answered."""
+    profile = camera_manager.capture_image_settings()
+    if not profile:
+        return None
+    profiles.save(name, profile)
+    return profile
+
+
+def apply_image_profile(camera_manager, profiles, name):
+    """Push the named profile to its cameras; None if there is no such profile."""
+    profile = profiles.load(name)
+    if profile is None:
+        return None
+    return camera_manager.apply_image_settings(profile)
+
+
+def create_config_applier(camera_manager, controller_manager, config, sequencer=None, ignore=()):
+    """Changed-config handling shared by the GUI and the headless daemon. The front end
+    registers its own sections (e.g. `input`) with `on()`."""
+    applier = ConfigApplier(camera_manager, controller_manager, config, ignore)
+    if sequencer is not None:
+        applier.on('sequences', lambda new_config: sequencer.load(sequences_path(new_config)))
+    return applier
+
+
+def create_config_watcher(config, on_change, path=CONFIG_PATH):
+    """Start watching config.yaml (`config_watch.enabled`, default on); None when disabled."""
+    watch_cfg = config.get('config_watch') or {}
+    if not watch_cfg.get('enabled', True):
+        return None
+    watcher = ConfigWatcher(path, on_change, debounce_s=watch_cfg.get('debounce', 0.25),
+                            poll_s=watch_cfg.get('poll_interval', 1.0))
+    watcher.start()
+    return watcher
+
+
+def _json(status, payload):
+    return status, 'application/json', json.dumps(payload).encode('utf-8')
+
+
+def setup_api(camera_manager, metrics_exporter, sequencer=None, profiles=None):
+    """Network API next to /metrics:
+    GET /api/cameras/<index>/position (estimate served from memory),
+    GET /api/tracking, POST /api/tracking/<index>/on|off, POST /api/tracking/refresh,
+    GET /api/profiles, POST /api/profiles/<name>/capture|apply,
+    GET /api/sequences, POST /api/sequences/<name>/start|stop, POST /api/sequences/stop."""
+    if metrics_exporter is None or metrics_exporter.http_server is None:
+        return
+    server = metrics_exporter.http_server
+
+    def position(path, query, body):
+        parts = path.strip('/').split('/')
+        if len(parts) != 4 or parts[3] != 'position' or not parts[2].isdigit():
+            return 404, 'text/plain; charset=utf-8', b'not found\n'
+        estimate = camera_manager.get_position_estimate(int(parts[2]))
+        if estimate is None:
+            return 404, 'text/plain; charset=utf-8', b'no such camera\n'
+        return _json(200, estimate)
+
+    server.add_route('GET', '/api/cameras/', position)
+
+    def tracking(path, query, body):
+        parts = path.strip('/').split('/')
+        if parts == ['api', 'tracking', 'refresh']:
+            camera_manager.refresh_tracking()
+        elif len(parts) == 4 and parts[2].isdigit() and parts[3] in ('on', 'off'):
+            if not camera_manager.set_tracking_enabled(parts[3] == 'on', int(parts[2])):
+                return 409, 'text/plain; charset=utf-8', b'tracking command failed\n'
+        else:
+            return 404, 'text/plain; charset=utf-8', b'not found\n'
+        return _json(200, tracking_states())
+
+    def tracking_states():
+        return {str(i): s.to_dict() for i, s in sorted(camera_manager.get_tracking_states().items())}
+
+    server.add_route('GET', '/api/tracking', lambda path, query, body: _json(200, tracking_states()))
+    server.add_route('POST', '/api/tracking/', tracking)
+
+    if profiles is not None:
+        def profile(path, query, body):
+            parts = path.strip('/').split('/')
+            if len(parts) != 4 or parts[3] not in ('capture', 'apply'):
+                return 404, 'text/plain; charset=utf-8', b'not found\n'
+            try:
+                if parts[3] == 'capture':
+                    result = save_image_profile(camera_manager, profiles, parts[2])
+                    if result is None:
+                        return 503, 'text/plain; charset=utf-8', b'no camera answered\n'
+                else:
+                    result = apply_image_profile(camera_manager, profiles, parts[2])
+                    if result is None:
+                        return 404, 'text/plain; charset=utf-8', b'no such profile\n'
+            except ValueError as e:
+                return 400, 'text/plain; charset=utf-8', f"{e}\n".encode('utf-8')
+            return _json(200, {str(index): value for index, value in sorted(result.items())})
+
+        server.add_route('GET', '/api/profiles', lambda path, query, body: _json(200, profiles.names()))
+        server.add_route('POST', '/api/profiles/', profile)
+    if sequencer is None:
+        return
+
+    def control(path, query, body):
+        parts = path.strip('/').split('/')
+        if parts == ['api', 'sequences', 'stop']:
+            sequencer.stop()
+            return _json(200, sequencer.status())
+        if len(parts) != 4 or parts[3] not in ('start', 'stop'):
+            return 404, 'text/plain; charset=utf-8', b'not found\n'
+        name = parts[2]
+        if name not in sequencer.sequences:
+            return 404, 'text/plain; charset=utf-8', b'no such sequence\n'
+        if parts[3] == 'start':
+            sequencer.start(name)
+        else:
+            sequencer.stop(name)
+        return _json(200, sequencer.status()[name])
+
+    server.add_route('GET', '/api/sequences', lambda path, query, body: _json(200, sequencer.status()))
+    server.add_route('POST', '/api/sequences/', control)
+
+
+def start_services(camera_manager, config, sequencer=None):
+    """Start background services (health monitor, metrics export, journal hooks, position API).
+    Returns the metrics exporter, or None if export is not configured."""
+    camera_manager.start_health_monitor()
+    metrics_exporter = start_metrics_export(config.get('metrics'))
+    setup_journal(camera_manager, config, metrics_exporter)
+    setup_api(camera_manager, metrics_exporter, sequencer, create_profile_store(config))
+    return metrics_exporter
+
+
+def stop_services(camera_manager, metrics_exporter, sequencer=None):
+    if sequencer is not None:
+        sequencer.shutdown()
+    try:
+        camera_manager.stop_health_monitor()
+    except Exception:
+        pass
+    try:
+        # Last stop to every camera before the worker and transports go away
+        camera_manager.stop_deadman()
+    except Exception:
+        pass
+    try:
+        camera_manager.stop_io_worker()
+    except Exception:
+        pass
+    try:
+        camera_manager.stop_simulator()
+    except Exception:
+        pass
+    if metrics_exporter is not None:
+        metrics_exporter.stop()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Motion command jitter: single-process sends vs the camera I/O worker process.
+
+Drives CameraManager.move_camera at the gamepad poll rate (50 Hz) against a
+local UDP sink running in its own process, while other threads of the
+controlling process keep the GIL busy the way a heavy Qt repaint or a YAML
+save does. For every command the sink's arrival time is compared with the
+tick that issued it:
+
+  latency   arrival - tick deadline (p50 / p99 / max)
+  jitter    standard deviation of the inter-arrival interval
+
+    python3 tools/bench_io_worker.py --seconds 10 --load 2
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from camera.camera_manager import CameraManager  # noqa: E402
+
+_HEADER = 8
+
+
+def sink(port_queue, result_queue, stop_event):
+    """UDP sink: records (arrival ns, pan speed, tilt speed) of every pan/tilt drive."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.settimeout(0.2)
+    port_queue.put(sock.getsockname()[1])
+    arrivals = []
+    while not stop_event.is_set():
+        try:
+            data = sock.recv(64)
+        except socket.timeout:
+            continue
+        now = time.monotonic_ns()
+        payload = data[_HEADER:]
+        if len(payload) == 9 and payload[1:4] == b'\x01\x06\x01':
+            arrivals.append((now, payload[4], payload[5]))
+    result_queue.put(arrivals)
+
+
+def hog(stop, burst_s):
+    """Pure-Python work in bursts, holding the GIL like a repaint or yaml.dump."""
+    while not stop.is_set():
+        deadline = time.perf_counter() + burst_s
+        while time.perf_counter() < deadline:
+            sum(i * i for i in range(500))
+        time.sleep(0.001)
+
+
+def run(mode, seconds, load, burst_s, rate_hz):
+    context = multiprocessing.get_context('spawn')
+    port_queue, result_queue, stop_sink = context.Queue(), context.Queue(), context.Event()
+    sink_process = context.Process(target=sink, args=(port_queue, result_queue, stop_sink), daemon=True)
+    sink_process.start()
+    port = port_queue.get(timeout=10)
+    settings = {'io_worker': {'enabled': mode == 'worker'}, 'tracking': {'refresh_interval': 0}}
+    manager = CameraManager([{'name': 'bench', 'ip': '127.0.0.1', 'port': port}], settings)
+    time.sleep(0.5)  # let the worker process come up
+
+    stop = threading.Event()
+    hogs = [threading.Thread(target=hog, args=(stop, burst_s), daemon=True) for _ in range(load)]
+    for thread in hogs:
+        thread.start()
+    issued = {}
+    interval_ns = int(1e9 / rate_hz)
+    deadline = time.monotonic_ns() + interval_ns
+    for tick in range(int(seconds * rate_hz)):
+        delay = (deadline - time.monotonic_ns()) / 1e9
+        if delay > 0:
+            time.sleep(delay)
+        # A different speed every tick so each arrival maps back to its tick
+        pan, tilt = tick % 24 + 1, (tick // 24) % 23 + 1
+        issued[(pan, tilt)] = deadline
+        manager.move_camera(pan, tilt)
+        deadline += interval_ns
+    stop.set()
+    manager.move_camera(0, 0)
+    time.sleep(0.3)
+    stop_sink.set()
+    arrivals = result_queue.get(timeout=10)
+    sink_process.join()
+    manager.stop_io_worker()
+
+    latencies = [(now - issued[(pan, tilt)]) / 1e6 for now, pan, tilt in arrivals if (pan, tilt) in issued]
+    times = [now for now, pan, tilt in arrivals if (pan, tilt) in issued]
+    intervals = [(b - a) / 1e6 for a, b in zip(times, times[1:])]
+    return len(issued), latencies, intervals
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--load', type=int, default=2, help="GIL-hogging threads in the controlling process")
+    parser.add_argument('--burst', type=float, default=0.03, help="seconds of work per hog burst")
+    parser.add_argument('--rate', type=float, default=50.0, help="commands per second")
+    args = parser.parse_args()
+    print(f"{'mode':<10}{'sent':>6}{'recv':>6}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'jitter ms':>11}")
+    for mode in ('single', 'worker'):
+        sent, latencies, intervals = run(mode, args.seconds, args.load, args.burst, args.rate)
+        if not latencies:
+            print(f"{mode:<10}{sent:>6}{0:>6}  no packets received")
+            continue
+        jitter = statistics.pstdev(intervals) if intervals else 0.0
+        print(f"{mode:<10}{sent:>6}{len(latencies):>6}{percentile(latencies, 0.5):>9.2f}"
+              f"{percentile(latencies, 0.99):>9.2f}{max(latencies):>9.2f}{jitter:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
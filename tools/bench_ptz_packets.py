@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Per-command cost of the joystick send path: old vs prebuilt packet table.
+
+Sends pan/tilt drive commands to a local UDP sink (no camera needed) and
+reports the packet build cost alone and build + send per command for:
+
+  library   the framing visca_over_ip's pantilt() does per call (hex string
+            formatting, bytearray.fromhex, concatenation, sendto); the real
+            library additionally blocks until the camera ACKs
+  registry  camera.commands build (bytearray patch) + ViscaTransport.send
+  table     PtzPacketTable lookup + ViscaTransport.send (the current path)
+
+    python3 tools/bench_ptz_packets.py --count 200000
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from camera.commands import load_model  # noqa: E402
+from camera.packets import packet_table  # noqa: E402
+from camera.transport import ViscaTransport  # noqa: E402
+
+_DRIVE = {
+    (0, 1): 'pan_tilt_down', (0, -1): 'pan_tilt_up', (1, 0): 'pan_tilt_right', (-1, 0): 'pan_tilt_left',
+    (1, 1): 'pan_tilt_downright', (-1, 1): 'pan_tilt_downleft', (1, -1): 'pan_tilt_upright',
+    (-1, -1): 'pan_tilt_upleft',
+}
+
+
+def speeds(count):
+    """A deterministic sweep through the speed space, like a stick moving around."""
+    out = []
+    for i in range(count):
+        out.append(((i * 7) % 49 - 24, (i * 5) % 47 - 23))
+    return out
+
+
+def library_build():
+    seq = [0]
+
+    def build(pan, tilt):
+        # Mirrors visca_over_ip.Camera.pantilt/_send_command message construction
+        def direction(speed):
+            return '01' if speed < 0 else '02' if speed > 0 else '03'
+        command_hex = '01' + f'{abs(pan):02x}' + f'{abs(tilt):02x}' + direction(pan) + direction(tilt)
+        payload = b'\x81' + b'\x01' + b'\x06' + bytearray.fromhex(command_hex) + b'\xff'
+        seq[0] += 1
+        return b'\x01\x00' + len(payload).to_bytes(2, 'big') + seq[0].to_bytes(4, 'big') + payload
+    return build
+
+
+def registry_build(commands):
+    def build(pan, tilt):
+        name = _DRIVE.get(((pan > 0) - (pan < 0), (tilt > 0) - (tilt < 0)))
+        if name is None:
+            return commands.build('pan_tilt_stop', 0, 0)
+        return commands.build(name, max(1, abs(pan)), max(1, min(0x17, abs(tilt))))
+    return build
+
+
+def measure(call, inputs):
+    for pan, tilt in inputs[:1000]:
+        call(pan, tilt)
+    started = time.perf_counter()
+    for pan, tilt in inputs:
+        call(pan, tilt)
+    return (time.perf_counter() - started) / len(inputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(('127.0.0.1', 0))
+    sink.setblocking(False)
+    address = sink.getsockname()
+
+    commands = load_model()
+    table = packet_table(commands)
+    transport = ViscaTransport(*address)
+    raw = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    inputs = speeds(args.count)
+
+    def drain():
+        try:
+            while True:
+                sink.recv(64)
+        except BlockingIOError:
+            pass
+
+    library = library_build()
+    registry = registry_build(commands)
+    paths = (
+        ('library', library, lambda pan, tilt: raw.sendto(library(pan, tilt), address)),
+        ('registry', registry, lambda pan, tilt: transport.send(registry(pan, tilt))),
+        ('table', table.pantilt, lambda pan, tilt: transport.send(table.pantilt(pan, tilt))),
+    )
+    results = []
+    for label, build, send in paths:
+        build_cost = measure(build, inputs)
+        drain()
+        send_cost = measure(send, inputs)
+        drain()
+        results.append((label, build_cost, send_cost))
+
+    baseline = results[0][2]
+    print(f"{'path':<10} {'build us':>9} {'build+send us':>14} {'speedup':>8}")
+    for label, build_cost, send_cost in results:
+        print(f"{label:<10} {build_cost * 1e6:>9.3f} {send_cost * 1e6:>14.3f} {baseline / send_cost:>7.2f}x")
+    transport.close()
+    raw.close()
+    sink.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Generate a camera command table module from a vendor VISCA-over-IP sheet.
+
+Reads the "Command List" and "Inquiry Command List" sections of the vendor xlsx
+(parsed with zipfile/ElementTree, no openpyxl needed) and writes
+`src/camera/models/<model>.py`, which `camera.commands` compiles into byte
+templates at import time. Parameter ranges come from COMMAND_SPECS/INQUIRY_SPECS (the
+sheet's comments are free text); enumerations such as ``p: 0=Auto1, 1=Indoor``
+are picked up from the comments directly.
+
+    python3 tools/gen_command_table.py                 # regenerate obsbot_tail_2
+    python3 tools/gen_command_table.py --check         # fail if the table is stale
+"""
+import argparse
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SHEET = os.path.join(ROOT, 'obsbot_tail_2_visca_over_ip.xlsx')
+MODELS_DIR = os.path.join(ROOT, 'src', 'camera', 'models')
+NS = {'m': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+# Command names keyed by (set, command, detail) as they appear in the sheet
+COMMAND_NAMES = {
+    ('ZOOM', 'STOP', ''): 'zoom_stop',
+    ('ZOOM', 'TELE', 'Standard Speed'): 'zoom_tele',
+    ('ZOOM', 'WIDE', 'Standard Speed'): 'zoom_wide',
+    ('ZOOM', 'TELE', 'Variable Speed'): 'zoom_tele_variable',
+    ('ZOOM', 'WIDE', 'Variable Speed'): 'zoom_wide_variable',
+    ('ZOOM', 'DIRECT', ''): 'zoom_direct',
+    ('PAN TILT', 'PAN TILT DRIVE', 'UP'): 'pan_tilt_up',
+    ('PAN TILT', 'PAN TILT DRIVE', 'DOWN'): 'pan_tilt_down',
+    ('PAN TILT', 'PAN TILT DRIVE', 'LEFT'): 'pan_tilt_left',
+    ('PAN TILT', 'PAN TILT DRIVE', 'RIGHT'): 'pan_tilt_right',
+    ('PAN TILT', 'PAN TILT DRIVE', 'UPLEFT'): 'pan_tilt_upleft',
+    ('PAN TILT', 'PAN TILT DRIVE', 'UPRIGHT'): 'pan_tilt_upright',
+    ('PAN TILT', 'PAN TILT DRIVE', 'DOWNLEFT'): 'pan_tilt_downleft',
+    ('PAN TILT', 'PAN TILT DRIVE', 'DOWNRIGHT'): 'pan_tilt_downright',
+    ('PAN TILT', 'PAN TILT DRIVE', 'STOP'): 'pan_tilt_stop',
+    ('PAN TILT', 'PAN TILT DRIVE', 'ABS (Absolute Position)'): 'pan_tilt_absolute',
+    ('PAN TILT', 'PAN TILT DRIVE', 'HOME'): 'pan_tilt_home',
+    ('FOCUS', 'MODE', 'Auto/Manual'): 'focus_mode',
+    ('FOCUS', 'STOP', ''): 'focus_stop',
+    ('FOCUS', 'FAR', 'Standard Speed'): 'focus_far',
+    ('FOCUS', 'NEAR', 'Standard Speed'): 'focus_near',
+    ('FOCUS', 'DIRECT', ''): 'focus_direct',
+    ('PRESET', 'RESET', 'Reset'): 'preset_reset',
+    ('PRESET', 'SET', 'Set'): 'preset_set',
+    ('PRESET', 'RECALL', 'Recall'): 'preset_recall',
+    ('PRESET', 'SPEED', 'Common'): 'preset_speed',
+    ('COLOR', 'WHITE BALANCE MODE', ''): 'white_balance_mode',
+    ('COLOR', 'R.GAIN', 'Up'): 'red_gain_up',
+    ('COLOR', 'R.GAIN', 'Down'): 'red_gain_down',
+    ('COLOR', 'B.GAIN', 'Up'): 'blue_gain_up',
+    ('COLOR', 'B.GAIN', 'Down'): 'blue_gain_down',
+    ('EXPOSURE', 'MODE', ''): 'exposure_mode',
+    ('EXPOSURE', 'GAIN', 'Up'): 'gain_up',
+    ('EXPOSURE', 'GAIN', 'Down'): 'gain_down',
+    ('EXPOSURE', 'SHUTTER', 'Up'): 'shutter_up',
+    ('EXPOSURE', 'SHUTTER', 'Down'): 'shutter_down',
+    ('EXPOSURE', 'BACKLIGHT', 'On/Off'): 'backlight',
+    ('BRIGHT', 'BRIGHT', 'Up'): 'bright_up',
+    ('BRIGHT', 'BRIGHT', 'Down'): 'bright_down',
+    ('BRIGHT', 'BRIGHT', 'Direct'): 'bright_direct',
+    ('AI', 'TRACK MODE', 'Single-person Multi-person'): 'ai_track_mode',
+    ('AI', 'TRACK SPEED', ''): 'ai_track_speed',
+    ('AI', 'AUTO ZOOM', ''): 'ai_auto_zoom',
+    ('AI', 'ONLY ME', ''): 'ai_only_me',
+}
+
+# Inquiry names keyed by (set, command)
+INQUIRY_NAMES = {
+    ('PAN TILT', 'POSITION'): 'pan_tilt_position',
+    ('ZOOM', 'ZOOM POSITION'): 'zoom_position',
+    ('FOCUS', 'MODE'): 'focus_mode',
+    ('FOCUS', 'FOCUS POSITION'): 'focus_position',
+    ('EXPOSURE', 'MODE'): 'exposure_mode',
+    ('EXPOSURE', 'SHUTTER'): 'shutter',
+    ('EXPOSURE', 'GAIN'): 'gain',
+    ('EXPOSURE', 'BACKLIGHT'): 'backlight',
+    ('BRIGHT', 'BRIGHT POSITION'): 'bright_position',
+    ('COLOR', 'WHITE BALANCE MODE'): 'white_balance_mode',
+    ('COLOR', 'R.GAIN'): 'red_gain',
+    ('COLOR', 'B.GAIN'): 'blue_gain',
+    ('AI', 'TRACK MODE'): 'ai_track_mode',
+    ('AI', 'TRACK SPEED'): 'ai_track_speed',
+    ('AI', 'AUTO ZOOM'): 'ai_auto_zoom',
+    ('AI', 'ONLY ME'): 'ai_only_me',
+}
+
+# Packets the sheet writes in a form the template compiler should not take literally
+PACKET_FIXUPS = {
+    # "pq: Bright Position" is one two-nibble value
+    '81 01 04 4D 00 00 0p 0q FF': '81 01 04 4D 00 00 0p 0p FF',
+    'y0 50 00 00 0p 0q FF': 'y0 50 00 00 0p 0p FF',
+}
+
+# Field specs (the sheet's comments are free text): (min, max) is an inclusive
+# range, a negative minimum means two's-complement encoding. Fields not listed
+# here must have a `0=..., 1=...` enumeration in the sheet, which becomes a
+# frozenset of legal values.
+_DRIVE_SPEEDS = {'v': (0x01, 0x18), 'w': (0x01, 0x17)}
+_PAN_POSITION = (-0x855, 0x854)
+_TILT_POSITION = (-0x347, 0x346)
+_TRACK_SPEED = {'p': (0, 5), 'q': (0, 1), 'r': (1, 10), 's': (0, 1), 't': (1, 10)}
+COMMAND_SPECS = {
+    'zoom_tele_variable': {'p': (0, 7)},
+    'zoom_wide_variable': {'p': (0, 7)},
+    'zoom_direct': {'z': (1000, 12000)},
+    **{name: _DRIVE_SPEEDS for key, name in COMMAND_NAMES.items()
+       if key[1] == 'PAN TILT DRIVE' and key[2] in ('UP', 'DOWN', 'LEFT', 'RIGHT',
+                                                    'UPLEFT', 'UPRIGHT', 'DOWNLEFT', 'DOWNRIGHT')},
+    # Speed bytes are ignored on stop; allow the conventional 00 00
+    'pan_tilt_stop': {'v': (0x00, 0x18), 'w': (0x00, 0x17)},
+    'pan_tilt_absolute': dict(_DRIVE_SPEEDS, p=_PAN_POSITION, t=_TILT_POSITION),
+    'focus_direct': {'p': (0x00, 0x64)},
+    'preset_reset': {'p': (0x00, 0xFF)},
+    'preset_set': {'p': (0x00, 0xFF)},
+    'preset_recall': {'p': (0x00, 0xFF)},
+    'preset_speed': {'p': (0x01, 0x19)},
+    'bright_direct': {'p': (0x00, 0xFF)},
+    'ai_track_speed': _TRACK_SPEED,
+}
+INQUIRY_SPECS = {
+    'pan_tilt_position': {'p': _PAN_POSITION, 't': _TILT_POSITION},
+    'zoom_position': {'z': (1000, 12000)},
+    'focus_position': {'p': (0x00, 0x64)},
+    'shutter': {'p': (0x09, 0x22)},
+    'gain': {'p': (0x00, 0xFF)},
+    'bright_position': {'p': (0x00, 0xFF)},
+    'red_gain': {'p': (0x00, 0xFF)},
+    'blue_gain': {'p': (0x00, 0xFF)},
+    'ai_track_speed': _TRACK_SPEED,
+}
+
+_ENUM_LINE = re.compile(r'^\s*([a-z]{1,2})\s*:\s*(\d+\s*=.*)$')
+_ENUM_ITEM = re.compile(r'(\d+)\s*=\s*([^,]+)')
+
+
+def read_rows(path):
+    """Yield rows of the first worksheet as {column letter: text}."""
+    with zipfile.ZipFile(path) as z:
+        strings = []
+        if 'xl/sharedStrings.xml' in z.namelist():
+            for si in ET.fromstring(z.read('xl/sharedStrings.xml')).findall('m:si', NS):
+                strings.append(''.join(t.text or '' for t in si.iter(f"{{{NS['m']}}}t")))
+        sheet = ET.fromstring(z.read('xl/worksheets/sheet1.xml'))
+    for row in sheet.iter(f"{{{NS['m']}}}row"):
+        cells = {}
+        for c in row.findall('m:c', NS):
+            v = c.find('m:v', NS)
+            if v is None:
+                continue
+            text = strings[int(v.text)] if c.get('t') == 's' else v.text
+            cells[re.sub(r'\d', '', c.get('r'))] = text
+        yield cells
+
+
+def clean(text):
+    return ' '.join((text or '').split())
+
+
+def parse_choices(comment):
+    """Collect `p: 0=Off, 1=On` style enumerations from a sheet comment."""
+    choices = {}
+    for line in (comment or '').splitlines():
+        m = _ENUM_LINE.match(line)
+        if not m:
+            continue
+        field = m.group(1)[0]
+        labels = choices.setdefault(field, {})
+        for value, label in _ENUM_ITEM.findall(m.group(2)):
+            labels.setdefault(int(value, 16) if len(value) > 1 else int(value), clean(label))
+    return choices
+
+
+def field_specs(name, packet, comment, explicit):
+    fields = sorted(set(re.findall(r'[a-z]', packet.replace('y0', ''))))
+    choices = parse_choices(comment)
+    spec = {}
+    for field in fields:
+        if field in explicit:
+            spec[field] = explicit[field]
+        elif field in choices:
+            spec[field] = frozenset(choices[field])
+        else:
+            raise SystemExit(f"{name}: no spec for field '{field}' in {packet!r}; add it to the generator")
+    labels = {f: choices[f] for f in fields if f in choices}
+    return spec, labels
+
+
+def build_table(path):
+    commands = {}
+    inquiries = {}
+    section = None
+    cset = command = ''
+    for cells in read_rows(path):
+        title = clean(cells.get('B'))
+        if title in ('Command List', 'Inquiry Command List'):
+            section = 'commands' if title == 'Command List' else 'inquiries'
+            cset = command = ''
+            continue
+        if section is None or title in ('Command Set', 'Inquiry Command'):
+            continue
+        if title:
+            cset, command = title, ''
+        if cells.get('C'):
+            command = clean(cells['C'])
+        if section == 'commands':
+            if not cells.get('E'):
+                continue
+            detail = clean(cells.get('D'))
+            key = (cset, command, detail)
+            name = COMMAND_NAMES.get(key) or COMMAND_NAMES.get((cset, command, ''))
+            if not name:
+                raise SystemExit(f"Unnamed command row {key}; add it to COMMAND_NAMES")
+            packet = clean(cells['E'])
+            packet = PACKET_FIXUPS.get(packet, packet)
+            params, labels = field_specs(name, packet, cells.get('F'), COMMAND_SPECS.get(name, {}))
+            commands[name] = {'packet': packet, 'params': params, 'labels': labels}
+        else:
+            if not cells.get('D'):
+                continue
+            name = INQUIRY_NAMES.get((cset, command))
+            if not name:
+                raise SystemExit(f"Unnamed inquiry row {(cset, command)}; add it to INQUIRY_NAMES")
+            # "8x" is the camera address; the table always addresses camera 1
+            packet = clean(cells['D']).replace('8x', '81', 1)
+            reply = clean(cells.get('E'))
+            reply = PACKET_FIXUPS.get(reply, reply)
+            fields, labels = field_specs(name, reply, cells.get('F'), INQUIRY_SPECS.get(name, {}))
+            inquiries[name] = {'packet': packet, 'reply': reply, 'fields': fields, 'labels': labels}
+    return commands, inquiries
+
+
+def render(model, sheet, commands, inquiries):
+    lines = [
+        f"# Generated by tools/gen_command_table.py from {os.path.basename(sheet)}.",
+        "# Do not edit by hand: fix the sheet or the generator's tables and regenerate.",
+        "",
+        f"MODEL = {model!r}",
+        "",
+        "# name -> packet template, parameter specs ((min, max) or frozenset of legal values), value labels",
+        "COMMANDS = {",
+    ]
+    lines += [f"    {name!r}: {entry!r}," for name, entry in commands.items()]
+    lines += [
+        "}",
+        "",
+        "# name -> inquiry packet, reply template, reply field specs, value labels",
+        "INQUIRIES = {",
+    ]
+    lines += [f"    {name!r}: {entry!r}," for name, entry in inquiries.items()]
+    lines += ["}", ""]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sheet', nargs='?', default=DEFAULT_SHEET)
+    parser.add_argument('--model', default='obsbot_tail_2')
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--check', action='store_true', help="exit 1 if the checked-in table differs")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(MODELS_DIR, f"{args.model}.py")
+    commands, inquiries = build_table(args.sheet)
+    source = render(args.model, args.sheet, commands, inquiries)
+    if args.check:
+        try:
+            with open(output) as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current != source:
+            print(f"{output} is out of date; run {os.path.relpath(__file__, ROOT)}", file=sys.stderr)
+            return 1
+        return 0
+    with open(output, 'w') as f:
+        f.write(source)
+    print(f"Wrote {len(commands)} commands and {len(inquiries)} inquiries to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
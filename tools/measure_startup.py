@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Compare startup time and memory of the GUI and headless builds.
+
+Runs `src/main.py --check` (optionally with --headless) several times. Each run
+starts the full stack, prints its own startup line, and exits; peak RSS is taken
+from the child's rusage. Use on the target Pi, e.g.:
+
+    QT_QPA_PLATFORM=offscreen SDL_VIDEODRIVER=dummy python3 tools/measure_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'main.py')
+
+
+def run_once(headless):
+    cmd = [sys.executable, MAIN, '--check'] + (['--headless'] if headless else [])
+    started = time.monotonic()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.monotonic() - started
+    output = proc.stdout.read()
+    proc.stdout.close()
+    reported = None
+    for line in output.splitlines():
+        if line.startswith('startup '):
+            fields = dict(part.split('=', 1) for part in line.split()[1:])
+            reported = float(fields['seconds'])
+    # ru_maxrss is KiB on Linux
+    return os.waitstatus_to_exitcode(status), wall, reported, usage.ru_maxrss * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--mode', choices=('both', 'gui', 'headless'), default='both')
+    args = parser.parse_args()
+    modes = ('gui', 'headless') if args.mode == 'both' else (args.mode,)
+    print(f"{'mode':<10}{'exit':>6}{'wall s':>10}{'ready s':>10}{'peak RSS MiB':>14}")
+    for mode in modes:
+        results = [run_once(mode == 'headless') for _ in range(args.runs)]
+        codes = {r[0] for r in results}
+        wall = statistics.median(r[1] for r in results)
+        ready = [r[2] for r in results if r[2] is not None]
+        rss = statistics.median(r[3] for r in results) / (1024 * 1024)
+        ready_s = f"{statistics.median(ready):.3f}" if ready else "n/a"
+        print(f"{mode:<10}{','.join(map(str, sorted(codes))):>6}{wall:>10.3f}{ready_s:>10}{rss:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Scale check against many simulated cameras in one process.
+
+Starts N `backend: simulator` cameras on 127.0.1.1, 127.0.1.2, ... port 52381
+(own addresses, so no camera port collides with an ephemeral client port)
+through the real CameraManager, sends every camera an absolute move to its own target,
+times pipelined position sweeps over all of them while they travel, and
+reports which cameras arrived, the sweep round trip, heartbeat health and the
+CPU used. Loss and latency apply to every camera.
+
+    python3 tools/sim_cameras.py --cameras 32 --loss 0.02 --latency 0.003
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from camera.camera_manager import CameraManager  # noqa: E402
+from camera.simulator import BACKEND  # noqa: E402
+from camera.transport import inquire_all  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cameras', type=int, default=32)
+    parser.add_argument('--port', type=int, default=52381)
+    parser.add_argument('--seconds', type=float, default=5.0, help="time allowed for the moves")
+    parser.add_argument('--latency', type=float, default=0.002, help="one-way delay (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="extra random delay (s)")
+    parser.add_argument('--loss', type=float, default=0.0, help="datagram loss probability, each way")
+    parser.add_argument('--io-worker', action='store_true', help="send commands from the I/O worker process")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    configs = [{'name': f"Sim {i + 1}", 'ip': f"127.0.{1 + i // 250}.{1 + i % 250}", 'port': args.port,
+                'backend': BACKEND}
+               for i in range(args.cameras)]
+    settings = {
+        'simulator': {'latency': args.latency, 'jitter': args.jitter, 'loss': args.loss, 'seed': args.seed},
+        'io_worker': {'enabled': args.io_worker},
+        'health': {'heartbeat_interval': 1.0},
+    }
+    manager = CameraManager(configs, settings)
+    if len(manager.cameras) != args.cameras:
+        print(f"only {len(manager.cameras)} of {args.cameras} cameras started")
+        return 1
+    manager.start_health_monitor()
+    if args.io_worker:
+        time.sleep(0.5)  # let the worker process come up
+
+    rng = random.Random(args.seed)
+    (pan_min, pan_max), (tilt_min, tilt_max) = manager.pan_tilt_limits(0)
+    targets = [(rng.randint(pan_min // 2, pan_max // 2), rng.randint(tilt_min // 2, tilt_max // 2))
+               for _ in manager.cameras]
+    cpu_started, started = time.process_time(), time.monotonic()
+    for index, (pan, tilt) in enumerate(targets):
+        manager.move_camera_absolute(pan, tilt, index=index)
+
+    inquiry = manager.cameras[0].commands.inquiry('pan_tilt_position')
+    sweeps, missing = [], 0
+    while time.monotonic() - started < args.seconds:
+        sweep_started = time.monotonic()
+        replies = inquire_all([(camera.transport, inquiry.packet) for camera in manager.cameras])
+        sweeps.append(time.monotonic() - sweep_started)
+        missing += sum(reply is None for reply in replies)
+        time.sleep(0.1)
+    cpu = time.process_time() - cpu_started
+    elapsed = time.monotonic() - started
+
+    arrived = 0
+    for camera, (pan, tilt) in zip(manager.cameras, targets):
+        sim_pan, sim_tilt, _zoom = camera.simulated.position()
+        ok = round(sim_pan) == pan and round(sim_tilt) == tilt
+        arrived += ok
+        if not ok:
+            print(f"{camera.name}: target {pan},{tilt} at {sim_pan:.0f},{sim_tilt:.0f} "
+                  f"({camera.simulated.dropped} datagrams dropped)")
+    health = [manager.get_camera_health(i) for i in range(len(manager.cameras))]
+    sweeps.sort()
+    print(f"cameras={len(manager.cameras)} arrived={arrived} "
+          f"health={','.join(f'{s}:{health.count(s)}' for s in sorted(set(health)))}")
+    print(f"sweeps={len(sweeps)} p50={statistics.median(sweeps) * 1000:.1f}ms max={sweeps[-1] * 1000:.1f}ms "
+          f"missing_replies={missing}")
+    print(f"cpu={cpu / elapsed * 100:.1f}% of one core over {elapsed:.1f}s")
+    manager.stop_health_monitor()
+    manager.stop_io_worker()
+    manager.stop_simulator()
+    return 0 if arrived == len(manager.cameras) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Run the zoom servo against a simulated camera and show it converging.
+
+A local UDP VISCA-over-IP responder models zoom motion: variable-speed zoom
+(``04 07 2p/3p``) moves the ratio at a speed-dependent rate with a little
+reply latency, DIRECT (``04 47``) jumps, and zoom position inquiries report the
+current ratio. The servo is driven through the real transport and command table.
+Prints the trajectory and exits 1 if any target is not reached.
+
+    python3 tools/sim_zoom_servo.py --targets 12000 2500 8000
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from camera.commands import load_model  # noqa: E402
+from camera.packets import packet_table  # noqa: E402
+from camera.transport import (HEADER, PAYLOAD_COMMAND, PAYLOAD_INQUIRY, PAYLOAD_REPLY,  # noqa: E402
+                              TransportPool)
+from camera.zoom_servo import ZoomServo  # noqa: E402
+
+
+class SimulatedZoom:
+    """Zoom axis of a simulated camera: ratio units per second per speed step."""
+
+    def __init__(self, ratio=1000, units_per_step=450.0):
+        self.ratio = float(ratio)
+        self.units_per_step = units_per_step
+        self.velocity = 0.0
+        self.direct_jumps = 0
+        self.commands = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _advance(self):
+        now = time.monotonic()
+        self.ratio = max(1000.0, min(12000.0, self.ratio + self.velocity * (now - self._updated)))
+        self._updated = now
+
+    def handle(self, payload):
+        with self._lock:
+            self._advance()
+            if payload[2:4] == b'\x04\x07':
+                self.commands += 1
+                code = payload[4]
+                speed = (code & 0x0F) + 1
+                if code & 0xF0 == 0x20:
+                    self.velocity = speed * self.units_per_step
+                elif code & 0xF0 == 0x30:
+                    self.velocity = -speed * self.units_per_step
+                else:
+                    self.velocity = 0.0
+            elif payload[2:4] == b'\x04\x47':
+                self.commands += 1
+                self.direct_jumps += 1
+                value = 0
+                for b in payload[4:8]:
+                    value = (value << 4) | (b & 0x0F)
+                self.ratio = float(value)
+                self.velocity = 0.0
+
+    def current(self):
+        with self._lock:
+            self._advance()
+            return int(self.ratio)
+
+
+def serve(sim, latency_s):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+
+    def reply(address, seq, body):
+        sock.sendto(HEADER.pack(PAYLOAD_REPLY, len(body), seq) + body, address)
+
+    def loop():
+        while True:
+            data, address = sock.recvfrom(64)
+            if len(data) < HEADER.size + 3:
+                continue
+            ptype, _length, seq = HEADER.unpack_from(data)
+            payload = data[HEADER.size:]
+            time.sleep(latency_s)
+            if ptype == PAYLOAD_COMMAND:
+                reply(address, seq, b'\x90\x41\xff')
+                sim.handle(payload)
+                reply(address, seq, b'\x90\x51\xff')
+            elif ptype == PAYLOAD_INQUIRY and payload[2:4] == b'\x04\x47':
+                z = sim.current()
+                reply(address, seq, bytes([0x90, 0x50, (z >> 12) & 15, (z >> 8) & 15, (z >> 4) & 15, z & 15, 0xFF]))
+    threading.Thread(target=loop, name="SimCamera", daemon=True).start()
+    return sock.getsockname()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--targets', type=int, nargs='+', default=[12000, 2500, 8000, 7600])
+    parser.add_argument('--latency', type=float, default=0.01, help="simulated reply latency (s)")
+    parser.add_argument('--rate', type=float, default=10.0, help="servo tick rate (Hz)")
+    args = parser.parse_args()
+
+    sim = SimulatedZoom()
+    address = serve(sim, args.latency)
+    pool = TransportPool()
+    transport = pool.open(*address)
+    commands = load_model()
+    inquiry = commands.inquiry('zoom_position')
+    trajectory = []
+
+    def send(payload):
+        transport.send(payload)
+        return True
+
+    servo = ZoomServo(
+        send=send,
+        inquire_ratio=lambda: inquiry.value(transport.inquire(inquiry.packet)),
+        packets=packet_table(commands),
+        build_direct=lambda ratio: commands.build('zoom_direct', ratio),
+        rate_hz=args.rate,
+        on_ratio=trajectory.append,
+    )
+
+    failures = 0
+    for target in args.targets:
+        trajectory.clear()
+        commands_before = sim.commands
+        started = time.monotonic()
+        servo.move_to(target)
+        while servo.active and time.monotonic() - started < servo.timeout_s + 2:
+            time.sleep(0.02)
+        time.sleep(0.1)
+        elapsed = time.monotonic() - started
+        final = sim.current()
+        landing_gap = abs(target - trajectory[-1]) if trajectory else None
+        ok = final == target and not servo.active
+        failures += not ok
+        path = ' '.join(str(r) for r in trajectory[:12]) + (' ...' if len(trajectory) > 12 else '')
+        print(f"target={target:>5} final={final:>5} {'ok' if ok else 'FAILED'} "
+              f"time={elapsed:.2f}s ticks={len(trajectory)} commands={sim.commands - commands_before} "
+              f"gap_before_direct={landing_gap}")
+        print(f"  ratio: {path}")
+    servo.stop()
+    pool.close()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())